@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_PREFIXES = ("langchain", "langchain_core", "langchain_qdrant", "langchain_naver", "qdrant_client", "langsmith")
+
+
+def _probe(module: str) -> tuple[float, list[str]]:
+    # 매번 새 프로세스에서 import해야 모듈 캐시 없이 cold start 시간을 잴 수 있다
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = sorted({{m.split('.')[0] for m in sys.modules if m.split('.')[0] in {HEAVY_PREFIXES!r}}})\n"
+        "print(elapsed)\n"
+        "print(','.join(heavy))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.splitlines()
+    return float(out[0]), [m for m in out[1].split(",") if m] if len(out) > 1 else []
+
+
+def _top_imports(module: str, limit: int) -> list[tuple[int, str]]:
+    # python -X importtime의 cumulative(us) 기준 상위 모듈
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if "." not in name:
+            rows.append((int(parts[1]), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cold import time of the API server module")
+    parser.add_argument("--module", default="architecture_agent.api.server")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    samples = []
+    heavy: list[str] = []
+    for _ in range(args.runs):
+        elapsed, heavy = _probe(args.module)
+        samples.append(elapsed)
+
+    print(f"module={args.module} runs={args.runs}")
+    print(f"import median: {statistics.median(samples) * 1000:8.1f}ms  min: {min(samples) * 1000:8.1f}ms")
+    print(f"heavy modules loaded at import: {', '.join(heavy) or '-'}")
+    print("top-level imports by cumulative time:")
+    for us, name in _top_imports(args.module, args.top):
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from architecture_agent.ingestion.resolve_abbr import apply_abbreviation_map
+
+SYLLABLES = [chr(c) for c in range(ord("가"), ord("힣") + 1, 37)]
+
+
+def _legacy_apply(text: str, abbr_map: dict[str, str]) -> str:
+    # 이전 구현: 축약어마다 패턴을 새로 만들어 re.sub 반복
+    pairs = sorted(abbr_map.items(), key=lambda x: len(x[0]), reverse=True)
+    for short, full in pairs:
+        if len(short) <= 2:
+            pattern = rf"(?<![가-힣A-Za-z0-9]){re.escape(short)}(?=\s|제|의|에|을|를|이|가|은|는|과|와|으로|$)"
+        else:
+            pattern = re.escape(short)
+        text = re.sub(pattern, full, text)
+    return text
+
+
+def _word(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(n))
+
+
+def build_corpus(n_abbr: int, n_chunks: int, chunk_words: int, seed: int = 7):
+    rng = random.Random(seed)
+    abbr_map: dict[str, str] = {}
+    while len(abbr_map) < n_abbr:
+        short = _word(rng, rng.choice([2, 3, 3, 4, 5]))
+        abbr_map[short] = f"확장된 {short} 명칭"
+    shorts = list(abbr_map)
+
+    chunks = []
+    for _ in range(n_chunks):
+        words = []
+        for _ in range(chunk_words):
+            words.append(rng.choice(shorts) if rng.random() < 0.1 else _word(rng, rng.randint(1, 4)))
+            words.append(rng.choice(["은", "는", "을", " ", "의 ", "에 "]))
+        chunks.append("".join(words))
+    return abbr_map, chunks
+
+
+def _timeit(fn, abbr_map, chunks) -> float:
+    start = time.perf_counter()
+    for text in chunks:
+        fn(text, abbr_map)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="resolve_abbr substitution benchmark")
+    parser.add_argument("--abbreviations", type=int, default=3000)
+    parser.add_argument("--chunks", type=int, default=30)
+    parser.add_argument("--words", type=int, default=200)
+    args = parser.parse_args()
+
+    abbr_map, chunks = build_corpus(args.abbreviations, args.chunks, args.words)
+    legacy = _timeit(_legacy_apply, abbr_map, chunks)
+    single_pass = _timeit(apply_abbreviation_map, abbr_map, chunks)
+
+    print(f"abbreviations={len(abbr_map)} chunks={len(chunks)} words/chunk={args.words}")
+    print(f"legacy per-key re.sub : {legacy:8.3f}s")
+    print(f"single-pass trie regex: {single_pass:8.3f}s")
+    print(f"speedup               : {legacy / single_pass:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
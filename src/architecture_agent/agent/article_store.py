@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from architecture_agent.agent.tools import point_to_doc
+from architecture_agent.ingestion.parse_law import article_label
+from architecture_agent.ingestion.reverse_refs import parent_ref_key
+
+MAX_EXACT_DOCS = 5
+
+
+def _short_law_id(law_id: str) -> str:
+    raw = str(law_id).strip()
+    return raw.lstrip("0") or raw
+
+
+class ArticleStore:
+    # 벡터 없이 payload만 메모리에 올려 조문/법령/모법 참조 조회를 Qdrant 왕복 없이 처리
+    def __init__(self, docs: Iterable[dict], version: str = ""):
+        self.version = version
+        self.by_key: dict[tuple[str, str], list[dict]] = {}
+        self.by_law: dict[str, list[dict]] = {}
+        self.children: dict[str, list[dict]] = {}
+        self.size = 0
+
+        for doc in docs:
+            meta = doc["metadata"]
+            law_id = _short_law_id(meta.get("law_id", ""))
+            article = article_label(meta.get("article_num", ""), meta.get("article_sub", ""))
+            self.by_key.setdefault((law_id, article), []).append(doc)
+            self.by_law.setdefault(law_id, []).append(doc)
+            parents = dict.fromkeys(
+                parent_ref_key(ref["law_name"], str(ref["article"]))
+                for ref in meta.get("parent_law_refs") or []
+                if isinstance(ref, dict) and ref.get("law_name") and ref.get("article")
+            )
+            for parent in parents:
+                self.children.setdefault(parent, []).append(doc)
+            self.size += 1
+
+    @classmethod
+    def from_client(cls, client, collection_name: str, version: str = "", page_size: int = 256) -> "ArticleStore":
+        if not client.collection_exists(collection_name):
+            return cls([], version=version)
+
+        docs: list[dict] = []
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                offset=offset,
+                limit=page_size,
+                with_payload=True,
+                with_vectors=False,
+            )
+            docs.extend(point_to_doc(point) for point in points)
+            if offset is None:
+                break
+        return cls(docs, version=version)
+
+    @staticmethod
+    def _copy(docs: list[dict]) -> list[dict]:
+        # 호출자가 결과 리스트/문서를 고쳐도 저장소 원본은 유지되도록 얕은 복사로 반환
+        return [dict(d) for d in docs]
+
+    def get(self, law_id: str, article_num: str) -> list[dict]:
+        return self._copy(self.by_key.get((_short_law_id(law_id), str(article_num)), [])[:MAX_EXACT_DOCS])
+
+    def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        return {key: self.get(*key) for key in keys}
+
+    def law_articles(self, law_id: str) -> list[dict]:
+        return self._copy(self.by_law.get(_short_law_id(law_id), []))
+
+    def children_of(self, law_name: str, article_num: str) -> list[dict]:
+        return self._copy(self.children.get(parent_ref_key(law_name, str(article_num)), []))
@@ -97,7 +97,7 @@ def law_retriever(state: AgentState, tools: dict[str, Any]) -> AgentState:
     dedup = {}
     for item in items:
         meta = item.get("metadata", {})
-        key = (meta.get("law_id"), meta.get("article_num"))
+        key = (meta.get("law_id"), meta.get("article_num"), meta.get("article_sub"))
         dedup[key] = item
 
     result = list(dedup.values())
@@ -115,6 +115,10 @@ def law_retriever(state: AgentState, tools: dict[str, Any]) -> AgentState:
     return state
 
 
+def _internal_ref_law_id(ref: Reference) -> str:
+    return "1823" if ref.law_name == "건축법" else "2118"
+
+
 def reference_tracker(state: AgentState, tools: dict[str, Any]) -> AgentState:
     pending = list(state.get("pending_refs", []))
     resolved = list(state.get("resolved_refs", []))
@@ -123,6 +127,45 @@ def reference_tracker(state: AgentState, tools: dict[str, Any]) -> AgentState:
     if not pending:
         return state
 
+    get_articles = tools.get("get_articles")
+    if get_articles is None:
+        return _track_one_reference(state, tools, pending, resolved, all_context)
+
+    # 남은 hop 예산만큼의 참조를 get_articles 한 번으로 모아서 조회 (참조 1건 = 1 hop, 순차 경로와 같은 상한)
+    remaining = max(0, state.get("max_hops", 3) - state.get("hop_count", 0))
+    if remaining == 0:
+        return state
+    batch, rest = pending[:remaining], pending[remaining:]
+
+    find_children = tools["find_children_by_parent_ref"]
+    internal = [r for r in batch if r.ref_type == "internal" and r.law_name]
+    keys = [f"{_internal_ref_law_id(r)}:{r.article}" for r in internal]
+    found = get_articles.invoke({"keys": list(dict.fromkeys(keys))}) if keys else {}
+
+    for ref in batch:
+        docs = []
+        if ref.ref_type == "internal" and ref.law_name:
+            docs = found.get(f"{_internal_ref_law_id(ref)}:{ref.article}", [])
+        elif ref.ref_type == "parent" and ref.law_name:
+            docs = find_children.invoke({"law_name": ref.law_name, "article_num": ref.article})
+        if docs:
+            all_context.extend(docs)
+            resolved.append(ref)
+
+    state["pending_refs"] = rest
+    state["resolved_refs"] = resolved
+    state["all_context"] = all_context
+    state["hop_count"] = state.get("hop_count", 0) + len(batch)
+    return state
+
+
+def _track_one_reference(
+    state: AgentState,
+    tools: dict[str, Any],
+    pending: list[Reference],
+    resolved: list[Reference],
+    all_context: list[dict],
+) -> AgentState:
     get_article = tools["get_article"]
     find_children = tools["find_children_by_parent_ref"]
 
@@ -130,7 +173,7 @@ def reference_tracker(state: AgentState, tools: dict[str, Any]) -> AgentState:
     docs = []
 
     if current.ref_type == "internal" and current.law_name:
-        law_id = "1823" if current.law_name == "건축법" else "2118"
+        law_id = _internal_ref_law_id(current)
         docs = get_article.invoke({"law_id": law_id, "article_num": current.article})
     elif current.ref_type == "parent" and current.law_name:
         docs = find_children.invoke({"law_name": current.law_name, "article_num": current.article})
@@ -1,71 +1,186 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-try:
-    from langchain_core.tools import tool
-except Exception:  # pragma: no cover
-    def tool(func=None, **_kwargs):
-        if func is None:
-            return lambda f: f
-        return func
+import numpy as np
+
+from architecture_agent.ingestion.parse_law import article_label, split_article_label
+from architecture_agent.metrics import timed_call
+
+
+def _tool_decorator():
+    # langchain_core import가 무거워(~0.6s) tool을 만들 때만 불러온다
+    try:
+        from langchain_core.tools import tool
+    except Exception:  # pragma: no cover
+        def tool(func=None, **_kwargs):
+            if func is None:
+                return lambda f: f
+            return func
+    return tool
+
+
+METADATA_KEY = "metadata"
+
+
+def _char_ngrams(text: str, n: int = 2) -> set[str]:
+    text = text.lower()
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
 
 
 class Appendix1Index:
-    def __init__(self, json_path: str = "data/processed/appendix1_terms.json"):
+    NGRAM = 2
+
+    def __init__(
+        self,
+        json_path: str = "data/processed/appendix1_terms.json",
+        cache_size: int = 256,
+    ):
         self.json_path = Path(json_path)
         if not self.json_path.exists():
             raise FileNotFoundError(f"Appendix1 JSON not found: {self.json_path}")
         data = json.loads(self.json_path.read_text(encoding="utf-8"))
         self.terms = data.get("terms", [])
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, int], list[dict[str, Any]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._build_index()
 
     @staticmethod
     def _tokenize(text: str) -> set[str]:
         return {t for t in re.split(r"[^0-9A-Za-z가-힣]+", text.lower()) if t}
 
-    def lookup(self, term_or_query: str, top_k: int = 5) -> list[dict[str, Any]]:
-        query = term_or_query.strip()
-        if not query:
-            return []
-
-        q_lower = query.lower()
-
-        exact = []
-        alias = []
-        fuzzy = []
-        q_tokens = self._tokenize(query)
+    def _build_index(self) -> None:
+        # 조회마다 반복하던 소문자화/토큰화를 적재 시 한 번만 수행하고 역색인으로 후보를 좁힌다
+        self._names: list[tuple[str, str]] = []
+        self._aliases: list[list[str]] = []
+        doc_sizes: list[int] = []
+        token_postings: dict[str, list[int]] = {}
+        self._name_grams: dict[str, set[int]] = {}
+        self._alias_grams: dict[str, set[int]] = {}
+        self._alias_heads: dict[str, set[int]] = {}
+        self._short_alias_terms: set[int] = set()
 
-        for term in self.terms:
+        for i, term in enumerate(self.terms):
             category = str(term.get("category", ""))
             subcategory = str(term.get("subcategory", ""))
             aliases = [str(a) for a in term.get("aliases", [])]
             desc = str(term.get("description", ""))
 
-            if q_lower in category.lower() or q_lower in subcategory.lower():
-                exact.append(term)
-                continue
+            names = (category.lower(), subcategory.lower())
+            lowered_aliases = [a.lower() for a in aliases]
+            self._names.append(names)
+            self._aliases.append(lowered_aliases)
 
-            if any(q_lower in a.lower() or a.lower() in q_lower for a in aliases):
-                alias.append(term)
-                continue
+            for gram in _char_ngrams(names[0], self.NGRAM) | _char_ngrams(names[1], self.NGRAM):
+                self._name_grams.setdefault(gram, set()).add(i)
+            for alias in lowered_aliases:
+                for gram in _char_ngrams(alias, self.NGRAM):
+                    self._alias_grams.setdefault(gram, set()).add(i)
+                if len(alias) < self.NGRAM:
+                    self._short_alias_terms.add(i)
+                else:
+                    self._alias_heads.setdefault(alias[: self.NGRAM], set()).add(i)
 
             doc_tokens = self._tokenize(" ".join([category, subcategory, " ".join(aliases), desc]))
-            if not doc_tokens:
-                continue
-            score = len(q_tokens & doc_tokens) / len(q_tokens | doc_tokens) if q_tokens else 0.0
-            if score > 0:
-                fuzzy.append((score, term))
+            doc_sizes.append(len(doc_tokens))
+            for token in doc_tokens:
+                token_postings.setdefault(token, []).append(i)
 
-        fuzzy.sort(key=lambda x: x[0], reverse=True)
-        result = exact + alias + [t for _, t in fuzzy]
+        self._doc_sizes = np.asarray(doc_sizes, dtype=np.float64)
+        self._token_postings = {t: np.asarray(rows, dtype=np.int64) for t, rows in token_postings.items()}
+
+    def _contains_candidates(self, q_grams: set[str], grams: dict[str, set[int]]) -> set[int] | None:
+        # q가 부분 문자열이면 q의 모든 n-gram을 포함해야 한다 (q가 n보다 짧으면 None=전체 검사)
+        if not q_grams:
+            return None
+        postings = sorted((grams.get(g, set()) for g in q_grams), key=len)
+        out = set(postings[0])
+        for p in postings[1:]:
+            out &= p
+            if not out:
+                break
+        return out
+
+    def _alias_candidates(self, q_lower: str, q_grams: set[str]) -> set[int]:
+        all_terms = set(range(len(self.terms)))
+        q_in_alias = self._contains_candidates(q_grams, self._alias_grams)
+        if q_in_alias is None:
+            return all_terms
+        # alias가 q의 부분 문자열이면 alias 첫 n-gram이 q 안에 있다
+        alias_in_q = set(self._short_alias_terms)
+        for i in range(len(q_lower) - self.NGRAM + 1):
+            alias_in_q |= self._alias_heads.get(q_lower[i : i + self.NGRAM], set())
+        return q_in_alias | alias_in_q
+
+    def _fuzzy_scores(self, q_tokens: set[str], skip: set[int]) -> list[int]:
+        # token 역색인 postings를 이어 붙여 bincount로 교집합 크기를 한 번에 세고 Jaccard = |교| / (|q| + |d| - |교|)
+        postings = [self._token_postings[t] for t in q_tokens if t in self._token_postings]
+        if not postings:
+            return []
+        inter = np.bincount(np.concatenate(postings), minlength=len(self.terms)).astype(np.float64)
+        if skip:
+            inter[list(skip)] = 0.0
+        rows = np.flatnonzero(inter)
+        scores = inter[rows] / (len(q_tokens) + self._doc_sizes[rows] - inter[rows])
+        # 점수 내림차순, 같은 점수는 term 순서 (lexsort는 마지막 key가 1순위)
+        return rows[np.lexsort((rows, -scores))].tolist()
+
+    def lookup(self, term_or_query: str, top_k: int = 5) -> list[dict[str, Any]]:
+        query = term_or_query.strip()
+        if not query:
+            return []
+
+        cache_key = (query, top_k)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return list(cached)
+
+        # 조회 자체는 잠금 밖에서 수행 (같은 질의가 동시에 들어오면 두 번 계산될 뿐 결과는 같다)
+        result = self._lookup(query, top_k)
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(result)
+
+    def _lookup(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        q_lower = query.lower()
+        q_grams = _char_ngrams(q_lower, self.NGRAM)
+
+        name_candidates = self._contains_candidates(q_grams, self._name_grams)
+        if name_candidates is None:
+            name_candidates = set(range(len(self.terms)))
+        exact = [
+            i
+            for i in sorted(name_candidates)
+            if q_lower in self._names[i][0] or q_lower in self._names[i][1]
+        ]
+        exact_set = set(exact)
+
+        alias = [
+            i
+            for i in sorted(self._alias_candidates(q_lower, q_grams) - exact_set)
+            if any(q_lower in a or a in q_lower for a in self._aliases[i])
+        ]
+
+        fuzzy = self._fuzzy_scores(self._tokenize(query), exact_set | set(alias))
+        ordered = exact + alias + fuzzy
 
         deduped = []
         seen = set()
-        for t in result:
+        for i in ordered:
+            t = self.terms[i]
             key = (t.get("category"), t.get("subcategory"))
             if key in seen:
                 continue
@@ -77,6 +192,47 @@ class Appendix1Index:
         return deduped
 
 
+def _law_id_variants(law_id: str) -> list[str]:
+    # 적재 경로에 따라 law_id가 "1823" 또는 "001823"으로 저장되어 있어 두 형태 모두 매칭
+    raw = str(law_id).strip()
+    short = raw.lstrip("0") or raw
+    return sorted({raw, short, short.zfill(6)})
+
+
+def build_metadata_filter(
+    law_id: str | None = None,
+    article_num: str | None = None,
+    law_type: str | None = None,
+    law_name: str | None = None,
+):
+    from qdrant_client.http.models import FieldCondition, Filter, IsEmptyCondition, MatchAny, MatchValue, PayloadField
+
+    must = []
+    if law_id:
+        must.append(FieldCondition(key=f"{METADATA_KEY}.law_id", match=MatchAny(any=_law_id_variants(law_id))))
+    if article_num:
+        # article_num은 참조 표기("4" 또는 "4의2"); payload에는 조문번호와 가지번호가 따로 저장된다
+        num, sub = split_article_label(str(article_num))
+        must.append(FieldCondition(key=f"{METADATA_KEY}.article_num", match=MatchValue(value=num)))
+        if sub:
+            must.append(FieldCondition(key=f"{METADATA_KEY}.article_sub", match=MatchValue(value=sub)))
+        else:
+            must.append(IsEmptyCondition(is_empty=PayloadField(key=f"{METADATA_KEY}.article_sub")))
+    if law_type:
+        must.append(FieldCondition(key=f"{METADATA_KEY}.law_type", match=MatchValue(value=law_type)))
+    if law_name:
+        must.append(FieldCondition(key=f"{METADATA_KEY}.law_name", match=MatchValue(value=law_name)))
+    return Filter(must=must) if must else None
+
+
+def point_to_doc(point) -> dict:
+    payload = point.payload or {}
+    meta = payload.get(METADATA_KEY)
+    if not isinstance(meta, dict):
+        meta = payload
+    return {"content": meta.get("content_original", ""), "metadata": meta}
+
+
 class LawRetriever:
     def __init__(
         self,
@@ -85,68 +241,501 @@ class LawRetriever:
         qdrant_url: str | None = None,
         qdrant_api_key: str | None = None,
         prefer_grpc: bool = False,
+        client=None,
+        embeddings=None,
+        reverse_ref_index_path: str | None = None,
+        query_embedding_cache_dir: str | None = None,
+        query_embedding_cache_size: int = 1024,
+        query_embedding_store_size: int = 50_000,
+        async_client=None,
+        article_store: bool = False,
+        index_version_path: str | None = None,
+        snapshot_path: str | None = None,
     ):
-        from langchain_naver import ClovaXEmbeddings
-        from langchain_qdrant import QdrantVectorStore
-        from qdrant_client import QdrantClient
-
-        url = qdrant_url or os.getenv("QDRANT_URL")
-        api_key = qdrant_api_key or os.getenv("QDRANT_API_KEY")
-        if url:
-            client = QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
-        else:
-            client = QdrantClient(path=qdrant_path)
-        embeddings = ClovaXEmbeddings(model="bge-m3")
-        self.vector_store = QdrantVectorStore(
-            client=client,
-            collection_name=collection_name,
-            embedding=embeddings,
-        )
+        # snapshot_path가 있으면 Qdrant를 열지 않고 export된 읽기 전용 snapshot을 mmap해 프로세스 안에서 검색
+        # (로컬 파일 모드의 배타 lock 없이 uvicorn --workers N이 같은 snapshot을 공유)
+        self._snapshot_path = snapshot_path
+        if client is None and snapshot_path is None:
+            from qdrant_client import AsyncQdrantClient, QdrantClient
+
+            url = qdrant_url or os.getenv("QDRANT_URL")
+            api_key = qdrant_api_key or os.getenv("QDRANT_API_KEY")
+            if url:
+                client = QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+                async_client = async_client or AsyncQdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+            else:
+                # 로컬 파일 모드는 한 프로세스에서 client 하나만 열 수 있어 async 호출은 스레드로 위임
+                client = QdrantClient(path=qdrant_path)
+        if embeddings is None:
+            from langchain_naver import ClovaXEmbeddings
+
+            embeddings = ClovaXEmbeddings(model="bge-m3")
+        if query_embedding_cache_dir:
+            from architecture_agent.ingestion.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+            # 서빙에서는 문서를 임베딩하지 않으므로 이 디렉터리는 질의 전용이며 max_entries로 크기를 제한
+            store = EmbeddingStore(
+                cache_dir=query_embedding_cache_dir,
+                model="bge-m3",
+                max_entries=query_embedding_store_size,
+            )
+            embeddings = CachedEmbeddings(
+                embeddings,
+                store=store,
+                query_cache_size=query_embedding_cache_size,
+                query_store=store,
+            )
+        self.embeddings = embeddings
+        self.vector_store = None
+        if snapshot_path is None:
+            from langchain_qdrant import QdrantVectorStore
+
+            self.vector_store = QdrantVectorStore(
+                client=client,
+                collection_name=collection_name,
+                embedding=embeddings,
+            )
         self.client = client
+        self.async_client = async_client
         self.collection_name = collection_name
+        # 역참조 인덱스는 재적재로 index_version이 바뀌면 다음 조회에서 다시 읽는다
+        self.reverse_ref_index: dict[str, list[str]] | None = None
+        self._reverse_ref_path = None
+        self._reverse_ref_version = None
+        self._reverse_ref_loaded = ""
+        self._reverse_ref_lock = threading.Lock()
+        if reverse_ref_index_path and Path(reverse_ref_index_path).exists():
+            from architecture_agent.ingestion.index_version import IndexVersionWatcher
+
+            self._reverse_ref_path = reverse_ref_index_path
+            if index_version_path:
+                self._reverse_ref_version = IndexVersionWatcher(index_version_path)
+            self._reload_reverse_refs()
+
+        # article_store=True면 시작 시 payload 전체를 메모리에 올리고, 인덱스 버전이 바뀌면 다시 적재
+        self.article_store = None
+        self._store_version = None
+        self._store_lock = threading.Lock()
+        if snapshot_path is not None:
+            from architecture_agent.ingestion.index_version import IndexVersionWatcher
+            from architecture_agent.ingestion.serving_snapshot import MANIFEST_FILE
+
+            # snapshot이 다시 export되면 manifest version이 바뀌어 다음 조회에서 새 snapshot을 연다
+            self._store_version = IndexVersionWatcher(str(Path(snapshot_path) / MANIFEST_FILE))
+            self._refresh_article_store()
+        elif article_store or self.reverse_ref_index is not None:
+            # 역참조 인덱스의 chunk key를 Qdrant 왕복 없이 풀려면 조문 저장소가 필요하다
+            from architecture_agent.ingestion.index_version import IndexVersionWatcher
+
+            if index_version_path:
+                self._store_version = IndexVersionWatcher(index_version_path)
+            self._refresh_article_store()
+
+    def _reload_reverse_refs(self) -> None:
+        from architecture_agent.ingestion.reverse_refs import load_reverse_ref_index
+
+        with self._reverse_ref_lock:
+            version = self._reverse_ref_version.current() if self._reverse_ref_version else ""
+            if self.reverse_ref_index is not None and version == self._reverse_ref_loaded:
+                return
+            self.reverse_ref_index = load_reverse_ref_index(self._reverse_ref_path)
+            self._reverse_ref_loaded = version
+
+    def _reverse_refs(self) -> dict[str, list[str]] | None:
+        if self.reverse_ref_index is None:
+            return None
+        if self._reverse_ref_version is not None and self._reverse_ref_version.current() != self._reverse_ref_loaded:
+            self._reload_reverse_refs()
+        return self.reverse_ref_index
+
+    def _refresh_article_store(self) -> None:
+        from architecture_agent.agent.article_store import ArticleStore
+
+        with self._store_lock:
+            version = self._store_version.current() if self._store_version else ""
+            if self.article_store is not None and self.article_store.version == version:
+                return
+            if self._snapshot_path is not None:
+                # export가 디렉터리를 교체하는 순간(manifest 없음)에는 기존 snapshot을 계속 사용
+                if self.article_store is not None and not version:
+                    return
+                from architecture_agent.ingestion.serving_snapshot import open_serving_snapshot
+
+                with timed_call("snapshot", "open"):
+                    self.article_store = open_serving_snapshot(self._snapshot_path)
+                return
+            with timed_call("article_store", "load"):
+                self.article_store = ArticleStore.from_client(self.client, self.collection_name, version=version)
+
+    def _store_is_stale(self) -> bool:
+        return self._store_version is not None and self._store_version.current() != self.article_store.version
+
+    def _articles(self):
+        if self.article_store is None:
+            return None
+        if self._store_is_stale():
+            self._refresh_article_store()
+        return self.article_store
+
+    async def _aarticles(self):
+        if self.article_store is None:
+            return None
+        if self._store_is_stale():
+            await asyncio.to_thread(self._refresh_article_store)
+        return self.article_store
 
-    def similarity_search(self, query: str, k: int = 6) -> list[dict]:
-        docs = self.vector_store.similarity_search(query, k=k)
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 6,
+        law_id: str | None = None,
+        law_type: str | None = None,
+        law_name: str | None = None,
+    ) -> list[dict]:
+        if self._snapshot_path is not None:
+            vector = self.embed_query(query)
+            with timed_call("snapshot", "search"):
+                return self._articles().search_many([vector], k, law_id=law_id, law_type=law_type, law_name=law_name)[0]
+        query_filter = build_metadata_filter(law_id=law_id, law_type=law_type, law_name=law_name)
+        with timed_call("vector_store", "similarity_search"):
+            docs = self.vector_store.similarity_search(query, k=k, filter=query_filter)
         return [{"content": d.page_content, "metadata": d.metadata} for d in docs]
 
-    def get_by_exact(self, law_id: str, article_num: str) -> list[dict]:
-        from qdrant_client.http.models import FieldCondition, Filter, MatchValue
+    def _batch_query_requests(
+        self,
+        vectors: list[list[float]],
+        k: int,
+        law_id: str | None,
+        law_type: str | None,
+        law_name: str | None,
+    ) -> list:
+        from qdrant_client.http.models import QueryRequest
+
+        query_filter = build_metadata_filter(law_id=law_id, law_type=law_type, law_name=law_name)
+        return [
+            QueryRequest(
+                query=vector,
+                using=self.vector_store.vector_name or None,
+                filter=query_filter,
+                limit=k,
+                with_payload=True,
+                with_vector=False,
+            )
+            for vector in vectors
+        ]
+
+    def similarity_search_many(
+        self,
+        queries: list[str],
+        k: int = 6,
+        law_id: str | None = None,
+        law_type: str | None = None,
+        law_name: str | None = None,
+    ) -> list[list[dict]]:
+        # 질의 변형을 embed_documents 한 번으로 임베딩하고 Qdrant batch query 한 번으로 검색
+        if not queries:
+            return []
+        embeddings = self.embeddings
+        embed = getattr(embeddings, "embed_queries", None) or embeddings.embed_documents
+        with timed_call("embedding", "embed_queries"):
+            vectors = embed(list(queries))
+        if self._snapshot_path is not None:
+            with timed_call("snapshot", "search"):
+                return self._articles().search_many(vectors, k, law_id=law_id, law_type=law_type, law_name=law_name)
+        with timed_call("qdrant", "query_batch_points"):
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=self._batch_query_requests(vectors, k, law_id, law_type, law_name),
+            )
+        return [[self._hit_to_doc(point) for point in response.points] for response in responses]
+
+    async def asimilarity_search_many(
+        self,
+        queries: list[str],
+        k: int = 6,
+        law_id: str | None = None,
+        law_type: str | None = None,
+        law_name: str | None = None,
+    ) -> list[list[dict]]:
+        if not queries:
+            return []
+        embeddings = self.embeddings
+        embed = getattr(embeddings, "aembed_queries", None) or embeddings.aembed_documents
+        with timed_call("embedding", "embed_queries"):
+            vectors = await embed(list(queries))
+        if self._snapshot_path is not None:
+            store = await self._aarticles()
+            with timed_call("snapshot", "search"):
+                return await asyncio.to_thread(
+                    store.search_many, vectors, k, law_id=law_id, law_type=law_type, law_name=law_name
+                )
+        requests = self._batch_query_requests(vectors, k, law_id, law_type, law_name)
+        with timed_call("qdrant", "query_batch_points"):
+            if self.async_client is not None:
+                responses = await self.async_client.query_batch_points(
+                    collection_name=self.collection_name,
+                    requests=requests,
+                )
+            else:
+                responses = await asyncio.to_thread(
+                    self.client.query_batch_points,
+                    collection_name=self.collection_name,
+                    requests=requests,
+                )
+        return [[self._hit_to_doc(point) for point in response.points] for response in responses]
+
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 6,
+        law_id: str | None = None,
+        law_type: str | None = None,
+        law_name: str | None = None,
+    ) -> list[dict]:
+        hits = await self.asimilarity_search_many([query], k=k, law_id=law_id, law_type=law_type, law_name=law_name)
+        return hits[0]
+
+    def embed_query(self, query: str) -> list[float]:
+        with timed_call("embedding", "embed_query"):
+            return self.embeddings.embed_query(query)
+
+    async def aembed_query(self, query: str) -> list[float]:
+        with timed_call("embedding", "embed_query"):
+            return await self.embeddings.aembed_query(query)
+
+    def embedding_cache_stats(self) -> dict:
+        query_stats = getattr(self.embeddings, "query_stats", None)
+        return query_stats() if query_stats else {}
 
-        result, _ = self.client.scroll(
+    def _hit_to_doc(self, point) -> dict:
+        # similarity_search와 같은 Document 변환(_id, _collection_name 포함)을 사용
+        store = self.vector_store
+        doc = store._document_from_point(
+            point,
+            self.collection_name,
+            store.content_payload_key,
+            store.metadata_payload_key,
+        )
+        return {"content": doc.page_content, "metadata": doc.metadata}
+
+    def _exact_scroll_kwargs(self, law_id: str, article_num: str) -> dict[str, Any]:
+        return dict(
             collection_name=self.collection_name,
-            scroll_filter=Filter(
-                must=[
-                    FieldCondition(key="law_id", match=MatchValue(value=str(law_id))),
-                    FieldCondition(key="article_num", match=MatchValue(value=str(article_num))),
-                ]
-            ),
+            scroll_filter=build_metadata_filter(law_id=law_id, article_num=article_num),
             limit=5,
             with_payload=True,
             with_vectors=False,
         )
-        return [
-            {
-                "content": point.payload.get("content_original", ""),
-                "metadata": point.payload,
-            }
-            for point in result
-        ]
+
+    def get_by_exact(self, law_id: str, article_num: str) -> list[dict]:
+        store = self._articles()
+        if store is not None:
+            return store.get(law_id, article_num)
+        with timed_call("qdrant", "scroll"):
+            result, _ = self.client.scroll(**self._exact_scroll_kwargs(law_id, article_num))
+        return [point_to_doc(point) for point in result]
+
+    async def aget_by_exact(self, law_id: str, article_num: str) -> list[dict]:
+        store = await self._aarticles()
+        if store is not None:
+            return store.get(law_id, article_num)
+        kwargs = self._exact_scroll_kwargs(law_id, article_num)
+        with timed_call("qdrant", "scroll"):
+            if self.async_client is not None:
+                result, _ = await self.async_client.scroll(**kwargs)
+            else:
+                result, _ = await asyncio.to_thread(self.client.scroll, **kwargs)
+        return [point_to_doc(point) for point in result]
+
+    @staticmethod
+    def _exact_key(law_id: str, article_num: str) -> tuple[str, str]:
+        raw = str(law_id).strip()
+        return (raw.lstrip("0") or raw, str(article_num))
+
+    def _many_exact_point_ids(self, keys: list[tuple[str, str]]) -> list[str]:
+        from architecture_agent.ingestion.change_detect import point_id_for_key
+
+        # point id는 적재 당시 law_id 표기("1823"/"001823")에 따라 달라서 두 표기를 모두 조회
+        return list(
+            dict.fromkeys(
+                point_id_for_key(f"{variant}:{article_num}")
+                for law_id, article_num in keys
+                for variant in _law_id_variants(law_id)
+            )
+        )
+
+    @staticmethod
+    def _many_exact_filter(keys: list[tuple[str, str]]):
+        from qdrant_client.http.models import Filter
+
+        return Filter(should=[build_metadata_filter(law_id=law_id, article_num=article_num) for law_id, article_num in keys])
+
+    def _group_exact(
+        self,
+        keys: list[tuple[str, str]],
+        points: list,
+        out: dict[tuple[str, str], list[dict]],
+    ) -> None:
+        wanted = {self._exact_key(*key): key for key in keys}
+        for point in points:
+            doc = point_to_doc(point)
+            meta = doc["metadata"]
+            article = article_label(meta.get("article_num", ""), meta.get("article_sub", ""))
+            key = wanted.get(self._exact_key(meta.get("law_id", ""), article))
+            if key is not None and len(out[key]) < 5:
+                out[key].append(doc)
+
+    def get_many_exact(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        """Fetch several (law_id, article_num) pairs: one retrieve by point id, then one filtered scroll for misses."""
+        keys = list(dict.fromkeys((str(law_id), str(article_num)) for law_id, article_num in keys))
+        store = self._articles()
+        if store is not None:
+            return store.get_many(keys)
+        out: dict[tuple[str, str], list[dict]] = {key: [] for key in keys}
+        if not keys:
+            return out
+
+        with timed_call("qdrant", "retrieve"):
+            points = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=self._many_exact_point_ids(keys),
+                with_payload=True,
+                with_vectors=False,
+            )
+        self._group_exact(keys, points, out)
+
+        missing = [key for key in keys if not out[key]]
+        if missing:
+            # 임의 id로 적재된 이전 컬렉션 등 point id로 못 찾은 조문만 필터 한 번으로 조회
+            offset = None
+            while True:
+                with timed_call("qdrant", "scroll"):
+                    result, offset = self.client.scroll(
+                        collection_name=self.collection_name,
+                        scroll_filter=self._many_exact_filter(missing),
+                        offset=offset,
+                        limit=max(16, 5 * len(missing)),
+                        with_payload=True,
+                        with_vectors=False,
+                    )
+                self._group_exact(missing, result, out)
+                if offset is None:
+                    break
+        return out
+
+    async def aget_many_exact(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        store = await self._aarticles()
+        if store is not None:
+            return store.get_many(list(dict.fromkeys((str(law_id), str(article_num)) for law_id, article_num in keys)))
+        if self.async_client is None:
+            return await asyncio.to_thread(self.get_many_exact, keys)
+
+        keys = list(dict.fromkeys((str(law_id), str(article_num)) for law_id, article_num in keys))
+        out: dict[tuple[str, str], list[dict]] = {key: [] for key in keys}
+        if not keys:
+            return out
+
+        with timed_call("qdrant", "retrieve"):
+            points = await self.async_client.retrieve(
+                collection_name=self.collection_name,
+                ids=self._many_exact_point_ids(keys),
+                with_payload=True,
+                with_vectors=False,
+            )
+        self._group_exact(keys, points, out)
+
+        missing = [key for key in keys if not out[key]]
+        offset = None
+        while missing:
+            with timed_call("qdrant", "scroll"):
+                result, offset = await self.async_client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=self._many_exact_filter(missing),
+                    offset=offset,
+                    limit=max(16, 5 * len(missing)),
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            self._group_exact(missing, result, out)
+            if offset is None:
+                break
+        return out
 
     def find_children_by_parent_ref(self, law_name: str, article_num: str) -> list[dict]:
-        result, _ = self.client.scroll(
-            collection_name=self.collection_name,
-            limit=500,
-            with_payload=True,
-            with_vectors=False,
+        store = self._articles()
+        index = self._reverse_refs()
+        if store is not None and index is not None:
+            return self._children_from_reverse_index(store, index, law_name, article_num)
+        if store is not None:
+            return store.children_of(law_name, article_num)
+        return self._scroll_children_by_parent_ref(law_name, article_num)
+
+    def law_articles(self, law_id: str) -> list[dict]:
+        store = self._articles()
+        if store is not None:
+            return store.law_articles(law_id)
+        out = []
+        offset = None
+        while True:
+            with timed_call("qdrant", "scroll"):
+                result, offset = self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=build_metadata_filter(law_id=law_id),
+                    offset=offset,
+                    limit=256,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            out.extend(point_to_doc(point) for point in result)
+            if offset is None:
+                break
+        return out
+
+    @staticmethod
+    def _children_from_reverse_index(store, index: dict[str, list[str]], law_name: str, article_num: str) -> list[dict]:
+        from architecture_agent.ingestion.reverse_refs import parent_ref_key
+
+        # 적재 시 만든 "모법 조문 -> 시행령 chunk key(law_id:article_num)" 인덱스를 조문 저장소에서 바로 푼다
+        out: list[dict] = []
+        for key in index.get(parent_ref_key(law_name, str(article_num)), []):
+            law_id, _, child_article = key.partition(":")
+            out.extend(store.get(law_id, child_article))
+        return out
+
+    def _scroll_children_by_parent_ref(self, law_name: str, article_num: str) -> list[dict]:
+        from qdrant_client.http.models import FieldCondition, Filter, MatchValue, Nested, NestedCondition
+
+        # 시행령 chunk의 parent_law_refs 중 (law_name, article)이 같은 항목이 있는 point만 서버에서 필터
+        ref_filter = Filter(
+            must=[
+                NestedCondition(
+                    nested=Nested(
+                        key=f"{METADATA_KEY}.parent_law_refs",
+                        filter=Filter(
+                            must=[
+                                FieldCondition(key="law_name", match=MatchValue(value=law_name)),
+                                FieldCondition(key="article", match=MatchValue(value=str(article_num))),
+                            ]
+                        ),
+                    )
+                )
+            ]
         )
         out = []
-        for point in result:
-            payload = point.payload or {}
-            refs = payload.get("parent_law_refs", [])
-            for ref in refs:
-                if ref.get("law_name") == law_name and str(ref.get("article")) == str(article_num):
-                    out.append({"content": payload.get("content_original", ""), "metadata": payload})
-                    break
+        offset = None
+        while True:
+            with timed_call("qdrant", "scroll"):
+                result, offset = self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=ref_filter,
+                    offset=offset,
+                    limit=256,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            out.extend(point_to_doc(point) for point in result)
+            if offset is None:
+                break
         return out
 
 
@@ -154,27 +743,25 @@ def build_tools(
     retriever: LawRetriever,
     appendix_index: Appendix1Index,
 ):
+    tool = _tool_decorator()
+
     @tool
     def search_law_chunks(query: str, law_name: str | None = None, law_type: str | None = None, k: int = 6) -> list[dict]:
-        """Semantic search for law chunks with optional metadata post-filtering."""
-        items = retriever.similarity_search(query=query, k=max(k, 10))
-        out = []
-        for item in items:
-            meta = item["metadata"]
-            if law_name and meta.get("law_name") != law_name:
-                continue
-            if law_type and meta.get("law_type") != law_type:
-                continue
-            out.append(item)
-            if len(out) >= k:
-                break
-        return out
+        """Semantic search for law chunks with optional law_name/law_type filters applied in Qdrant."""
+        return retriever.similarity_search(query=query, k=k, law_name=law_name, law_type=law_type)
 
     @tool
     def get_article(law_id: str, article_num: str) -> list[dict]:
         """Get exact article by law_id and article_num."""
         return retriever.get_by_exact(law_id=law_id, article_num=article_num)
 
+    @tool
+    def get_articles(keys: list[str]) -> dict[str, list[dict]]:
+        """Get several exact articles at once; keys are "law_id:article_num" strings."""
+        pairs = [tuple(k.split(":", 1)) for k in keys if ":" in k]
+        found = retriever.get_many_exact(pairs)
+        return {f"{law_id}:{article_num}": docs for (law_id, article_num), docs in found.items()}
+
     @tool
     def find_children_by_parent_ref(law_name: str, article_num: str) -> list[dict]:
         """Find 시행령 articles that reference parent law article."""
@@ -185,4 +772,4 @@ def build_tools(
         """Lookup Appendix 1 taxonomy by exact, alias, and keyword matching."""
         return appendix_index.lookup(term_or_query=term_or_query)
 
-    return [search_law_chunks, get_article, find_children_by_parent_ref, lookup_appendix1_term]
+    return [search_law_chunks, get_article, get_articles, find_children_by_parent_ref, lookup_appendix1_term]
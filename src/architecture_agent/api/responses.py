@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
+try:
+    import brotli
+except Exception:  # pragma: no cover
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    # pydantic 검증/직렬화를 거치지 않고 dict를 바로 bytes로 (orjson이 없으면 json으로)
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(raw: str | None) -> dict[str, Any] | None:
+    """"answer,references.section,references.law_name" -> {"answer": None, "references": {"section": None, ...}}."""
+    if not raw:
+        return None
+    spec: dict[str, Any] = {}
+    for path in (p.strip() for p in raw.split(",")):
+        if not path:
+            continue
+        node = spec
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None
+            else:
+                child = node.get(part, {})
+                if child is None:
+                    # 상위 필드 전체를 이미 요청한 경우 하위 선택은 무시
+                    break
+                node[part] = child
+                node = child
+    return spec or None
+
+
+def select_fields(value: Any, spec: dict[str, Any] | None) -> Any:
+    # spec None이면 값 전체, list는 원소마다 같은 선택을 적용
+    if spec is None:
+        return value
+    if isinstance(value, list):
+        return [select_fields(v, spec) for v in value]
+    if isinstance(value, dict):
+        return {k: select_fields(value[k], sub) for k, sub in spec.items() if k in value}
+    return value
+
+
+def validate_fields(spec: dict[str, Any] | None, allowed: set[str]) -> None:
+    unknown = sorted(set(spec or {}) - allowed)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown fields: {', '.join(unknown)}")
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in (coding, "*") and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            return True
+    return False
+
+
+def encoded_json_response(payload: Any, accept_encoding: str = "", min_bytes: int = COMPRESS_MIN_BYTES) -> Response:
+    """JSON response, br/gzip-compressed when the body is large and the client accepts it."""
+    body = dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= min_bytes:
+        if brotli is not None and _accepts(accept_encoding, "br"):
+            body = brotli.compress(body, quality=4)
+            headers["Content-Encoding"] = "br"
+        elif _accepts(accept_encoding, "gzip"):
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,18 +1,45 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import threading
+import time
+from contextlib import aclosing, asynccontextmanager
 from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 
-from fastapi import FastAPI, HTTPException
+import anyio
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from architecture_agent.service.zero_hop import ZeroHopLawAgent
+from architecture_agent.api.responses import (
+    FastJSONResponse,
+    encoded_json_response,
+    parse_fields,
+    select_fields,
+    validate_fields,
+)
+from architecture_agent.metrics import REGISTRY, render_gauge
+from architecture_agent.service.admission import AdmissionLease, AdmissionLimiter, AdmissionRejected
+
+if TYPE_CHECKING:
+    from architecture_agent.service.zero_hop_async import AsyncZeroHopLawAgent
 
 
 class AskRequest(BaseModel):
     query: str = Field(..., min_length=1)
     k: int = Field(default=5, ge=1, le=15)
+    fields: str | None = Field(default=None, description='예: "answer,references.section"')
+    include_trace: bool = True
+
+
+class BatchAskRequest(BaseModel):
+    queries: list[str] = Field(..., min_length=1, max_length=5000)
+    k: int = Field(default=5, ge=1, le=15)
+    max_concurrency: int = Field(default=8, ge=1, le=64)
 
 
 class AskResponse(BaseModel):
@@ -24,21 +51,164 @@ class AskResponse(BaseModel):
     trace: dict
 
 
+_agent_lock = threading.Lock()
+
+
+def get_agent() -> AsyncZeroHopLawAgent:
+    # 로컬 Qdrant 저장소는 한 번만 열 수 있어 warm-up과 요청이 동시에 만들지 않도록 잠근다
+    with _agent_lock:
+        return _build_agent()
+
+
 @lru_cache(maxsize=1)
-def get_agent() -> ZeroHopLawAgent:
-    return ZeroHopLawAgent(
+def _build_agent() -> AsyncZeroHopLawAgent:
+    # langchain/qdrant/ClovaX import는 여기서 처음 일어나므로 서버 모듈 import는 가볍게 유지된다
+    from architecture_agent.service.zero_hop_async import AsyncZeroHopLawAgent
+
+    return AsyncZeroHopLawAgent(
         collection_name=os.getenv("QDRANT_COLLECTION", "building_law"),
         qdrant_path=os.getenv("QDRANT_PATH", "./qdrant_data"),
         qdrant_url=os.getenv("QDRANT_URL") or None,
         qdrant_api_key=os.getenv("QDRANT_API_KEY") or None,
         qdrant_prefer_grpc=(os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"),
         appendix_json=os.getenv("APPENDIX_JSON", "data/processed/appendix1_terms.json"),
+        reverse_refs_json=os.getenv("REVERSE_REFS_JSON", "data/processed/parent_ref_index.json"),
+        query_embedding_cache_dir=os.getenv("QUERY_EMBEDDING_CACHE_DIR", "data/processed/query_embedding_cache") or None,
         answer_model=os.getenv("CLOVA_MODEL", "HCX-005"),
         answer_temperature=float(os.getenv("CLOVA_TEMPERATURE", "0.0")),
+        ref_check_concurrency=int(os.getenv("REF_CHECK_CONCURRENCY", "4")),
+        ref_check_timeout=float(os.getenv("REF_CHECK_TIMEOUT", "20")),
+        ref_check_mode=os.getenv("REF_CHECK_MODE", "batch"),
+        index_version_path=os.getenv("INDEX_VERSION_JSON", "data/processed/index_version.json"),
+        answer_cache_size=int(os.getenv("ANSWER_CACHE_SIZE", "256")),
+        answer_cache_ttl=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+        answer_cache_similarity=float(os.getenv("ANSWER_CACHE_SIMILARITY")) if os.getenv("ANSWER_CACHE_SIMILARITY") else None,
+        article_store=(os.getenv("ARTICLE_STORE", "true").lower() == "true"),
+        snapshot_path=os.getenv("SERVING_SNAPSHOT_PATH") or None,
+        answer_token_budget=int(os.getenv("ANSWER_TOKEN_BUDGET", "1200")),
+        precheck_token_budget=int(os.getenv("PRECHECK_TOKEN_BUDGET", "600")),
+        follow_token_budget=int(os.getenv("FOLLOW_TOKEN_BUDGET", "200")),
+        batch_follow_token_budget=int(os.getenv("BATCH_FOLLOW_TOKEN_BUDGET", "800")),
+    )
+
+
+admission = AdmissionLimiter(
+    max_in_flight=int(os.getenv("ASK_MAX_IN_FLIGHT", "64")),
+    max_waiting=int(os.getenv("ASK_MAX_QUEUE", "256")),
+    wait_timeout=float(os.getenv("ASK_QUEUE_TIMEOUT", "10")),
+)
+
+
+async def _acquire_slot() -> AdmissionLease:
+    try:
+        return await admission.acquire()
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+class ReleasingStreamingResponse(StreamingResponse):
+    # body generator가 한 번도 돌지 못하고 끝나도(시작 전 연결 끊김, 전송 실패) on_close를 반드시 호출
+    # send 도중 연결이 끊기면 generator는 yield에 멈춘 채 남으므로 먼저 닫아 뒤에서 돌던 작업을 정리한다
+    def __init__(self, content: Any, on_close: Callable[[], None], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                aclose = getattr(self.body_iterator, "aclose", None)
+                if aclose is not None:
+                    with anyio.CancelScope(shield=True):
+                        await aclose()
+            finally:
+                self.on_close()
+
+
+class Readiness:
+    # starting -> warming_up -> ready | failed; WARMUP_ON_STARTUP=false면 처음부터 ready(첫 요청에서 lazy 생성)
+    def __init__(self):
+        self.status = "starting"
+        self.detail: dict = {}
+        self.task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+
+readiness = Readiness()
+
+
+def _warm_up() -> dict:
+    start = time.perf_counter()
+    agent = get_agent()
+    detail = {"init_ms": round((time.perf_counter() - start) * 1000, 3)}
+    warm_up = getattr(agent, "warm_up", None)
+    if warm_up is not None:
+        detail["warm_up_ms"] = warm_up()
+    return detail
+
+
+async def _run_warm_up() -> None:
+    readiness.status = "warming_up"
+    try:
+        readiness.detail = await asyncio.to_thread(_warm_up)
+        readiness.status = "ready"
+    except Exception as exc:
+        readiness.status = "failed"
+        readiness.detail = {"error": f"{type(exc).__name__}: {exc}"}
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # 시작하자마자 agent 생성 + 임베딩 1회 + Qdrant 검색 1회를 백그라운드로 수행하고, 끝나면 /ready가 200
+    readiness.task, readiness.detail = None, {}
+    if os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true":
+        readiness.task = asyncio.create_task(_run_warm_up())
+    else:
+        readiness.status = "ready"
+    yield
+    if readiness.task is not None and not readiness.task.done():
+        readiness.task.cancel()
+
+
+def _not_ready() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"agent unavailable: {readiness.detail.get('error', readiness.status)}",
+        headers={"Retry-After": "30"},
     )
 
 
-app = FastAPI(title="Architecture Law Agent API", version="0.1.0")
+async def _agent_when_ready() -> AsyncZeroHopLawAgent:
+    # warm-up 중에 들어온 요청은 event loop를 막지 않고 warm-up 완료를 기다린다
+    task = readiness.task
+    if task is not None and not task.done():
+        await asyncio.wait({task})
+    # 초기화가 한 번 실패하면 요청마다 다시 만들지 않고 바로 503 (재시도는 재시작으로)
+    if readiness.status == "failed":
+        raise _not_ready()
+    try:
+        # WARMUP_ON_STARTUP=false면 첫 요청에서 agent를 만들므로 event loop 밖에서 생성
+        return await asyncio.to_thread(get_agent)
+    except Exception as exc:
+        readiness.status = "failed"
+        readiness.detail = {"error": f"{type(exc).__name__}: {exc}"}
+        raise _not_ready() from exc
+
+
+app = FastAPI(
+    title="Architecture Law Agent API",
+    version="0.1.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -54,17 +224,156 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/api/v1/chat/ask", response_model=AskResponse)
-def ask(req: AskRequest) -> AskResponse:
+@app.get("/ready")
+def ready() -> JSONResponse:
+    # /health는 프로세스 생존, /ready는 agent 초기화와 warm-up 완료 여부 (rolling deploy 트래픽 전환 기준)
+    body = {"status": readiness.status, **readiness.detail}
+    return FastJSONResponse(body, status_code=200 if readiness.ready else 503)
+
+
+@app.get("/metrics")
+def metrics() -> PlainTextResponse:
+    # 단계/외부 호출 히스토그램, LLM 입출력 크기, 캐시 결과 카운터 + admission 상태 (Prometheus text format)
+    body = REGISTRY.render() + render_gauge(
+        "law_agent_admission",
+        "Admission limiter state.",
+        "stat",
+        admission.stats(),
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _ask_payload(result, spec: dict | None, include_trace: bool) -> dict:
+    payload = {
+        "answer": result.answer,
+        "targets": result.targets,
+        "steps": result.steps,
+        "references": result.references,
+        "contexts_count": result.contexts_count,
+    }
+    if include_trace:
+        payload["trace"] = result.trace
+    return select_fields(payload, spec)
+
+
+@app.post("/api/v1/chat/ask", responses={200: {"model": AskResponse}})
+async def ask(
+    req: AskRequest,
+    request: Request,
+    fields: str | None = Query(default=None),
+    trace: bool | None = Query(default=None),
+):
+    # fields(쿼리 파라미터가 body보다 우선)로 필요한 필드만, trace=false면 trace 없이 응답
+    spec = parse_fields(fields if fields is not None else req.fields)
+    validate_fields(spec, set(AskResponse.model_fields))
+    include_trace = trace if trace is not None else req.include_trace
     try:
-        result = get_agent().ask(query=req.query.strip(), k=req.k)
-        return AskResponse(
-            answer=result.answer,
-            targets=result.targets,
-            steps=result.steps,
-            references=result.references,
-            contexts_count=result.contexts_count,
-            trace=result.trace,
-        )
+        async with admission.slot():
+            agent = await _agent_when_ready()
+            result = await agent.aask(query=req.query.strip(), k=req.k)
+    except HTTPException:
+        raise
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"ask failed: {exc}") from exc
+    # pydantic 모델을 거치지 않고 orjson으로 직렬화, 큰 응답은 br/gzip 압축
+    return encoded_json_response(
+        _ask_payload(result, spec, include_trace),
+        accept_encoding=request.headers.get("accept-encoding", ""),
+    )
+
+
+async def _sse_events(agent: AsyncZeroHopLawAgent, query: str, k: int, lease: AdmissionLease) -> AsyncIterator[str]:
+    # 파이프라인 스레드가 call_soon_threadsafe로 asyncio.Queue에 넣고 여기서는 await만 한다
+    # (스트림마다 기본 executor 스레드를 붙잡지 않아 to_thread를 쓰는 임베딩/캐시 I/O가 밀리지 않는다)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def _push(item) -> None:
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, item)
+        except RuntimeError:
+            # 서버 종료로 loop가 닫혔으면 받을 쪽이 없으므로 파이프라인을 멈춘다
+            stop.set()
+
+    agent.start_stream(query, _push, k=k, stop=stop)
+    try:
+        while True:
+            item = await events.get()
+            if item is None:
+                return
+            event, data = item
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    finally:
+        # 클라이언트가 끊기면 파이프라인 스레드도 다음 단계/token에서 멈추고 admission 자리를 돌려준다
+        stop.set()
+        lease.release()
+
+
+@app.post("/api/v1/chat/ask/stream")
+async def ask_stream(req: AskRequest) -> StreamingResponse:
+    # targets/contexts/precheck/ref_expanded/references/token/done(error) 이벤트를 SSE로 전송
+    # 스트림 전체가 admission 한 자리를 차지한다
+    lease = await _acquire_slot()
+    try:
+        agent = await _agent_when_ready()
+        return ReleasingStreamingResponse(
+            _sse_events(agent, req.query.strip(), req.k, lease),
+            on_close=lease.release,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except BaseException:
+        lease.release()
+        raise
+
+
+async def _ndjson_results(agent: AsyncZeroHopLawAgent, req: BatchAskRequest) -> AsyncIterator[str]:
+    # aclosing: 이 generator가 닫히면 aask_many도 바로 닫혀 남은 질문 처리를 취소한다
+    items = agent.aask_many(req.queries, k=req.k, max_concurrency=req.max_concurrency)
+    async with aclosing(items):
+        async for index, result, error in items:
+            row: dict = {"index": index, "query": req.queries[index]}
+            if error is not None:
+                row["error"] = error
+            else:
+                row["result"] = {
+                    "answer": result.answer,
+                    "targets": result.targets,
+                    "references": result.references,
+                    "contexts_count": result.contexts_count,
+                    "trace": result.trace,
+                }
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+@app.post("/api/v1/chat/ask/batch")
+async def ask_batch(req: BatchAskRequest) -> StreamingResponse:
+    # 배치 전체가 admission 한 자리를 차지하며, 자리를 얻은 뒤에 응답 스트림을 시작한다
+    lease = await _acquire_slot()
+    try:
+        agent = await _agent_when_ready()
+    except BaseException:
+        lease.release()
+        raise
+
+    async def _body() -> AsyncIterator[str]:
+        try:
+            async with aclosing(_ndjson_results(agent, req)) as lines:
+                async for line in lines:
+                    yield line
+        finally:
+            lease.release()
+
+    # 완료된 순서대로 한 줄씩 NDJSON으로 반환하며, 항목별 실패는 error 필드로 표시
+    try:
+        return ReleasingStreamingResponse(_body(), on_close=lease.release, media_type="application/x-ndjson")
+    except BaseException:
+        lease.release()
+        raise
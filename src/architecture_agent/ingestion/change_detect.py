@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from architecture_agent.ingestion.parse_law import article_label
+from architecture_agent.ingestion.resolve_abbr import chunk_key
+from architecture_agent.schemas import ArticleChunk
+
+
+def _stable_hash(obj) -> str:
+    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def compute_source_hash(chunk: ArticleChunk) -> str:
+    # 원문 기준 hash: 축약어 LLM 추출 결과 재사용 여부 판단에 사용
+    # 가지번호가 없으면 article_label == article_num이라 기존 hash와 같다
+    return _stable_hash([chunk.law_id, article_label(chunk.article_num, chunk.article_sub), chunk.article_title, chunk.content])
+
+
+def compute_content_hash(chunk: ArticleChunk) -> str:
+    # 임베딩 대상 텍스트 + payload 전체 기준 hash: 재임베딩/upsert 여부 판단에 사용
+    return _stable_hash(
+        {
+            "page_content": chunk.content_resolved or chunk.content,
+            "payload": chunk.to_payload(),
+        }
+    )
+
+
+def point_id_for_key(key: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+
+@dataclass
+class IndexDiff:
+    to_upsert: list[ArticleChunk] = field(default_factory=list)
+    to_delete: list[str] = field(default_factory=list)
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "deleted": len(self.to_delete),
+        }
+
+
+def classify_chunk(chunk: ArticleChunk, indexed_state: dict[str, dict], diff: IndexDiff) -> bool:
+    state = indexed_state.get(chunk_key(chunk))
+    if state is None:
+        diff.created += 1
+        return True
+    if state.get("content_hash") != compute_content_hash(chunk):
+        diff.updated += 1
+        return True
+    diff.unchanged += 1
+    return False
+
+
+def stale_point_ids(
+    indexed_state: dict[str, dict],
+    seen_keys: set[str],
+    law_ids: set[str],
+) -> list[str]:
+    # 삭제는 이번 실행에 포함된 법령 범위로 한정 (부분 ingestion 시 다른 법령 보존)
+    out: list[str] = []
+    for key, state in indexed_state.items():
+        if key in seen_keys or str(state.get("law_id", "")) not in law_ids:
+            continue
+        out.append(str(state.get("point_id") or point_id_for_key(key)))
+    return out
+
+
+def diff_chunks(
+    chunks: Iterable[ArticleChunk],
+    indexed_state: dict[str, dict],
+) -> IndexDiff:
+    diff = IndexDiff()
+    seen: set[str] = set()
+    law_ids: set[str] = set()
+
+    for chunk in chunks:
+        seen.add(chunk_key(chunk))
+        law_ids.add(str(chunk.law_id))
+        if classify_chunk(chunk, indexed_state, diff):
+            diff.to_upsert.append(chunk)
+
+    diff.to_delete = stale_point_ids(indexed_state, seen, law_ids)
+    return diff
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from architecture_agent.metrics import record_cache, timed_call
+
+try:
+    from langchain_core.embeddings import Embeddings
+except Exception:  # pragma: no cover
+    Embeddings = object
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_EMBEDDING_CACHE_DIR = "data/processed/embedding_cache"
+DEFAULT_QUERY_EMBEDDING_CACHE_DIR = "data/processed/query_embedding_cache"
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def normalize_query_text(text: str) -> str:
+    return " ".join(str(text).split())
+
+
+class EmbeddingStore:
+    # {model}.f32: float32 row-major 벡터, {model}.keys: 행 순서대로 text hash (append-only)
+    # max_entries가 있으면 행 수가 25% 넘게 초과할 때 최근에 쓰인 max_entries행만 남기도록 파일을 다시 쓴다
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_EMBEDDING_CACHE_DIR,
+        model: str = "bge-m3",
+        max_entries: int | None = None,
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        safe_model = re.sub(r"[^0-9A-Za-z._-]+", "_", model)
+        base = Path(cache_dir)
+        base.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = base / f"{safe_model}.f32"
+        self.keys_path = base / f"{safe_model}.keys"
+        self.meta_path = base / f"{safe_model}.meta.json"
+        self.lock_path = base / f"{safe_model}.lock"
+
+        self._lock = threading.Lock()
+        self.dim = 0
+        self._vectors = array("f")
+        self._rows: dict[str, int] = {}
+        # 이 프로세스에서 조회/추가된 순서(클수록 최근); compaction 때 남길 행을 고르는 기준
+        self._tick = 0
+        self._used: dict[str, int] = {}
+        self._load()
+
+    def _file_lock(self, exclusive: bool):
+        # 여러 프로세스가 같은 캐시를 쓰므로 벡터/키 두 파일은 항상 lock 안에서 함께 읽고 쓴다
+        lock = self.lock_path.open("a")
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return lock
+
+    def _read_files(self) -> tuple[array, list[str]]:
+        vectors = array("f")
+        vectors.frombytes(self.vectors_path.read_bytes())
+        keys = self.keys_path.read_text(encoding="utf-8").split()
+        # 쓰기 도중 중단된 경우 벡터/키 중 짧은 쪽 기준으로 맞춘다
+        n_rows = min(len(keys), len(vectors) // self.dim)
+        del vectors[n_rows * self.dim :]
+        return vectors, keys[:n_rows]
+
+    def _load(self) -> None:
+        if not self.meta_path.exists():
+            return
+        self.dim = int(json.loads(self.meta_path.read_text(encoding="utf-8")).get("dim", 0))
+        if not self.dim or not self.vectors_path.exists() or not self.keys_path.exists():
+            return
+
+        with self._file_lock(exclusive=False):
+            self._vectors, keys = self._read_files()
+        self._rows = {k: i for i, k in enumerate(keys)}
+
+    def _touch(self, key: str) -> None:
+        self._tick += 1
+        self._used[key] = self._tick
+
+    def _compact(self) -> None:
+        # 다른 worker가 append한 행까지 포함해 최근에 쓰인 max_entries행만 남기고 메모리도 맞춘다
+        # 이 프로세스에서 조회/추가된 행은 그 순서로, 한 번도 안 쓴 행은 그보다 오래된 것으로 보고 파일 순서로 줄 세운다
+        file_vectors, file_keys = self._read_files()
+        rows = {k: i for i, k in enumerate(file_keys)}
+        ranked = sorted(rows, key=lambda k: (self._used.get(k, 0), rows[k]))
+        keys = ranked[max(0, len(ranked) - self.max_entries) :]
+        # 가장 최근 행이 파일 끝에 오도록 다시 쓴다
+        vectors = array("f")
+        for k in keys:
+            row = rows[k]
+            vectors.extend(file_vectors[row * self.dim : (row + 1) * self.dim])
+        self._used = {k: self._used[k] for k in keys if k in self._used}
+        for path, data in ((self.vectors_path, vectors.tobytes()), (self.keys_path, "".join(f"{k}\n" for k in keys).encode("utf-8"))):
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        self._vectors = vectors
+        self._rows = {k: i for i, k in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> list[float] | None:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        self._touch(key)
+        return self._vectors[row * self.dim : (row + 1) * self.dim].tolist()
+
+    def put_many(self, items: list[tuple[str, list[float]]]) -> None:
+        with self._lock:
+            new_items = [(k, v) for k, v in dict(items).items() if k not in self._rows]
+            if not new_items:
+                return
+            if not self.dim:
+                self.dim = len(new_items[0][1])
+                self.meta_path.write_text(
+                    json.dumps({"model": self.model, "dim": self.dim}),
+                    encoding="utf-8",
+                )
+
+            chunk = array("f")
+            for _, vec in new_items:
+                if len(vec) != self.dim:
+                    raise ValueError(f"Embedding dim mismatch: expected {self.dim}, got {len(vec)}")
+                chunk.extend(vec)
+
+            # 여러 worker 프로세스가 같은 캐시에 append해도 벡터/키 행 순서가 어긋나지 않도록 파일 lock
+            with self._file_lock(exclusive=True):
+                with self.vectors_path.open("ab") as f:
+                    f.write(chunk.tobytes())
+                with self.keys_path.open("a", encoding="utf-8") as f:
+                    f.write("".join(f"{k}\n" for k, _ in new_items))
+
+                start = len(self._rows)
+                self._vectors.extend(chunk)
+                for offset, (key, _) in enumerate(new_items):
+                    self._rows[key] = start + offset
+                    self._touch(key)
+                if self.max_entries and len(self._rows) > self.max_entries + max(1, self.max_entries // 4):
+                    self._compact()
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        embeddings,
+        store: EmbeddingStore,
+        batch_size: int = 32,
+        max_parallel_batches: int = 1,
+        query_cache_size: int = 1024,
+        query_store: EmbeddingStore | None = None,
+    ):
+        self.embeddings = embeddings
+        self.store = store
+        # 질의 벡터는 문서 store와 분리된(보통 max_entries로 제한된) query_store에만 저장; 없으면 메모리 LRU만 사용
+        self.query_store = query_store
+        self.batch_size = max(1, batch_size)
+        self.max_parallel_batches = max(1, max_parallel_batches)
+        self.hits = 0
+        self.misses = 0
+
+        # 질의 임베딩: 프로세스 내 LRU -> query_store(파일) -> 임베딩 API 순으로 조회
+        self.query_cache_size = max(0, query_cache_size)
+        self._query_lru: OrderedDict[str, list[float]] = OrderedDict()
+        self._query_lock = threading.Lock()
+        self.query_memory_hits = 0
+        self.query_store_hits = 0
+        self.query_misses = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_cache_key(self.store.model, t) for t in texts]
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if self.store.get(key) is None:
+                missing.setdefault(key, text)
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        if missing:
+            pending = list(missing.items())
+            batches = [pending[i : i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+
+            def _embed_batch(batch: list[tuple[str, str]]) -> None:
+                vectors = self.embeddings.embed_documents([t for _, t in batch])
+                self.store.put_many([(k, v) for (k, _), v in zip(batch, vectors)])
+
+            if self.max_parallel_batches == 1 or len(batches) == 1:
+                for batch in batches:
+                    _embed_batch(batch)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_parallel_batches) as pool:
+                    list(pool.map(_embed_batch, batches))
+
+        return [self.store.get(k) for k in keys]
+
+    def _remember_query(self, key: str, vector: list[float]) -> None:
+        if not self.query_cache_size:
+            return
+        self._query_lru[key] = vector
+        self._query_lru.move_to_end(key)
+        while len(self._query_lru) > self.query_cache_size:
+            self._query_lru.popitem(last=False)
+
+    def _lookup_queries(self, texts: list[str]) -> tuple[list[str], dict[str, list[float]], dict[str, str]]:
+        keys = [embedding_cache_key(f"{self.store.model}:query", normalize_query_text(t)) for t in texts]
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+        memory_hits = store_hits = 0
+        with self._query_lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._query_lru.get(key)
+                if vector is not None:
+                    self._query_lru.move_to_end(key)
+                    memory_hits += 1
+                    found[key] = vector
+                    continue
+                vector = self.query_store.get(key) if self.query_store is not None else None
+                if vector is not None:
+                    store_hits += 1
+                    self._remember_query(key, vector)
+                    found[key] = vector
+                    continue
+                missing[key] = normalize_query_text(text)
+            self.query_memory_hits += memory_hits
+            self.query_store_hits += store_hits
+            self.query_misses += len(missing)
+        record_cache("query_embedding", "memory_hit", memory_hits)
+        record_cache("query_embedding", "store_hit", store_hits)
+        record_cache("query_embedding", "miss", len(missing))
+        return keys, found, missing
+
+    def _store_queries(self, found: dict[str, list[float]], missing: dict[str, str], vectors: list[list[float]]) -> None:
+        computed = list(zip(missing, vectors))
+        if self.query_store is not None:
+            self.query_store.put_many(computed)
+        with self._query_lock:
+            for key, vector in computed:
+                self._remember_query(key, vector)
+                found[key] = vector
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup_queries(texts)
+        if missing:
+            # bge-m3는 질의/문서 임베딩이 같은 벡터라 miss는 embed_documents 한 번으로 묶는다
+            with timed_call("embedding_api", "embed_documents"):
+                vectors = self.embeddings.embed_documents(list(missing.values()))
+            self._store_queries(found, missing, vectors)
+        return [found[k] for k in keys]
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup_queries(texts)
+        if missing:
+            texts_to_embed = list(missing.values())
+            with timed_call("embedding_api", "embed_documents"):
+                if hasattr(self.embeddings, "aembed_documents"):
+                    vectors = await self.embeddings.aembed_documents(texts_to_embed)
+                else:
+                    vectors = await asyncio.to_thread(self.embeddings.embed_documents, texts_to_embed)
+            # 파일 append와 flock은 event loop 밖에서
+            await asyncio.to_thread(self._store_queries, found, missing, vectors)
+        return [found[k] for k in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_queries([text])[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_queries([text]))[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.store)}
+
+    def query_stats(self) -> dict[str, float]:
+        hits = self.query_memory_hits + self.query_store_hits
+        total = hits + self.query_misses
+        return {
+            "memory_hits": self.query_memory_hits,
+            "store_hits": self.query_store_hits,
+            "misses": self.query_misses,
+            "saved_calls": hits,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._query_lru),
+            "store_entries": len(self.query_store) if self.query_store is not None else 0,
+        }
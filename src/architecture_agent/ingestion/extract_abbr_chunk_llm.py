@@ -4,6 +4,7 @@ import json
 import re
 from collections import defaultdict
 
+from architecture_agent.ingestion.llm_runner import invoke_all
 from architecture_agent.ingestion.resolve_abbr import (
     chunk_key,
     merge_abbreviation_maps,
@@ -39,35 +40,53 @@ def _parse_abbr_json(text: str) -> dict[str, str]:
     return out
 
 
+def _build_chunk_prompt(chunk: ArticleChunk, max_chars_per_chunk: int) -> str:
+    text = chunk.content[:max_chars_per_chunk]
+    return (
+        "다음 단일 조문에서 정의된 축약어만 JSON으로 추출하라.\n"
+        "반드시 축약어 키와 확장명 값만 포함하고, 모르면 빈 JSON을 반환하라.\n"
+        "규칙:\n"
+        "1) 축약어 패턴은 보통 '(이하 \"X\"이라 한다)'\n"
+        "2) 값은 가능한 완전한 명칭으로 작성\n"
+        "3) 출력은 JSON 객체만\n"
+        "예시: {\"위원회\": \"건축법 제4조에 따른 건축위원회\"}\n\n"
+        f"법령명: {chunk.law_name}\n"
+        f"조문: 제{chunk.article_num}조\n"
+        f"제목: {chunk.article_title}\n"
+        f"본문:\n{text}"
+    )
+
+
 def extract_abbreviations_by_chunk_llm(
     chunks: list[ArticleChunk],
     llm=None,
     model: str = "HCX-005",
     max_chars_per_chunk: int = 5000,
+    max_concurrency: int = 1,
+    timeout: float | None = 60.0,
+    max_retries: int = 2,
+    backoff_base: float = 1.0,
 ) -> dict[str, dict[str, str]]:
     if llm is None:
         from langchain_naver import ChatClovaX
 
         llm = ChatClovaX(model=model)
 
+    prompts = [_build_chunk_prompt(chunk, max_chars_per_chunk) for chunk in chunks]
+    contents = invoke_all(
+        llm,
+        prompts,
+        max_concurrency=max_concurrency,
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff_base=backoff_base,
+    )
+
+    # 재시도 후에도 실패한 조문은 결과에서 빠진다 (호출자가 다음 실행에서 다시 추출)
     chunk_maps: dict[str, dict[str, str]] = {}
-    for chunk in chunks:
-        text = chunk.content[:max_chars_per_chunk]
-        prompt = (
-            "다음 단일 조문에서 정의된 축약어만 JSON으로 추출하라.\n"
-            "반드시 축약어 키와 확장명 값만 포함하고, 모르면 빈 JSON을 반환하라.\n"
-            "규칙:\n"
-            "1) 축약어 패턴은 보통 '(이하 \"X\"이라 한다)'\n"
-            "2) 값은 가능한 완전한 명칭으로 작성\n"
-            "3) 출력은 JSON 객체만\n"
-            "예시: {\"위원회\": \"건축법 제4조에 따른 건축위원회\"}\n\n"
-            f"법령명: {chunk.law_name}\n"
-            f"조문: 제{chunk.article_num}조\n"
-            f"제목: {chunk.article_title}\n"
-            f"본문:\n{text}"
-        )
-        response = llm.invoke(prompt)
-        content = getattr(response, "content", str(response))
+    for chunk, content in zip(chunks, contents):
+        if content is None:
+            continue
         parsed = _parse_abbr_json(content)
         chunk_maps[chunk_key(chunk)] = sanitize_abbreviation_map(chunk.law_name, parsed)
 
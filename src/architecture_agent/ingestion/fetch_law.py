@@ -1,19 +1,44 @@
 from __future__ import annotations
 
+import csv
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 LAW_SERVICE_URL = "http://www.law.go.kr/DRF/lawService.do"
 DEFAULT_LAW_IDS = ("1823", "2118")
+VERSION_FIELDS = ("시행일자", "공포번호")
 
 
-def fetch_law_json(law_id: str, oc: str | None = None) -> dict:
+def build_session(pool_size: int = 8, max_retries: int = 3) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_law_json(
+    law_id: str,
+    oc: str | None = None,
+    session: requests.Session | None = None,
+    base_url: str = LAW_SERVICE_URL,
+) -> dict:
     oc_value = oc or os.getenv("OC", "")
     if not oc_value:
         raise ValueError("Missing OC. Set OC in environment or pass explicitly.")
@@ -24,28 +49,101 @@ def fetch_law_json(law_id: str, oc: str | None = None) -> dict:
         "ID": law_id,
         "type": "JSON",
     }
-    response = requests.get(LAW_SERVICE_URL, params=params, timeout=30)
+    response = (session or requests).get(base_url, params=params, timeout=30)
     response.raise_for_status()
     return response.json()
 
 
+def _normalize_version_value(value) -> str:
+    return re.sub(r"\D", "", str(value or ""))
+
+
+def load_law_list_meta(csv_path: str, skiprows: int = 1) -> dict[str, dict[str, str]]:
+    # 법령검색목록 CSV(첫 줄은 제목행) -> {법령ID: {"시행일자": ..., "공포번호": ...}}
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        for _ in range(skiprows):
+            next(f, None)
+        rows = list(csv.DictReader(f))
+
+    meta: dict[str, dict[str, str]] = {}
+    for row in rows:
+        law_id = str(row.get("법령ID", "") or "").strip()
+        if not law_id:
+            continue
+        meta[law_id.lstrip("0") or law_id] = {k: str(row.get(k, "") or "").strip() for k in VERSION_FIELDS}
+    return meta
+
+
+def _find_saved_file(out_dir: Path, law_id: str) -> Path | None:
+    matches = sorted(out_dir.glob(f"{law_id}_*.json"))
+    return matches[0] if matches else None
+
+
+def _is_saved_current(path: Path, expected: dict[str, str]) -> bool:
+    try:
+        info = json.loads(path.read_text(encoding="utf-8"))["법령"]["기본정보"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    for field_name in VERSION_FIELDS:
+        want = _normalize_version_value(expected.get(field_name))
+        if not want or _normalize_version_value(info.get(field_name)) != want:
+            return False
+    return True
+
+
+def _fetch_and_save_one(
+    law_id: str,
+    out_dir: Path,
+    oc: str | None,
+    session: requests.Session,
+    base_url: str,
+    expected: dict[str, str] | None,
+) -> Path:
+    saved = _find_saved_file(out_dir, law_id)
+    if saved is not None and expected and _is_saved_current(saved, expected):
+        return saved
+
+    payload = fetch_law_json(law_id=law_id, oc=oc, session=session, base_url=base_url)
+    law_name = payload["법령"]["기본정보"].get("법령명_한글", law_id)
+    file_name = f"{law_id}_{law_name}.json"
+    target = out_dir / file_name
+    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return target
+
+
 def fetch_and_save_laws(
     law_ids: tuple[str, ...] = DEFAULT_LAW_IDS,
     output_dir: str = "data/processed/raw",
     oc: str | None = None,
+    max_workers: int = 4,
+    law_meta: dict[str, dict[str, str]] | None = None,
+    session: requests.Session | None = None,
+    base_url: str = LAW_SERVICE_URL,
 ) -> list[Path]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    saved_files: list[Path] = []
-    for law_id in law_ids:
-        payload = fetch_law_json(law_id=law_id, oc=oc)
-        law_name = payload["법령"]["기본정보"].get("법령명_한글", law_id)
-        file_name = f"{law_id}_{law_name}.json"
-        target = out_dir / file_name
-        target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        saved_files.append(target)
-    return saved_files
+    law_meta = law_meta or {}
+    own_session = session is None
+    session = session or build_session(pool_size=max(1, max_workers))
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [
+                pool.submit(
+                    _fetch_and_save_one,
+                    law_id,
+                    out_dir,
+                    oc,
+                    session,
+                    base_url,
+                    law_meta.get(str(law_id).lstrip("0") or str(law_id)),
+                )
+                for law_id in law_ids
+            ]
+            return [f.result() for f in futures]
+    finally:
+        if own_session:
+            session.close()
 
 
 if __name__ == "__main__":
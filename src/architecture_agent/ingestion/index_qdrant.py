@@ -1,10 +1,39 @@
 from __future__ import annotations
 
 import os
+import warnings
 from typing import Iterable
 
+from architecture_agent.ingestion.change_detect import (
+    IndexDiff,
+    classify_chunk,
+    compute_content_hash,
+    compute_source_hash,
+    point_id_for_key,
+    stale_point_ids,
+)
+from architecture_agent.ingestion.embedding_cache import (
+    DEFAULT_EMBEDDING_CACHE_DIR,
+    CachedEmbeddings,
+    EmbeddingStore,
+)
+from architecture_agent.ingestion.resolve_abbr import chunk_key
+from architecture_agent.ingestion.stream import batched
 from architecture_agent.schemas import ArticleChunk
 
+STATE_PAYLOAD_FIELDS = ["source_key", "source_hash", "content_hash", "law_id"]
+# langchain QdrantVectorStore는 payload를 {"page_content", "metadata": {...}} 형태로 저장한다
+PAYLOAD_INDEX_FIELDS = [
+    "metadata.law_id",
+    "metadata.article_num",
+    "metadata.article_sub",
+    "metadata.law_type",
+    "metadata.law_name",
+    "metadata.source_key",
+    "metadata.parent_law_refs[].law_name",
+    "metadata.parent_law_refs[].article",
+]
+
 
 def _import_qdrant_stack():
     from langchain_core.documents import Document
@@ -16,45 +45,212 @@ def _import_qdrant_stack():
     return Document, ClovaXEmbeddings, QdrantVectorStore, QdrantClient, Distance, VectorParams
 
 
-def index_chunks_to_qdrant(
-    chunks: Iterable[ArticleChunk],
-    collection_name: str = "building_law",
+def open_qdrant_client(
     qdrant_path: str = "./qdrant_data",
     qdrant_url: str | None = None,
     qdrant_api_key: str | None = None,
     prefer_grpc: bool = False,
 ):
-    Document, ClovaXEmbeddings, QdrantVectorStore, QdrantClient, Distance, VectorParams = _import_qdrant_stack()
+    from qdrant_client import QdrantClient
 
     url = qdrant_url or os.getenv("QDRANT_URL")
     api_key = qdrant_api_key or os.getenv("QDRANT_API_KEY")
     if url:
-        client = QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
-    else:
-        client = QdrantClient(path=qdrant_path)
+        return QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+    return QdrantClient(path=qdrant_path)
+
+
+def _ensure_collection(client, collection_name: str) -> None:
+    from qdrant_client.http.models import Distance, VectorParams
+
     if not client.collection_exists(collection_name):
         client.create_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(size=1024, distance=Distance.COSINE),
         )
+    ensure_payload_indexes(client, collection_name)
+
+
+def ensure_payload_indexes(client, collection_name: str = "building_law") -> None:
+    from qdrant_client.http.models import PayloadSchemaType
+
+    # 서버 모드에서는 필터 조회를 인덱스로 처리; 이미 있으면 no-op (로컬 모드는 무시됨)
+    existing = set((client.get_collection(collection_name).payload_schema or {}).keys())
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Payload indexes have no effect in the local Qdrant")
+        for field_name in PAYLOAD_INDEX_FIELDS:
+            if field_name in existing:
+                continue
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
+
+def fetch_indexed_state(client, collection_name: str = "building_law") -> dict[str, dict]:
+    if not client.collection_exists(collection_name):
+        return {}
+
+    state: dict[str, dict] = {}
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            offset=offset,
+            limit=1000,
+            with_payload=[f"metadata.{f}" for f in STATE_PAYLOAD_FIELDS],
+            with_vectors=False,
+        )
+        for point in points:
+            meta = (point.payload or {}).get("metadata", {}) or {}
+            key = meta.get("source_key")
+            if not key:
+                continue
+            state[str(key)] = {
+                "point_id": str(point.id),
+                "source_hash": meta.get("source_hash"),
+                "content_hash": meta.get("content_hash"),
+                "law_id": str(meta.get("law_id", "")),
+            }
+        if offset is None:
+            break
+    return state
+
+
+def _build_document(Document, chunk: ArticleChunk):
+    payload = chunk.to_payload()
+    payload["source_key"] = chunk_key(chunk)
+    payload["source_hash"] = compute_source_hash(chunk)
+    payload["content_hash"] = compute_content_hash(chunk)
+    return Document(page_content=chunk.content_resolved or chunk.content, metadata=payload)
 
-    embeddings = ClovaXEmbeddings(model="bge-m3")
-    vector_store = QdrantVectorStore(
+
+def _open_vector_store(
+    client,
+    collection_name: str,
+    embedding_cache_dir: str | None = DEFAULT_EMBEDDING_CACHE_DIR,
+    embedding_batch_size: int = 32,
+    embedding_parallel_batches: int = 2,
+    embeddings=None,
+):
+    _, ClovaXEmbeddings, QdrantVectorStore, _, _, _ = _import_qdrant_stack()
+
+    _ensure_collection(client, collection_name)
+    if embeddings is None:
+        embeddings = ClovaXEmbeddings(model="bge-m3")
+    if embedding_cache_dir:
+        embeddings = CachedEmbeddings(
+            embeddings,
+            store=EmbeddingStore(cache_dir=embedding_cache_dir, model="bge-m3"),
+            batch_size=embedding_batch_size,
+            max_parallel_batches=embedding_parallel_batches,
+        )
+    return QdrantVectorStore(
         client=client,
         collection_name=collection_name,
         embedding=embeddings,
     )
 
+
+def _upsert_chunks(vector_store, chunks: Iterable[ArticleChunk], upsert_batch_size: int = 64) -> int:
+    Document = _import_qdrant_stack()[0]
+
     documents = []
     ids = []
     for chunk in chunks:
-        documents.append(
-            Document(
-                page_content=chunk.content_resolved or chunk.content,
-                metadata=chunk.to_payload(),
-            )
-        )
-        ids.append(f"{chunk.law_id}:{chunk.article_num}")
+        documents.append(_build_document(Document, chunk))
+        ids.append(point_id_for_key(chunk_key(chunk)))
+
+    if not documents:
+        return 0
+    embeddings = vector_store.embeddings
+    if isinstance(embeddings, CachedEmbeddings):
+        # 캐시에 없는 텍스트만 병렬 batch로 먼저 임베딩; 이후 add_documents는 캐시 hit만 발생
+        embeddings.embed_documents([d.page_content for d in documents])
+    vector_store.add_documents(documents=documents, ids=ids, batch_size=upsert_batch_size)
+    return len(documents)
 
-    vector_store.add_documents(documents=documents, ids=ids)
+
+def index_chunks_to_qdrant(
+    chunks: Iterable[ArticleChunk],
+    collection_name: str = "building_law",
+    qdrant_path: str = "./qdrant_data",
+    qdrant_url: str | None = None,
+    qdrant_api_key: str | None = None,
+    prefer_grpc: bool = False,
+    client=None,
+    embedding_cache_dir: str | None = DEFAULT_EMBEDDING_CACHE_DIR,
+    embedding_batch_size: int = 32,
+    embedding_parallel_batches: int = 2,
+    upsert_batch_size: int = 64,
+    embeddings=None,
+):
+    if client is None:
+        client = open_qdrant_client(qdrant_path, qdrant_url, qdrant_api_key, prefer_grpc)
+    vector_store = _open_vector_store(
+        client,
+        collection_name,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_batch_size=embedding_batch_size,
+        embedding_parallel_batches=embedding_parallel_batches,
+        embeddings=embeddings,
+    )
+    for batch in batched(chunks, upsert_batch_size):
+        _upsert_chunks(vector_store, batch, upsert_batch_size=upsert_batch_size)
     return vector_store
+
+
+def sync_chunks_to_qdrant(
+    chunks: Iterable[ArticleChunk],
+    collection_name: str = "building_law",
+    qdrant_path: str = "./qdrant_data",
+    qdrant_url: str | None = None,
+    qdrant_api_key: str | None = None,
+    prefer_grpc: bool = False,
+    client=None,
+    indexed_state: dict[str, dict] | None = None,
+    embedding_cache_dir: str | None = DEFAULT_EMBEDDING_CACHE_DIR,
+    embedding_batch_size: int = 32,
+    embedding_parallel_batches: int = 2,
+    upsert_batch_size: int = 64,
+    embeddings=None,
+) -> tuple[object, IndexDiff]:
+    from qdrant_client.http.models import PointIdsList
+
+    if client is None:
+        client = open_qdrant_client(qdrant_path, qdrant_url, qdrant_api_key, prefer_grpc)
+    if indexed_state is None:
+        indexed_state = fetch_indexed_state(client, collection_name)
+
+    vector_store = _open_vector_store(
+        client,
+        collection_name,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_batch_size=embedding_batch_size,
+        embedding_parallel_batches=embedding_parallel_batches,
+        embeddings=embeddings,
+    )
+
+    # chunk stream을 batch 단위로 비교/upsert해 전체 코퍼스를 메모리에 올리지 않는다
+    diff = IndexDiff()
+    seen: set[str] = set()
+    law_ids: set[str] = set()
+    pending: list[ArticleChunk] = []
+    for chunk in chunks:
+        seen.add(chunk_key(chunk))
+        law_ids.add(str(chunk.law_id))
+        if classify_chunk(chunk, indexed_state, diff):
+            pending.append(chunk)
+        if len(pending) >= upsert_batch_size:
+            _upsert_chunks(vector_store, pending, upsert_batch_size=upsert_batch_size)
+            pending = []
+    _upsert_chunks(vector_store, pending, upsert_batch_size=upsert_batch_size)
+
+    diff.to_delete = stale_point_ids(indexed_state, seen, law_ids)
+    if diff.to_delete:
+        client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=diff.to_delete),
+        )
+    return vector_store, diff
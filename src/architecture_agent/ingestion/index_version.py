@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from pathlib import Path
+
+DEFAULT_INDEX_VERSION_PATH = "data/processed/index_version.json"
+
+
+def read_index_version(path: str = DEFAULT_INDEX_VERSION_PATH) -> str:
+    p = Path(path)
+    if not p.exists():
+        return ""
+    try:
+        return str(json.loads(p.read_text(encoding="utf-8")).get("version", ""))
+    except (OSError, ValueError, AttributeError):
+        return ""
+
+
+def write_index_version(
+    collection_name: str,
+    index_diff: dict[str, int] | None = None,
+    output_path: str = DEFAULT_INDEX_VERSION_PATH,
+) -> str:
+    # 증분 적재에서 upsert/삭제가 없으면 기존 버전을 유지해 서빙 캐시를 불필요하게 비우지 않는다
+    previous = read_index_version(output_path)
+    if previous and index_diff is not None and not any(index_diff.get(k) for k in ("created", "updated", "deleted")):
+        return previous
+
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {"version": version, "collection": collection_name, "index_diff": index_diff or {}},
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    return version
+
+
+class IndexVersionWatcher:
+    # 요청마다 JSON을 읽지 않도록 파일 mtime이 바뀐 경우에만 다시 읽는다
+    def __init__(self, path: str = DEFAULT_INDEX_VERSION_PATH):
+        self.path = Path(path)
+        self._mtime: int | None = None
+        self._version = ""
+
+    def current(self) -> str:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._mtime, self._version = None, ""
+            return ""
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self._version = read_index_version(str(self.path))
+        return self._version
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_LLM_CACHE_PATH = "data/processed/llm_cache.sqlite"
+
+
+@dataclass
+class CachedResponse:
+    content: str
+
+
+def prompt_cache_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class CachedLLM:
+    def __init__(
+        self,
+        llm,
+        model_name: str,
+        cache_path: str = DEFAULT_LLM_CACHE_PATH,
+        max_entries: int = 50000,
+    ):
+        self.llm = llm
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        path = Path(cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_cache(last_used_at)")
+        self._conn.commit()
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def _put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, self.model_name, response, now, now),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def invoke(self, prompt: str) -> CachedResponse:
+        key = prompt_cache_key(self.model_name, prompt)
+        cached = self._get(key)
+        if cached is not None:
+            return CachedResponse(content=cached)
+        response = self.llm.invoke(prompt)
+        content = getattr(response, "content", str(response))
+        self._put(key, content)
+        return CachedResponse(content=content)
+
+    async def ainvoke(self, prompt: str) -> CachedResponse:
+        key = prompt_cache_key(self.model_name, prompt)
+        # sqlite 조회/기록(commit, lock 대기 포함)은 event loop 밖에서
+        cached = await asyncio.to_thread(self._get, key)
+        if cached is not None:
+            return CachedResponse(content=cached)
+        if hasattr(self.llm, "ainvoke"):
+            response = await self.llm.ainvoke(prompt)
+        else:
+            response = await asyncio.to_thread(self.llm.invoke, prompt)
+        content = getattr(response, "content", str(response))
+        await asyncio.to_thread(self._put, key, content)
+        return CachedResponse(content=content)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_calls": self.hits,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _response_text(response: Any) -> str:
+    return getattr(response, "content", str(response))
+
+
+def _backoff_seconds(attempt: int, backoff_base: float, backoff_max: float) -> float:
+    wait = min(backoff_base * (2**attempt), backoff_max)
+    return wait + random.uniform(0, wait / 2) if wait > 0 else 0.0
+
+
+def _invoke_with_timeout(llm, prompt: str, timeout: float | None) -> Any:
+    if timeout is None:
+        return llm.invoke(prompt)
+    # 동기 호출은 중단할 수 없으므로 별도 스레드에서 돌리고 timeout이 지나면 결과를 버린다
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        return pool.submit(llm.invoke, prompt).result(timeout=timeout)
+    except FutureTimeoutError:
+        raise TimeoutError(f"LLM call timed out after {timeout}s") from None
+    finally:
+        pool.shutdown(wait=False)
+
+
+def invoke_with_retry(
+    llm,
+    prompt: str,
+    max_retries: int = 2,
+    backoff_base: float = 1.0,
+    backoff_max: float = 30.0,
+    timeout: float | None = None,
+) -> str:
+    for attempt in range(max_retries + 1):
+        try:
+            return _response_text(_invoke_with_timeout(llm, prompt, timeout))
+        except Exception:
+            if attempt >= max_retries:
+                raise
+            time.sleep(_backoff_seconds(attempt, backoff_base, backoff_max))
+    raise RuntimeError("unreachable")
+
+
+async def _ainvoke_with_retry(
+    llm,
+    prompt: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float | None,
+    max_retries: int,
+    backoff_base: float,
+    backoff_max: float,
+) -> str:
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                if hasattr(llm, "ainvoke"):
+                    call = llm.ainvoke(prompt)
+                else:
+                    call = asyncio.to_thread(llm.invoke, prompt)
+                response = await asyncio.wait_for(call, timeout=timeout)
+            return _response_text(response)
+        except Exception:
+            if attempt >= max_retries:
+                raise
+            await asyncio.sleep(_backoff_seconds(attempt, backoff_base, backoff_max))
+    raise RuntimeError("unreachable")
+
+
+async def ainvoke_all(
+    llm,
+    prompts: list[str],
+    max_concurrency: int = 4,
+    timeout: float | None = 60.0,
+    max_retries: int = 2,
+    backoff_base: float = 1.0,
+    backoff_max: float = 30.0,
+) -> list[str | None]:
+    """Run every prompt with bounded concurrency; a prompt that still fails after retries yields None."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    tasks = [
+        _ainvoke_with_retry(llm, p, semaphore, timeout, max_retries, backoff_base, backoff_max)
+        for p in prompts
+    ]
+    # gather는 입력 순서대로 결과를 돌려주므로 완료 순서와 무관하게 결과 순서가 고정된다.
+    # 한 조문 실패가 나머지 결과를 버리지 않도록 예외도 결과로 받는다
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return [_failed_to_none(i, r) for i, r in enumerate(results)]
+
+
+def _failed_to_none(index: int, result: Any) -> str | None:
+    if isinstance(result, BaseException):
+        if not isinstance(result, Exception):
+            raise result
+        logger.warning("LLM call for prompt #%d failed after retries: %r", index, result)
+        return None
+    return result
+
+
+def invoke_all(
+    llm,
+    prompts: list[str],
+    max_concurrency: int = 4,
+    timeout: float | None = 60.0,
+    max_retries: int = 2,
+    backoff_base: float = 1.0,
+    backoff_max: float = 30.0,
+) -> list[str | None]:
+    if max_concurrency <= 1:
+        results: list[str | None] = []
+        for i, p in enumerate(prompts):
+            try:
+                results.append(invoke_with_retry(llm, p, max_retries, backoff_base, backoff_max, timeout))
+            except Exception as exc:
+                results.append(_failed_to_none(i, exc))
+        return results
+
+    coro_args = (llm, prompts, max_concurrency, timeout, max_retries, backoff_base, backoff_max)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(ainvoke_all(*coro_args))
+
+    # notebook 등 이미 event loop가 돌고 있으면 별도 스레드에서 실행
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(ainvoke_all(*coro_args))).result()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import re
+from typing import Iterator
+
 from architecture_agent.schemas import ArticleChunk
 
 
@@ -35,6 +38,34 @@ def normalize_paragraph_num(raw: str) -> str:
     return circled_map.get(raw, raw)
 
 
+ARTICLE_HEADER_PATTERN = re.compile(r"\s*제\s*(\d+)\s*조(?:\s*의\s*(\d+))?")
+
+
+def parse_article_numbers(article: dict, header: str) -> tuple[str, str]:
+    main = str(article.get("조문번호", "") or "").strip()
+    sub = str(article.get("조문가지번호", "") or "").strip()
+
+    # API 필드가 비어있는 경우 헤더(예: 제4조의2)에서 보정
+    if not main or not sub:
+        m = ARTICLE_HEADER_PATTERN.match(header or "")
+        if m:
+            main = main or m.group(1)
+            sub = sub or (m.group(2) or "")
+    return main, "" if sub == "0" else sub
+
+
+def article_label(article_num: str, article_sub: str = "") -> str:
+    # 참조 표기(제4조의2 -> "4의2")와 같은 조문 식별자; 가지번호가 없으면 조문번호 그대로
+    num = str(article_num or "").strip()
+    sub = str(article_sub or "").strip()
+    return f"{num}의{sub}" if sub and sub != "0" else num
+
+
+def split_article_label(label: str) -> tuple[str, str]:
+    num, _, sub = str(label or "").strip().partition("의")
+    return num, sub
+
+
 def classify_law_type(law_name: str) -> str:
     if "시행규칙" in law_name:
         return "시행규칙"
@@ -47,9 +78,9 @@ def parse_article(article: dict, law_name: str, law_id: str) -> ArticleChunk | N
     if article.get("조문여부") != "조문":
         return None
 
-    article_num = str(article.get("조문번호", "")).strip()
     article_title = str(article.get("조문제목", "")).strip()
     article_header = str(article.get("조문내용", "")).strip()
+    article_num, article_sub = parse_article_numbers(article, article_header)
 
     paragraphs_structured: list[dict] = []
     content_parts: list[str] = [article_header] if article_header else []
@@ -88,6 +119,7 @@ def parse_article(article: dict, law_name: str, law_id: str) -> ArticleChunk | N
         law_id=str(law_id),
         law_type=classify_law_type(law_name),
         article_num=article_num,
+        article_sub=article_sub,
         article_title=article_title,
         content="\n".join([p for p in content_parts if p]),
         paragraphs=paragraphs_structured,
@@ -96,15 +128,17 @@ def parse_article(article: dict, law_name: str, law_id: str) -> ArticleChunk | N
     )
 
 
-def parse_law_data(data: dict) -> list[ArticleChunk]:
+def iter_law_chunks(data: dict) -> Iterator[ArticleChunk]:
     law_info = data["법령"]["기본정보"]
     law_name = law_info["법령명_한글"]
     law_id = str(law_info["법령ID"])
     articles_raw = normalize_to_list(data["법령"]["조문"].get("조문단위"))
 
-    chunks: list[ArticleChunk] = []
     for article in articles_raw:
         chunk = parse_article(article, law_name=law_name, law_id=law_id)
         if chunk:
-            chunks.append(chunk)
-    return chunks
+            yield chunk
+
+
+def parse_law_data(data: dict) -> list[ArticleChunk]:
+    return list(iter_law_chunks(data))
@@ -4,74 +4,162 @@ import json
 from pathlib import Path
 
 from architecture_agent.ingestion.build_appendix1_json import build_appendix1_json
-from architecture_agent.ingestion.extract_refs import extract_references
-from architecture_agent.ingestion.fetch_law import DEFAULT_LAW_IDS, fetch_and_save_laws
-from architecture_agent.ingestion.index_qdrant import index_chunks_to_qdrant
-from architecture_agent.ingestion.parse_law import parse_law_data
+from architecture_agent.ingestion.embedding_cache import DEFAULT_EMBEDDING_CACHE_DIR
+from architecture_agent.ingestion.fetch_law import (
+    DEFAULT_LAW_IDS,
+    fetch_and_save_laws,
+    load_law_list_meta,
+)
+from architecture_agent.ingestion.index_qdrant import (
+    fetch_indexed_state,
+    index_chunks_to_qdrant,
+    open_qdrant_client,
+    sync_chunks_to_qdrant,
+)
+from architecture_agent.ingestion.index_version import DEFAULT_INDEX_VERSION_PATH, write_index_version
+from architecture_agent.ingestion.llm_cache import DEFAULT_LLM_CACHE_PATH, CachedLLM
 from architecture_agent.ingestion.resolve_abbr import (
-    extract_abbreviations_by_law,
-    resolve_abbreviations,
-    resolve_abbreviations_by_chunk,
     save_abbreviation_maps_by_chunk,
     save_abbreviation_maps_by_law,
 )
+from architecture_agent.ingestion.reverse_refs import (
+    DEFAULT_REVERSE_REFS_PATH,
+    load_reverse_ref_index,
+    merge_reverse_ref_index,
+    save_reverse_ref_index,
+)
+from architecture_agent.ingestion.serving_snapshot import export_serving_snapshot
+from architecture_agent.ingestion.stream import (
+    LawAbbreviationStage,
+    LlmChunkAbbreviationStage,
+    ReverseRefStage,
+    iter_parsed_chunks,
+    iter_raw_payloads,
+    iter_with_references,
+)
+
+
+def _load_previous_chunk_maps(abbr_chunk_maps_path: str) -> dict[str, dict[str, str]]:
+    path = Path(abbr_chunk_maps_path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
 
 
 def run_ingestion(
     law_ids: tuple[str, ...] = DEFAULT_LAW_IDS,
     raw_dir: str = "data/processed/raw",
+    law_list_csv: str | None = None,
+    fetch_max_workers: int = 4,
     abbr_mode: str = "llm_chunk",
     abbr_maps_path: str = "data/processed/abbr_maps_by_law.json",
     abbr_chunk_maps_path: str = "data/processed/abbr_maps_by_chunk.json",
+    reverse_refs_path: str = DEFAULT_REVERSE_REFS_PATH,
+    index_version_path: str = DEFAULT_INDEX_VERSION_PATH,
     llm_model_for_abbr: str = "HCX-005",
+    abbr_llm_concurrency: int = 4,
+    abbr_llm_window: int = 32,
+    llm_cache_path: str | None = DEFAULT_LLM_CACHE_PATH,
     collection_name: str = "building_law",
     qdrant_path: str = "./qdrant_data",
     qdrant_url: str | None = None,
     qdrant_api_key: str | None = None,
     qdrant_prefer_grpc: bool = False,
+    incremental: bool = True,
+    embedding_cache_dir: str | None = DEFAULT_EMBEDDING_CACHE_DIR,
+    embedding_batch_size: int = 32,
+    embedding_parallel_batches: int = 2,
+    upsert_batch_size: int = 64,
+    serving_snapshot_dir: str | None = None,
 ) -> dict:
-    raw_files = fetch_and_save_laws(law_ids=law_ids, output_dir=raw_dir)
+    raw_files = fetch_and_save_laws(
+        law_ids=law_ids,
+        output_dir=raw_dir,
+        max_workers=fetch_max_workers,
+        law_meta=load_law_list_meta(law_list_csv) if law_list_csv else None,
+    )
+    client = open_qdrant_client(
+        qdrant_path=qdrant_path,
+        qdrant_url=qdrant_url,
+        qdrant_api_key=qdrant_api_key,
+        prefer_grpc=qdrant_prefer_grpc,
+    )
+    indexed_state = fetch_indexed_state(client, collection_name) if incremental else {}
 
-    all_chunks = []
-    for f in raw_files:
-        payload = json.loads(Path(f).read_text(encoding="utf-8"))
-        all_chunks.extend(parse_law_data(payload))
+    # LLM을 쓰는 축약어 모드는 추출기와 무관하게 같은 응답 캐시를 거친다
+    llm = None
+    if abbr_mode in ("llm_chunk", "llm_law"):
+        from langchain_naver import ChatClovaX
 
-    extract_references(all_chunks)
-    abbr_chunk_path = None
+        llm = ChatClovaX(model=llm_model_for_abbr)
+        if llm_cache_path:
+            llm = CachedLLM(llm, model_name=llm_model_for_abbr, cache_path=llm_cache_path)
 
     if abbr_mode == "llm_chunk":
-        from architecture_agent.ingestion.extract_abbr_chunk_llm import (
-            aggregate_chunk_abbr_maps_by_law,
-            extract_abbreviations_by_chunk_llm,
+        abbr_stage = LlmChunkAbbreviationStage(
+            llm,
+            window_size=abbr_llm_window,
+            max_concurrency=abbr_llm_concurrency,
+            indexed_state=indexed_state,
+            previous_chunk_maps=_load_previous_chunk_maps(abbr_chunk_maps_path) if incremental else None,
         )
+    else:
+        abbr_stage = LawAbbreviationStage(llm=llm)
 
-        chunk_maps = extract_abbreviations_by_chunk_llm(
-            all_chunks,
-            model=llm_model_for_abbr,
-        )
-        resolve_abbreviations_by_chunk(all_chunks, chunk_maps)
-        law_abbr_maps = aggregate_chunk_abbr_maps_by_law(all_chunks, chunk_maps)
+    # parse → refs → abbr → embed → upsert 를 법령/배치 단위로 흘려보낸다
+    ref_stage = ReverseRefStage()
+    chunks = abbr_stage(ref_stage(iter_with_references(iter_parsed_chunks(iter_raw_payloads(raw_files)))))
+
+    index_kwargs = dict(
+        collection_name=collection_name,
+        client=client,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_batch_size=embedding_batch_size,
+        embedding_parallel_batches=embedding_parallel_batches,
+        upsert_batch_size=upsert_batch_size,
+    )
+    index_summary: dict[str, int] = {}
+    if incremental:
+        store, diff = sync_chunks_to_qdrant(chunks=chunks, indexed_state=indexed_state, **index_kwargs)
+        index_summary = diff.summary()
+    else:
+        store = index_chunks_to_qdrant(chunks=chunks, **index_kwargs)
+
+    law_abbr_maps = abbr_stage.law_maps
+    abbr_chunk_path = None
+    llm_cache_stats: dict = {}
+    if isinstance(abbr_stage, LlmChunkAbbreviationStage):
         abbr_chunk_path = save_abbreviation_maps_by_chunk(
-            chunk_maps,
+            abbr_stage.chunk_maps,
             output_path=abbr_chunk_maps_path,
         )
-    else:
-        law_abbr_maps = extract_abbreviations_by_law(all_chunks)
-        resolve_abbreviations(all_chunks, law_abbr_maps)
+    if isinstance(llm, CachedLLM):
+        llm_cache_stats = llm.stats()
+        llm.close()
 
     abbr_path = save_abbreviation_maps_by_law(law_abbr_maps, output_path=abbr_maps_path)
-
-    store = index_chunks_to_qdrant(
-        chunks=all_chunks,
-        collection_name=collection_name,
-        qdrant_path=qdrant_path,
-        qdrant_url=qdrant_url,
-        qdrant_api_key=qdrant_api_key,
-        prefer_grpc=qdrant_prefer_grpc,
+    reverse_refs = merge_reverse_ref_index(
+        load_reverse_ref_index(reverse_refs_path),
+        ref_stage.index,
+        ref_stage.law_ids,
     )
-
+    reverse_refs_file = save_reverse_ref_index(reverse_refs, output_path=reverse_refs_path)
     appendix_path = build_appendix1_json()
+    # 서빙 측 answer cache는 이 버전이 바뀌면 자동으로 무효화된다
+    index_version = write_index_version(
+        collection_name,
+        index_diff=index_summary if incremental else None,
+        output_path=index_version_path,
+    )
+    snapshot_version = ""
+    if serving_snapshot_dir:
+        # 다중 worker 서빙(SERVING_SNAPSHOT_PATH)용 읽기 전용 snapshot; 서빙 중인 worker는 다음 조회에서 새 snapshot을 연다
+        snapshot_version = export_serving_snapshot(
+            client,
+            collection_name=collection_name,
+            output_dir=serving_snapshot_dir,
+            index_version_path=index_version_path,
+        )["version"]
 
     return {
         "raw_files": [str(p) for p in raw_files],
@@ -79,10 +167,17 @@ def run_ingestion(
         "abbr_maps_json": str(abbr_path),
         "abbr_chunk_maps_json": str(abbr_chunk_path) if abbr_chunk_path else "",
         "appendix_json": str(appendix_path),
-        "chunks": len(all_chunks),
+        "reverse_refs_json": str(reverse_refs_file),
+        "chunks": abbr_stage.processed,
+        "abbr_chunks_reused": getattr(abbr_stage, "reused", 0),
+        "abbr_chunks_failed": getattr(abbr_stage, "failed", 0),
+        "llm_cache": llm_cache_stats,
         "abbreviations_total": sum(len(v) for v in law_abbr_maps.values()),
         "abbreviations_by_law": {k: len(v) for k, v in law_abbr_maps.items()},
         "collection": collection_name,
+        "index_diff": index_summary,
+        "index_version": index_version,
+        "serving_snapshot_version": snapshot_version,
         "vector_store": str(type(store)),
     }
 
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 
+from architecture_agent.ingestion.parse_law import article_label
 from architecture_agent.schemas import ArticleChunk
 
 ABBREVIATION_PATTERNS = [
@@ -12,6 +14,10 @@ ABBREVIATION_PATTERNS = [
     re.compile(r"([^,\n]{2,}?)을?\s*이하\s*[\"“]([^\"”]+)[\"”]"),
 ]
 
+# 2자 이하 축약어는 단어 경계(앞: 문자/숫자 아님, 뒤: 공백·조사·'제'·끝)에서만 치환
+SHORT_ABBR_PREFIX = r"(?<![가-힣A-Za-z0-9])"
+SHORT_ABBR_SUFFIX = r"(?=\s|제|의|에|을|를|이|가|은|는|과|와|으로|$)"
+
 ARTICLE_REF_PATTERN = re.compile(
     r"(제\d+(?:의\d+)?조(?:제\d+항)?(?:제\d+호)?)(?:에\s*따른|에\s*따라|의)?\s*(.+)"
 )
@@ -99,7 +105,8 @@ def save_abbreviation_maps_by_law(
 
 
 def chunk_key(chunk: ArticleChunk) -> str:
-    return f"{chunk.law_id}:{chunk.article_num}"
+    # 제4조의2는 "law_id:4의2"로 제4조와 다른 key(=point id)를 갖는다
+    return f"{chunk.law_id}:{article_label(chunk.article_num, chunk.article_sub)}"
 
 
 def save_abbreviation_maps_by_chunk(
@@ -112,22 +119,62 @@ def save_abbreviation_maps_by_chunk(
     return path
 
 
+def _trie_regex(words: list[str]) -> str:
+    # 공통 접두어를 묶은 정규식; 분기마다 greedy 선택이라 같은 위치에서는 가장 긴 키가 매칭된다
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def render(node: dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            return f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+
+@lru_cache(maxsize=256)
+def _compile_abbreviation_pattern(shorts: frozenset[str]) -> re.Pattern | None:
+    long_keys = [s for s in shorts if len(s) > 2]
+    short_keys = [s for s in shorts if 0 < len(s) <= 2]
+    parts = []
+    # 3자 이상 키가 항상 2자 이하 키보다 길기 때문에 먼저 시도하면 최장 일치가 유지된다
+    if long_keys:
+        parts.append(_trie_regex(long_keys))
+    if short_keys:
+        parts.append(f"{SHORT_ABBR_PREFIX}(?:{_trie_regex(short_keys)}){SHORT_ABBR_SUFFIX}")
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in parts))
+
+
+def apply_abbreviation_map(text: str, abbr_map: dict[str, str]) -> str:
+    # 한 번의 스캔으로 치환하므로 이미 확장된 텍스트 안에서 다시 치환되지 않는다
+    pattern = _compile_abbreviation_pattern(frozenset(abbr_map)) if abbr_map else None
+    if pattern is None:
+        return text
+    return pattern.sub(lambda m: abbr_map[m.group(0)], text)
+
+
+def resolve_chunk_abbreviations(chunk: ArticleChunk, abbr_map: dict[str, str]) -> None:
+    chunk.abbreviations = sanitize_abbreviation_map(chunk.law_name, abbr_map)
+    chunk.content_resolved = apply_abbreviation_map(chunk.content, chunk.abbreviations)
+
+
 def resolve_abbreviations_by_chunk(
     chunks: list[ArticleChunk],
     chunk_abbr_maps: dict[str, dict[str, str]],
 ) -> None:
     for chunk in chunks:
-        abbr_map = chunk_abbr_maps.get(chunk_key(chunk), {})
-        chunk.abbreviations = sanitize_abbreviation_map(chunk.law_name, abbr_map)
-        pairs = sorted(chunk.abbreviations.items(), key=lambda x: len(x[0]), reverse=True)
-        text = chunk.content
-        for short, full in pairs:
-            if len(short) <= 2:
-                pattern = rf"(?<![가-힣A-Za-z0-9]){re.escape(short)}(?=\s|제|의|에|을|를|이|가|은|는|과|와|으로|$)"
-            else:
-                pattern = re.escape(short)
-            text = re.sub(pattern, full, text)
-        chunk.content_resolved = text
+        resolve_chunk_abbreviations(chunk, chunk_abbr_maps.get(chunk_key(chunk), {}))
 
 
 def resolve_abbreviations(
@@ -137,12 +184,4 @@ def resolve_abbreviations(
     for chunk in chunks:
         abbr_map = law_abbr_maps.get(chunk.law_name, {})
         chunk.abbreviations = abbr_map
-        pairs = sorted(abbr_map.items(), key=lambda x: len(x[0]), reverse=True)
-        text = chunk.content
-        for short, full in pairs:
-            if len(short) <= 2:
-                pattern = rf"(?<![가-힣A-Za-z0-9]){re.escape(short)}(?=\s|제|의|에|을|를|이|가|은|는|과|와|으로|$)"
-            else:
-                pattern = re.escape(short)
-            text = re.sub(pattern, full, text)
-        chunk.content_resolved = text
+        chunk.content_resolved = apply_abbreviation_map(chunk.content, abbr_map)
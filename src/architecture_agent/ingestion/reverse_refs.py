@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+from architecture_agent.ingestion.resolve_abbr import chunk_key
+from architecture_agent.schemas import ArticleChunk
+
+DEFAULT_REVERSE_REFS_PATH = "data/processed/parent_ref_index.json"
+
+
+def parent_ref_key(law_name: str, article: str) -> str:
+    return f"{law_name}:{article}"
+
+
+def add_chunk_parent_refs(index: dict[str, list[str]], chunk: ArticleChunk) -> None:
+    child = chunk_key(chunk)
+    for ref in chunk.parent_law_refs:
+        if not ref.law_name or not ref.article:
+            continue
+        children = index.setdefault(parent_ref_key(ref.law_name, ref.article), [])
+        if child not in children:
+            children.append(child)
+
+
+def build_reverse_ref_index(chunks: Iterable[ArticleChunk]) -> dict[str, list[str]]:
+    index: dict[str, list[str]] = {}
+    for chunk in chunks:
+        add_chunk_parent_refs(index, chunk)
+    return index
+
+
+def merge_reverse_ref_index(
+    previous: dict[str, list[str]],
+    current: dict[str, list[str]],
+    law_ids: set[str],
+) -> dict[str, list[str]]:
+    # 이번 실행에 포함된 법령의 child는 새 결과로 교체하고, 나머지 법령의 child는 보존
+    merged: dict[str, list[str]] = {}
+    for parent, children in previous.items():
+        kept = [c for c in children if c.split(":", 1)[0] not in law_ids]
+        if kept:
+            merged[parent] = kept
+    for parent, children in current.items():
+        bucket = merged.setdefault(parent, [])
+        bucket.extend(c for c in children if c not in bucket)
+    return merged
+
+
+def save_reverse_ref_index(
+    index: dict[str, list[str]],
+    output_path: str = DEFAULT_REVERSE_REFS_PATH,
+) -> Path:
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def load_reverse_ref_index(path: str = DEFAULT_REVERSE_REFS_PATH) -> dict[str, list[str]]:
+    p = Path(path)
+    if not p.exists():
+        return {}
+    return json.loads(p.read_text(encoding="utf-8"))
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import mmap
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from architecture_agent.ingestion.index_version import DEFAULT_INDEX_VERSION_PATH, read_index_version
+from architecture_agent.ingestion.parse_law import article_label
+from architecture_agent.ingestion.reverse_refs import parent_ref_key
+
+DEFAULT_SERVING_SNAPSHOT_DIR = "data/processed/serving_snapshot"
+SNAPSHOT_FORMAT = 1
+MAX_EXACT_DOCS = 5
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.f32"
+PAYLOADS_FILE = "payloads.jsonl"
+OFFSETS_FILE = "offsets.i64"
+COLUMNS_FILE = "columns.json"
+
+# 검색 점수가 클수록 가까운 distance만 지원 (COSINE은 적재 시 정규화해 내적으로 계산)
+SUPPORTED_DISTANCES = ("Cosine", "Dot")
+
+
+def _short_law_id(law_id: Any) -> str:
+    raw = str(law_id).strip()
+    return raw.lstrip("0") or raw
+
+
+def _payload_doc(payload: dict) -> dict:
+    # agent.tools.point_to_doc과 같은 형태 (본문은 metadata.content_original)
+    meta = payload.get("metadata")
+    if not isinstance(meta, dict):
+        meta = payload
+    return {"content": meta.get("content_original", ""), "metadata": meta}
+
+
+def _collection_vector_params(client, collection_name: str, vector_name: str) -> tuple[int, str]:
+    vectors = client.get_collection(collection_name).config.params.vectors
+    if isinstance(vectors, dict):
+        vectors = vectors[vector_name]
+    distance = getattr(vectors.distance, "value", str(vectors.distance))
+    if distance not in SUPPORTED_DISTANCES:
+        raise ValueError(f"Unsupported distance for serving snapshot: {distance}")
+    return int(vectors.size), distance
+
+
+def _point_vector(point, vector_name: str) -> list[float]:
+    vector = point.vector
+    if isinstance(vector, dict):
+        vector = vector[vector_name]
+    return vector
+
+
+def export_serving_snapshot(
+    client,
+    collection_name: str = "building_law",
+    output_dir: str = DEFAULT_SERVING_SNAPSHOT_DIR,
+    vector_name: str = "",
+    index_version_path: str = DEFAULT_INDEX_VERSION_PATH,
+    page_size: int = 256,
+) -> dict[str, Any]:
+    """Dump a collection's vectors and payloads into a read-only directory that serving workers mmap.
+
+    The snapshot is written to a temporary sibling directory and renamed into place, so workers
+    that already mapped the previous snapshot keep reading it until they reopen.
+    """
+    dim, distance = _collection_vector_params(client, collection_name, vector_name)
+    out = Path(output_dir)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.parent / f".{out.name}.tmp-{uuid.uuid4().hex[:8]}"
+    tmp.mkdir()
+
+    columns: dict[str, list] = {
+        "ids": [],
+        "law_id": [],
+        "article_num": [],
+        "article_sub": [],
+        "law_type": [],
+        "law_name": [],
+        "parents": [],
+    }
+    offsets = [0]
+    try:
+        with (tmp / VECTORS_FILE).open("wb") as vf, (tmp / PAYLOADS_FILE).open("wb") as pf:
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=collection_name,
+                    offset=offset,
+                    limit=page_size,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if points:
+                    matrix = np.asarray([_point_vector(p, vector_name) for p in points], dtype=np.float32)
+                    if matrix.shape[1] != dim:
+                        raise ValueError(f"Vector dim mismatch: expected {dim}, got {matrix.shape[1]}")
+                    if distance == "Cosine":
+                        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                        matrix /= np.where(norms == 0, 1.0, norms)
+                    vf.write(matrix.tobytes())
+
+                for point in points:
+                    payload = point.payload or {}
+                    line = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                    pf.write(line)
+                    offsets.append(offsets[-1] + len(line))
+
+                    meta = _payload_doc(payload)["metadata"]
+                    columns["ids"].append(point.id if isinstance(point.id, int) else str(point.id))
+                    columns["law_id"].append(_short_law_id(meta.get("law_id", "")))
+                    columns["article_num"].append(str(meta.get("article_num", "")))
+                    columns["article_sub"].append(str(meta.get("article_sub", "") or ""))
+                    columns["law_type"].append(str(meta.get("law_type", "")))
+                    columns["law_name"].append(str(meta.get("law_name", "")))
+                    columns["parents"].append(
+                        list(
+                            dict.fromkeys(
+                                parent_ref_key(ref["law_name"], str(ref["article"]))
+                                for ref in meta.get("parent_law_refs") or []
+                                if isinstance(ref, dict) and ref.get("law_name") and ref.get("article")
+                            )
+                        )
+                    )
+                if offset is None:
+                    break
+
+        np.asarray(offsets, dtype=np.int64).tofile(tmp / OFFSETS_FILE)
+        (tmp / COLUMNS_FILE).write_text(json.dumps(columns, ensure_ascii=False), encoding="utf-8")
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}",
+            "index_version": read_index_version(index_version_path),
+            "collection": collection_name,
+            "vector_name": vector_name,
+            "distance": distance,
+            "dim": dim,
+            "count": len(columns["ids"]),
+        }
+        # manifest를 마지막에 써서 manifest가 있는 snapshot은 항상 완전하다
+        (tmp / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        old = None
+        if out.exists():
+            old = out.parent / f".{out.name}.old-{uuid.uuid4().hex[:8]}"
+            out.rename(old)
+        tmp.rename(out)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return manifest
+
+
+class ServingSnapshot:
+    """Read-only, memory-mapped view of an exported collection.
+
+    Vectors and payloads stay in the OS page cache shared by every worker process; each worker only
+    keeps the small filter/lookup postings. Exposes the same lookup methods as ArticleStore.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        manifest = json.loads((self.path / MANIFEST_FILE).read_text(encoding="utf-8"))
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported serving snapshot format: {manifest.get('format')}")
+        self.manifest = manifest
+        self.version = str(manifest["version"])
+        self.collection_name = manifest["collection"]
+        self.distance = manifest["distance"]
+        self.dim = int(manifest["dim"])
+        self.size = int(manifest["count"])
+
+        if self.size:
+            self.vectors = np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(self.size, self.dim))
+            self._offsets = np.fromfile(self.path / OFFSETS_FILE, dtype=np.int64)
+            with (self.path / PAYLOADS_FILE).open("rb") as f:
+                self._payloads = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._offsets = np.zeros(1, dtype=np.int64)
+            self._payloads = b""
+
+        columns = json.loads((self.path / COLUMNS_FILE).read_text(encoding="utf-8"))
+        self.ids: list = columns["ids"]
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        for name in ("law_id", "law_type", "law_name"):
+            index: dict[str, list[int]] = {}
+            for row, value in enumerate(columns[name]):
+                index.setdefault(value, []).append(row)
+            self._postings[name] = index
+        # 조문 key는 (law_id, "4" | "4의2"); article_sub 열이 없는 이전 snapshot은 가지번호 없음으로 본다
+        subs = columns.get("article_sub") or [""] * len(columns["article_num"])
+        self._by_key: dict[tuple[str, str], list[int]] = {}
+        for row, (law_id, num, sub) in enumerate(zip(columns["law_id"], columns["article_num"], subs)):
+            self._by_key.setdefault((law_id, article_label(num, sub)), []).append(row)
+        self._children: dict[str, list[int]] = {}
+        for row, parents in enumerate(columns["parents"]):
+            for parent in parents:
+                self._children.setdefault(parent, []).append(row)
+
+    def close(self) -> None:
+        if isinstance(self._payloads, mmap.mmap):
+            self._payloads.close()
+
+    def payload(self, row: int) -> dict:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json.loads(self._payloads[start:end])
+
+    def _docs(self, rows: list[int]) -> list[dict]:
+        return [_payload_doc(self.payload(row)) for row in rows]
+
+    def _filter_rows(self, law_id: str | None, law_type: str | None, law_name: str | None) -> np.ndarray | None:
+        # build_metadata_filter와 같은 조건 (law_id는 "1823"/"001823" 표기 무관)
+        rows = None
+        for name, value in (("law_id", _short_law_id(law_id) if law_id else None), ("law_type", law_type), ("law_name", law_name)):
+            if not value:
+                continue
+            matched = np.asarray(self._postings[name].get(value, []), dtype=np.int64)
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return rows
+
+    def search_many(
+        self,
+        vectors: list[list[float]],
+        k: int = 6,
+        law_id: str | None = None,
+        law_type: str | None = None,
+        law_name: str | None = None,
+    ) -> list[list[dict]]:
+        """Exact top-k search per query vector; hits look like LawRetriever._hit_to_doc output."""
+        if not vectors:
+            return []
+        queries = np.asarray(vectors, dtype=np.float32)
+        if self.distance == "Cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms == 0, 1.0, norms)
+
+        rows = self._filter_rows(law_id, law_type, law_name)
+        candidates = self.vectors if rows is None else self.vectors[rows]
+        if k <= 0 or not len(candidates):
+            return [[] for _ in vectors]
+        # (질의 수 x 후보 수) 내적 한 번; numpy 행렬곱은 GIL을 풀어 스레드 병렬로도 확장된다
+        scores = queries @ candidates.T
+        top_n = min(k, scores.shape[1])
+
+        out = []
+        for query_scores in scores:
+            top = np.argpartition(-query_scores, top_n - 1)[:top_n]
+            top = top[np.argsort(-query_scores[top], kind="stable")]
+            hits = []
+            for i in top:
+                row = int(i) if rows is None else int(rows[i])
+                payload = self.payload(row)
+                meta = payload.get("metadata") or {}
+                meta["_id"] = self.ids[row]
+                meta["_collection_name"] = self.collection_name
+                hits.append({"content": payload.get("page_content", ""), "metadata": meta})
+            out.append(hits)
+        return out
+
+    def get(self, law_id: str, article_num: str) -> list[dict]:
+        return self._docs(self._by_key.get((_short_law_id(law_id), str(article_num)), [])[:MAX_EXACT_DOCS])
+
+    def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        return {key: self.get(*key) for key in keys}
+
+    def law_articles(self, law_id: str) -> list[dict]:
+        return self._docs(self._postings["law_id"].get(_short_law_id(law_id), []))
+
+    def children_of(self, law_name: str, article_num: str) -> list[dict]:
+        return self._docs(self._children.get(parent_ref_key(law_name, str(article_num)), []))
+
+
+def open_serving_snapshot(path: str = DEFAULT_SERVING_SNAPSHOT_DIR) -> ServingSnapshot:
+    return ServingSnapshot(path)
+
+
+if __name__ == "__main__":
+    from architecture_agent.ingestion.index_qdrant import open_qdrant_client
+
+    result = export_serving_snapshot(open_qdrant_client())
+    for k, v in result.items():
+        print(f"{k}: {v}")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+from itertools import groupby, islice
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+
+from architecture_agent.ingestion.change_detect import compute_source_hash
+from architecture_agent.ingestion.extract_abbr_chunk_llm import extract_abbreviations_by_chunk_llm
+from architecture_agent.ingestion.extract_abbr_llm import extract_abbreviations_by_law_llm
+from architecture_agent.ingestion.extract_refs import extract_chunk_references
+from architecture_agent.ingestion.parse_law import iter_law_chunks
+from architecture_agent.ingestion.resolve_abbr import (
+    chunk_key,
+    extract_abbreviations_by_law,
+    merge_abbreviation_maps,
+    resolve_abbreviations,
+    resolve_chunk_abbreviations,
+)
+from architecture_agent.ingestion.reverse_refs import add_chunk_parent_refs
+from architecture_agent.schemas import ArticleChunk
+
+T = TypeVar("T")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, max(1, size)))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_raw_payloads(raw_files: Iterable[str | Path]) -> Iterator[dict]:
+    for f in raw_files:
+        yield json.loads(Path(f).read_text(encoding="utf-8"))
+
+
+def iter_parsed_chunks(payloads: Iterable[dict]) -> Iterator[ArticleChunk]:
+    for payload in payloads:
+        yield from iter_law_chunks(payload)
+
+
+def iter_with_references(chunks: Iterable[ArticleChunk]) -> Iterator[ArticleChunk]:
+    for chunk in chunks:
+        extract_chunk_references(chunk)
+        yield chunk
+
+
+class ReverseRefStage:
+    # 시행령 chunk의 parent_law_refs로 "모법 조문 -> 시행령 chunk key" 역참조 인덱스를 누적
+    def __init__(self):
+        self.index: dict[str, list[str]] = {}
+        self.law_ids: set[str] = set()
+
+    def __call__(self, chunks: Iterable[ArticleChunk]) -> Iterator[ArticleChunk]:
+        for chunk in chunks:
+            self.law_ids.add(str(chunk.law_id))
+            add_chunk_parent_refs(self.index, chunk)
+            yield chunk
+
+
+class LlmChunkAbbreviationStage:
+    # window 단위로 LLM 축약어 추출 후 치환; 메모리는 window 크기에만 비례
+    def __init__(
+        self,
+        llm,
+        window_size: int = 32,
+        max_concurrency: int = 4,
+        indexed_state: dict[str, dict] | None = None,
+        previous_chunk_maps: dict[str, dict[str, str]] | None = None,
+    ):
+        self.llm = llm
+        self.window_size = window_size
+        self.max_concurrency = max_concurrency
+        self.indexed_state = indexed_state or {}
+        self.previous_chunk_maps = previous_chunk_maps or {}
+        self.chunk_maps: dict[str, dict[str, str]] = {}
+        self.law_maps: dict[str, dict[str, str]] = {}
+        self.processed = 0
+        self.reused = 0
+        self.failed = 0
+
+    def _reusable_map(self, chunk: ArticleChunk) -> dict[str, str] | None:
+        # 원문이 바뀌지 않은 조문은 직전 실행의 chunk별 축약어 맵을 재사용해 LLM 호출 생략
+        key = chunk_key(chunk)
+        state = self.indexed_state.get(key)
+        if state is None or key not in self.previous_chunk_maps:
+            return None
+        if state.get("source_hash") != compute_source_hash(chunk):
+            return None
+        return self.previous_chunk_maps[key]
+
+    def __call__(self, chunks: Iterable[ArticleChunk]) -> Iterator[ArticleChunk]:
+        for window in batched(chunks, self.window_size):
+            reused: dict[str, dict[str, str]] = {}
+            for chunk in window:
+                cmap = self._reusable_map(chunk)
+                if cmap is not None:
+                    reused[chunk_key(chunk)] = cmap
+            extracted = extract_abbreviations_by_chunk_llm(
+                [c for c in window if chunk_key(c) not in reused],
+                llm=self.llm,
+                max_concurrency=self.max_concurrency,
+            )
+            self.reused += len(reused)
+
+            for chunk in window:
+                key = chunk_key(chunk)
+                cmap = reused.get(key, extracted.get(key))
+                if cmap is None:
+                    # LLM 추출 실패: 빈 맵으로 진행하되 저장하지 않아 다음 증분 실행에서 재시도
+                    cmap = {}
+                    self.failed += 1
+                else:
+                    self.chunk_maps[key] = cmap
+                resolve_chunk_abbreviations(chunk, cmap)
+                self.law_maps[chunk.law_name] = merge_abbreviation_maps(
+                    self.law_maps.get(chunk.law_name, {}),
+                    cmap,
+                )
+                self.processed += 1
+                yield chunk
+
+
+class LawAbbreviationStage:
+    # 법령 단위 축약어 추출(정규식, llm이 주어지면 법령별 LLM)은 법령 전체 본문이 필요하므로 한 법령씩만 메모리에 올린다
+    def __init__(self, llm=None):
+        self.llm = llm
+        self.law_maps: dict[str, dict[str, str]] = {}
+        self.processed = 0
+
+    def __call__(self, chunks: Iterable[ArticleChunk]) -> Iterator[ArticleChunk]:
+        for _, group in groupby(chunks, key=lambda c: c.law_id):
+            law_chunks = list(group)
+            if self.llm is None:
+                law_maps = extract_abbreviations_by_law(law_chunks)
+            else:
+                law_maps = extract_abbreviations_by_law_llm(law_chunks, llm=self.llm)
+            resolve_abbreviations(law_chunks, law_maps)
+            self.law_maps.update(law_maps)
+            self.processed += len(law_chunks)
+            yield from law_chunks
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from architecture_agent.service.evidence_packer import estimate_tokens
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (bucket별 count(누적 아님), 합계, 개수)
+        self._values: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            row[0][bisect_left(self.buckets, value)] += 1
+            row[1] += value
+            row[2] += 1
+
+    def count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        return row[2] if row else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, n) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, c in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += c
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def render_gauge(name: str, help_text: str, labelname: str, values: dict[str, float]) -> str:
+    # 스크레이프 시점에 읽는 값(admission 대기열 등)을 gauge 한 묶음으로 출력
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for label, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels((labelname,), (label,))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram("law_agent_stage_seconds", "Duration of each ask stage.", ("stage",))
+CALL_SECONDS = REGISTRY.histogram(
+    "law_agent_call_seconds",
+    "Duration of external calls (Qdrant, embedding, LLM).",
+    ("component", "op"),
+)
+CALL_ERRORS = REGISTRY.counter("law_agent_call_errors_total", "External calls that raised.", ("component", "op"))
+LLM_CHARS = REGISTRY.counter("law_agent_llm_chars_total", "Prompt/completion size in characters.", ("op", "kind"))
+LLM_TOKENS = REGISTRY.counter(
+    "law_agent_llm_estimated_tokens_total",
+    "Prompt/completion size in estimated tokens (evidence packer estimate, UTF-8 bytes / 4).",
+    ("op", "kind"),
+)
+CACHE_EVENTS = REGISTRY.counter("law_agent_cache_events_total", "Cache lookups by result.", ("cache", "result"))
+EVIDENCE_TOKENS = REGISTRY.histogram(
+    "law_agent_prompt_evidence_tokens",
+    "Estimated evidence tokens packed into each prompt.",
+    ("op",),
+    buckets=(50, 100, 200, 400, 800, 1200, 1600, 2400, 3200, 4800),
+)
+
+
+class RequestTimings:
+    # 요청 하나 동안의 단계/호출 시간을 모아 trace["timings"]로 돌려준다 (스레드 풀에서도 같은 객체를 공유)
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.calls: dict[str, dict[str, float]] = {}
+        self.cache: dict[str, int] = {}
+        self.evidence: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds * 1000
+
+    def add_call(self, key: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            row = self.calls.setdefault(key, {"count": 0, "ms": 0.0})
+            row["count"] += 1
+            row["ms"] += seconds * 1000
+            if error:
+                row["errors"] = row.get("errors", 0) + 1
+
+    def add_sizes(self, key: str, sizes: dict[str, int]) -> None:
+        with self._lock:
+            row = self.calls.setdefault(key, {"count": 0, "ms": 0.0})
+            for field, value in sizes.items():
+                row[field] = row.get(field, 0) + value
+
+    def add_evidence(self, op: str, usage: dict[str, int]) -> None:
+        with self._lock:
+            row = self.evidence.setdefault(op, {})
+            for k, v in usage.items():
+                row[k] = row.get(k, 0) + v
+
+    def add_cache(self, key: str, n: int) -> None:
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + n
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+                "stages": {k: round(v, 3) for k, v in self.stages.items()},
+                "calls": {k: {f: round(v, 3) if f == "ms" else v for f, v in row.items()} for k, row in self.calls.items()},
+                "cache": dict(self.cache),
+                "evidence": {k: dict(v) for k, v in self.evidence.items()},
+            }
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("law_agent_request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, name)
+        timings = _current.get()
+        if timings is not None:
+            timings.add_stage(name, elapsed)
+
+
+@contextmanager
+def timed_call(component: str, op: str) -> Iterator[None]:
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        CALL_ERRORS.inc(component, op)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        CALL_SECONDS.observe(elapsed, component, op)
+        timings = _current.get()
+        if timings is not None:
+            timings.add_call(f"{component}.{op}", elapsed, error=error)
+
+
+def record_llm_sizes(op: str, prompt: str, completion: str) -> None:
+    # 문자 수와 함께 evidence packer와 같은 기준의 추정 token 수를 기록 (실제 tokenizer 값은 아님)
+    sizes = {
+        "prompt_chars": len(prompt),
+        "completion_chars": len(completion),
+        "prompt_tokens_est": estimate_tokens(prompt),
+        "completion_tokens_est": estimate_tokens(completion),
+    }
+    for kind in ("prompt", "completion"):
+        LLM_CHARS.inc(op, kind, amount=sizes[f"{kind}_chars"])
+        LLM_TOKENS.inc(op, kind, amount=sizes[f"{kind}_tokens_est"])
+    timings = _current.get()
+    if timings is not None:
+        timings.add_sizes(f"llm.{op}", sizes)
+
+
+def record_cache(cache: str, result: str, n: int = 1) -> None:
+    if n <= 0:
+        return
+    CACHE_EVENTS.inc(cache, result, amount=n)
+    timings = _current.get()
+    if timings is not None:
+        timings.add_cache(f"{cache}.{result}", n)
+
+
+def record_evidence(op: str, usage: dict[str, int]) -> None:
+    EVIDENCE_TOKENS.observe(usage.get("tokens", 0), op)
+    timings = _current.get()
+    if timings is not None:
+        timings.add_evidence(op, usage)
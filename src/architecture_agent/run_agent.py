@@ -15,6 +15,10 @@ def build_runtime(
     qdrant_api_key: str | None = None,
     qdrant_prefer_grpc: bool = False,
     appendix_json: str = "data/processed/appendix1_terms.json",
+    reverse_refs_json: str | None = "data/processed/parent_ref_index.json",
+    query_embedding_cache_dir: str | None = "data/processed/query_embedding_cache",
+    article_store: bool = True,
+    index_version_path: str = "data/processed/index_version.json",
 ):
     retriever = LawRetriever(
         collection_name=collection_name,
@@ -22,6 +26,10 @@ def build_runtime(
         qdrant_url=qdrant_url or os.getenv("QDRANT_URL"),
         qdrant_api_key=qdrant_api_key or os.getenv("QDRANT_API_KEY"),
         prefer_grpc=qdrant_prefer_grpc,
+        reverse_ref_index_path=reverse_refs_json,
+        query_embedding_cache_dir=query_embedding_cache_dir,
+        article_store=article_store,
+        index_version_path=index_version_path,
     )
     appendix = Appendix1Index(json_path=appendix_json)
     tool_list = build_tools(retriever=retriever, appendix_index=appendix)
@@ -33,9 +33,10 @@ class ArticleChunk:
     effective_date: str = ""
     change_type: str = ""
     law_type: str = ""
+    article_sub: str = ""
 
     def to_payload(self) -> dict:
-        return {
+        payload = {
             "law_name": self.law_name,
             "law_id": self.law_id,
             "law_type": self.law_type,
@@ -50,6 +51,10 @@ class ArticleChunk:
             "effective_date": self.effective_date,
             "change_type": self.change_type,
         }
+        if self.article_sub:
+            # 가지번호(제N조의M)가 있는 조문만 기록해 기존 조문의 content_hash는 그대로 유지
+            payload["article_sub"] = self.article_sub
+        return payload
 
 
 class ConditionSlots(TypedDict, total=False):
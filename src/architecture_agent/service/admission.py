@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    # 동시 처리 max_in_flight, 대기열 max_waiting; 대기열이 차면 429, 대기 시간이 지나면 503
+    def __init__(self, max_in_flight: int = 64, max_waiting: int = 256, wait_timeout: float = 10.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_waiting = max(0, max_waiting)
+        self.wait_timeout = wait_timeout
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected_busy = 0
+        self.rejected_timeout = 0
+
+    async def acquire(self) -> AdmissionLease:
+        """Take a slot without a context manager, for responses that outlive the handler (streams)."""
+        if not self._semaphore.locked():
+            # 여유가 있으면 대기열을 거치지 않고 바로 자리를 잡는다
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_waiting:
+            self.rejected_busy += 1
+            raise AdmissionRejected(429, "too many requests in queue")
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise AdmissionRejected(
+                    503,
+                    "server busy, queue wait timed out",
+                    retry_after=int(self.wait_timeout) or 1,
+                ) from None
+            finally:
+                self.waiting -= 1
+
+        self.in_flight += 1
+        return AdmissionLease(self)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        lease = await self.acquire()
+        try:
+            yield
+        finally:
+            lease.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_in_flight": self.max_in_flight,
+            "max_waiting": self.max_waiting,
+            "rejected_busy": self.rejected_busy,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class AdmissionLease:
+    # release()는 여러 곳(스트림 종료, 응답 전송 실패)에서 불려도 자리를 한 번만 돌려준다
+    def __init__(self, limiter: AdmissionLimiter):
+        self._limiter = limiter
+        self.released = False
+
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self._limiter._release()
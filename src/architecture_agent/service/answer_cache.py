@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).split()).lower()
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    created_at: float
+    embedding: list[float] | None = None
+
+
+class AnswerCache:
+    # key = (정규화 질의, k, model, index version); index version이 바뀌면 이전 항목은 모두 버린다
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float | None = 3600.0,
+        similarity_threshold: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        self._entries: OrderedDict[tuple[str, int, str], _Entry] = OrderedDict()
+        self._version = ""
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _sync_version(self, version: str) -> None:
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.created_at > self.ttl_seconds
+
+    def get(
+        self,
+        query: str,
+        k: int,
+        model: str,
+        version: str,
+        embed: Callable[[str], list[float]] | None = None,
+    ) -> tuple[Any, str] | tuple[None, str]:
+        key = (normalize_query(query), k, model)
+        now = self.clock()
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value, "hit"
+            if self.similarity_threshold is None or embed is None:
+                self.misses += 1
+                return None, "miss"
+            candidates = [
+                (kk, e)
+                for kk, e in self._entries.items()
+                if kk[1:] == key[1:] and e.embedding is not None and not self._expired(e, now)
+            ]
+        if not candidates:
+            with self._lock:
+                self.misses += 1
+            return None, "miss"
+
+        # 유사 질의 매칭: 임베딩 cosine이 임계값 이상인 가장 가까운 항목을 재사용
+        vector = embed(key[0])
+        best_key, best_score = None, self.similarity_threshold
+        for kk, e in candidates:
+            score = _cosine(vector, e.embedding)
+            if score >= best_score:
+                best_key, best_score = kk, score
+        with self._lock:
+            entry = self._entries.get(best_key) if best_key is not None else None
+            if entry is None or self._version != version:
+                self.misses += 1
+                return None, "miss"
+            self._entries.move_to_end(best_key)
+            self.near_hits += 1
+            return entry.value, "near_hit"
+
+    def put(
+        self,
+        query: str,
+        k: int,
+        model: str,
+        version: str,
+        value: Any,
+        embed: Callable[[str], list[float]] | None = None,
+    ) -> None:
+        key = (normalize_query(query), k, model)
+        embedding = embed(key[0]) if self.similarity_threshold is not None and embed is not None else None
+        with self._lock:
+            self._sync_version(version)
+            self._entries[key] = _Entry(value=value, created_at=self.clock(), embedding=embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "version": self._version,
+            }
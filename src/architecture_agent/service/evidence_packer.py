@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    # tokenizer 없이 쓰는 근사치: UTF-8 4바이트당 1 token (한글 1자 ≈ 0.75 token, 영문/숫자 4자 ≈ 1 token)
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+@dataclass
+class EvidenceItem:
+    key: str
+    header: str
+    text: str
+    score: float = 0.0
+    focus: str = ""
+
+
+@dataclass
+class PackedEvidence:
+    text: str
+    tokens: int
+    budget: int
+    included: list[str] = field(default_factory=list)
+    truncated: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    duplicates: int = 0
+
+    def usage(self) -> dict[str, int]:
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "items": len(self.included),
+            "truncated": len(self.truncated),
+            "dropped": len(self.dropped),
+            "duplicates": self.duplicates,
+        }
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+
+def _fit_text(text: str, focus: str, max_tokens: int, count_tokens: TokenCounter) -> str:
+    # max_tokens 안에 들어가는 가장 긴 구간; focus(참조 문구 등)가 앞부분 밖에 있으면 그 주변을 남긴다
+    if max_tokens <= 0:
+        return ""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens("…" + text[:mid] + "…") <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    if lo <= 0:
+        return ""
+    start = 0
+    pos = text.find(focus) if focus else -1
+    if pos >= 0 and pos + len(focus) > lo:
+        start = max(0, min(pos - lo // 3, len(text) - lo))
+    window = text[start : start + lo]
+    return ("…" if start else "") + window + ("…" if start + lo < len(text) else "")
+
+
+def pack_evidence(
+    items: list[EvidenceItem],
+    budget_tokens: int,
+    count_tokens: TokenCounter = estimate_tokens,
+    min_item_tokens: int = 24,
+    max_item_tokens: int | None = None,
+) -> PackedEvidence:
+    """Fill a token budget with the highest-scoring evidence, rendered as compact "[n] header\\ntext" blocks.
+
+    max_item_tokens caps a single block so one long article cannot starve the lower-ranked ones.
+    """
+    ranked = sorted(enumerate(items), key=lambda x: (-x[1].score, x[0]))
+    packed = PackedEvidence(text="", tokens=0, budget=budget_tokens)
+    seen_keys: set[str] = set()
+    seen_text: set[str] = set()
+    blocks: list[str] = []
+    used = 0
+
+    for _, item in ranked:
+        body = _normalize(item.text)
+        digest = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        if item.key in seen_keys or (body and digest in seen_text):
+            packed.duplicates += 1
+            continue
+        seen_keys.add(item.key)
+        seen_text.add(digest)
+
+        head = f"[{len(blocks) + 1}] {_normalize(item.header)}".rstrip()
+        # 블록 사이 줄바꿈까지 포함해 budget을 계산
+        head_tokens = count_tokens(head + "\n") + (1 if blocks else 0)
+        remaining = budget_tokens - used - head_tokens
+        if max_item_tokens is not None:
+            remaining = min(remaining, max_item_tokens - head_tokens)
+        if remaining < min(min_item_tokens, count_tokens(body) if body else 0) or remaining <= 0:
+            packed.dropped.append(item.key)
+            continue
+
+        if count_tokens(body) <= remaining:
+            text = body
+        else:
+            text = _fit_text(body, _normalize(item.focus), remaining, count_tokens)
+            packed.truncated.append(item.key)
+        block = f"{head}\n{text}" if text else head
+        blocks.append(block)
+        used += count_tokens(block) + (1 if len(blocks) > 1 else 0)
+        packed.included.append(item.key)
+
+    packed.text = "\n".join(blocks)
+    packed.tokens = count_tokens(packed.text) if blocks else 0
+    return packed
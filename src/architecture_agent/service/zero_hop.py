@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import contextvars
 import json
 import os
+import queue
 import re
-from dataclasses import dataclass
-from typing import Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterator
 
 from dotenv import load_dotenv
 
 from architecture_agent.agent.tools import Appendix1Index, LawRetriever
+from architecture_agent.ingestion.index_version import DEFAULT_INDEX_VERSION_PATH, IndexVersionWatcher
+from architecture_agent.metrics import (
+    collect_timings,
+    record_cache,
+    record_evidence,
+    record_llm_sizes,
+    stage,
+    timed_call,
+)
+from architecture_agent.service.answer_cache import AnswerCache
+from architecture_agent.service.evidence_packer import EvidenceItem, PackedEvidence, pack_evidence
 
 
 TARGET_KEYWORDS = {
@@ -25,6 +41,26 @@ LAW_NAME_TO_ID = {
 }
 
 
+ASK_STEPS = (
+    "질문을 분류하고 있습니다...",
+    "0-hop 관련 문서를 찾고 있습니다...",
+    "현재 근거만으로 답변 가능한지 판단하고 있습니다...",
+    "필요한 경우에만 참조 법령/조항을 확장하고 있습니다...",
+    "관련 법/조항을 정리하고 있습니다...",
+    "최종 답변을 생성하고 있습니다...",
+)
+
+EventCallback = Callable[[str, dict[str, Any]], None]
+
+
+def _noop_emit(_event: str, _data: dict[str, Any]) -> None:
+    return None
+
+
+class StreamCancelled(Exception):
+    """Raised inside the ask_stream worker once the consumer has gone away."""
+
+
 @dataclass
 class ZeroHopResult:
     answer: str
@@ -33,6 +69,8 @@ class ZeroHopResult:
     references: list[dict[str, Any]]
     contexts_count: int
     trace: dict[str, Any]
+    # 제한 시간 초과나 LLM 없는 규칙 기반 fallback으로 만든 결과는 answer cache에 넣지 않는다
+    degraded: bool = False
 
 
 class ZeroHopLawAgent:
@@ -44,10 +82,44 @@ class ZeroHopLawAgent:
         qdrant_api_key: str | None = None,
         qdrant_prefer_grpc: bool = False,
         appendix_json: str = "data/processed/appendix1_terms.json",
+        reverse_refs_json: str | None = "data/processed/parent_ref_index.json",
+        query_embedding_cache_dir: str | None = "data/processed/query_embedding_cache",
         answer_model: str = "HCX-005",
         answer_temperature: float = 0.0,
+        ref_check_concurrency: int = 4,
+        ref_check_timeout: float | None = 20.0,
+        ref_check_mode: str = "per_candidate",
+        index_version_path: str = DEFAULT_INDEX_VERSION_PATH,
+        answer_cache_size: int = 256,
+        answer_cache_ttl: float | None = 3600.0,
+        answer_cache_similarity: float | None = None,
+        article_store: bool = False,
+        snapshot_path: str | None = None,
+        answer_token_budget: int = 1200,
+        precheck_token_budget: int = 600,
+        follow_token_budget: int = 200,
+        batch_follow_token_budget: int = 800,
     ):
         load_dotenv()
+        self.answer_model = answer_model
+        self.index_version = IndexVersionWatcher(index_version_path)
+        self.answer_cache = (
+            AnswerCache(
+                max_entries=answer_cache_size,
+                ttl_seconds=answer_cache_ttl,
+                similarity_threshold=answer_cache_similarity,
+            )
+            if answer_cache_size > 0
+            else None
+        )
+        self.ref_check_mode = ref_check_mode
+        self.ref_check_concurrency = max(1, ref_check_concurrency)
+        self.ref_check_timeout = ref_check_timeout
+        # 프롬프트별 근거 token budget (근사 token 수, evidence_packer.estimate_tokens 기준); 자르기는 packer가 담당
+        self.answer_token_budget = answer_token_budget
+        self.precheck_token_budget = precheck_token_budget
+        self.follow_token_budget = follow_token_budget
+        self.batch_follow_token_budget = batch_follow_token_budget
 
         self.retriever = LawRetriever(
             collection_name=collection_name,
@@ -55,6 +127,11 @@ class ZeroHopLawAgent:
             qdrant_url=qdrant_url or os.getenv("QDRANT_URL"),
             qdrant_api_key=qdrant_api_key or os.getenv("QDRANT_API_KEY"),
             prefer_grpc=qdrant_prefer_grpc,
+            reverse_ref_index_path=reverse_refs_json,
+            query_embedding_cache_dir=query_embedding_cache_dir,
+            article_store=article_store,
+            index_version_path=index_version_path,
+            snapshot_path=snapshot_path,
         )
         self.appendix = Appendix1Index(json_path=appendix_json)
 
@@ -85,40 +162,64 @@ class ZeroHopLawAgent:
                 found.append(target)
         return found or ["일반"]
 
-    def retrieve_zero_hop(self, query: str, targets: list[str], k: int) -> list[dict[str, Any]]:
-        docs: list[dict[str, Any]] = []
-        per_query_k = max(k, 4)
-
+    @staticmethod
+    def _zero_hop_queries(query: str, targets: list[str]) -> list[str]:
         queries = [query]
         for t in targets:
             queries.append(t)
             queries.append(f"{query} {t}")
+        return queries
 
-        for q in queries:
-            docs.extend(self.retriever.similarity_search(q, k=per_query_k))
+    @staticmethod
+    def _backfill_queries(query: str) -> list[str]:
+        return [f"건축법 {query}", f"건축법 시행령 {query}"]
 
+    def _dedup_hits(self, hit_lists: list[list[dict[str, Any]]]) -> dict[str, dict[str, Any]]:
         dedup: dict[str, dict[str, Any]] = {}
-        for d in docs:
-            meta = d.get("metadata", {}) or {}
-            key = self._chunk_key(meta)
-            if key not in dedup:
-                dedup[key] = d
+        for hits in hit_lists:
+            for d in hits:
+                meta = d.get("metadata", {}) or {}
+                key = self._chunk_key(meta)
+                if key not in dedup:
+                    dedup[key] = d
+        return dedup
+
+    def _apply_backfill(
+        self,
+        out: list[dict[str, Any]],
+        dedup: dict[str, dict[str, Any]],
+        hit_lists: list[list[dict[str, Any]]],
+        k: int,
+    ) -> None:
+        for hits in hit_lists:
+            if len(out) >= k:
+                break
+            for d in hits:
+                meta = d.get("metadata", {}) or {}
+                key = self._chunk_key(meta)
+                if key not in dedup:
+                    dedup[key] = d
+                    out.append(d)
+
+    def retrieve_zero_hop(self, query: str, targets: list[str], k: int) -> list[dict[str, Any]]:
+        per_query_k = max(k, 4)
+        hit_lists = self.retriever.similarity_search_many(self._zero_hop_queries(query, targets), k=per_query_k)
+        dedup = self._dedup_hits(hit_lists)
 
         out = list(dedup.values())
         if len(out) < k:
-            backfills = [f"건축법 {query}", f"건축법 시행령 {query}"]
-            for bq in backfills:
-                if len(out) >= k:
-                    break
-                for d in self.retriever.similarity_search(bq, k=max(k * 2, 8)):
-                    meta = d.get("metadata", {}) or {}
-                    key = self._chunk_key(meta)
-                    if key not in dedup:
-                        dedup[key] = d
-                        out.append(d)
+            backfill = self.retriever.similarity_search_many(self._backfill_queries(query), k=max(k * 2, 8))
+            self._apply_backfill(out, dedup, backfill, k)
 
         return out[:k]
 
+    @staticmethod
+    def _article_heading(meta: dict[str, Any]) -> str:
+        # 가지조문은 "제4조의2"처럼 의M까지 붙여 제4조와 구분한다
+        article_sub = str(meta.get("article_sub", "0") or "0")
+        article_sub_txt = f"의{article_sub}" if article_sub not in ["", "0"] else ""
+        return f"제{meta.get('article_num', '')}조{article_sub_txt}"
+
     def _build_references(self, docs: list[dict[str, Any]]) -> list[dict[str, Any]]:
         refs: list[dict[str, Any]] = []
         for d in docs:
@@ -127,9 +228,8 @@ class ZeroHopLawAgent:
             law_name = str(meta.get("law_name", ""))
             article_num = str(meta.get("article_num", ""))
             article_sub = str(meta.get("article_sub", "0") or "0")
-            article_sub_txt = f"의{article_sub}" if article_sub not in ["", "0"] else ""
             title = str(meta.get("article_title", ""))
-            section = f"제{article_num}조{article_sub_txt} {title}".strip()
+            section = f"{self._article_heading(meta)} {title}".strip()
 
             refs.append(
                 {
@@ -145,16 +245,81 @@ class ZeroHopLawAgent:
                     "full_text": content,
                     "internal_refs": meta.get("internal_refs", []) or [],
                     "external_refs": meta.get("external_refs", []) or [],
+                    "ref_priority": d.get("ref_priority"),
                 }
             )
         return refs
 
-    def _is_answerable_without_refs(
-        self,
-        query: str,
-        targets: list[str],
-        contexts: list[dict[str, Any]],
-    ) -> tuple[bool, str]:
+    @staticmethod
+    def _evidence_score(rank: int, ref_priority: int | None) -> float:
+        # 0-hop 검색 순위는 1/(1+rank), 확장된 ref는 follow priority(0~2)를 (p+1)/6으로 환산해 그 사이에 끼운다
+        if ref_priority is None:
+            return 1.0 / (1 + rank)
+        return (int(ref_priority) + 1) / 6
+
+    def _context_evidence(self, contexts: list[dict[str, Any]]) -> list[EvidenceItem]:
+        items = []
+        for rank, c in enumerate(contexts):
+            meta = c.get("metadata", {}) or {}
+            items.append(
+                EvidenceItem(
+                    key=self._chunk_key(meta),
+                    header=f"{meta.get('law_name', '')} {self._article_heading(meta)} {meta.get('article_title', '')}",
+                    text=str(c.get("content", "")),
+                    score=self._evidence_score(rank, c.get("ref_priority")),
+                )
+            )
+        return items
+
+    def _reference_evidence(self, refs: list[dict[str, Any]]) -> list[EvidenceItem]:
+        items = []
+        rank = 0
+        for r in refs:
+            priority = r.get("ref_priority")
+            items.append(
+                EvidenceItem(
+                    key=str(r.get("chunk_key", "")),
+                    header=f"{r.get('law_name', '')} {r.get('section', '')}",
+                    text=str(r.get("full_text", "")),
+                    score=self._evidence_score(rank, priority),
+                )
+            )
+            if priority is None:
+                rank += 1
+        return items
+
+    @staticmethod
+    def _pack(op: str, items: list[EvidenceItem], budget: int, max_items: int = 4) -> PackedEvidence:
+        # 한 조문이 budget을 독차지하지 않도록 항목당 budget/max_items까지만 싣는다
+        packed = pack_evidence(items, budget_tokens=budget, max_item_tokens=max(budget // max_items, 1))
+        record_evidence(op, packed.usage())
+        return packed
+
+    @staticmethod
+    def _llm_text(response: Any) -> str:
+        return getattr(response, "content", str(response)).strip()
+
+    def _invoke_llm(self, op: str, prompt: str) -> Any:
+        with timed_call("llm", op):
+            response = self.llm.invoke(prompt)
+        record_llm_sizes(op, prompt, getattr(response, "content", str(response)))
+        return response
+
+    @staticmethod
+    def _parse_json_object(text: str) -> dict[str, Any]:
+        try:
+            obj = json.loads(text)
+        except Exception:
+            obj = None
+            m = re.search(r"\{[\s\S]*\}", text)
+            if m:
+                try:
+                    obj = json.loads(m.group(0))
+                except Exception:
+                    obj = None
+        return obj if isinstance(obj, dict) else {}
+
+    def _answerable_evidence(self, contexts: list[dict[str, Any]]) -> list[dict[str, Any]]:
         evidence = []
         for c in contexts[:5]:
             meta = c.get("metadata", {}) or {}
@@ -163,18 +328,23 @@ class ZeroHopLawAgent:
                     "law_name": meta.get("law_name", ""),
                     "article_num": meta.get("article_num", ""),
                     "article_title": meta.get("article_title", ""),
-                    "excerpt": self._normalize_text(c.get("content", ""))[:280],
+                    "excerpt": self._normalize_text(c.get("content", "")),
                 }
             )
+        return evidence
 
-        if self.llm is None:
-            # fallback heuristic: 근거가 3개 이상이고 target 키워드가 본문에 있으면 우선 ref 없이 진행
-            merged = " ".join([e["excerpt"] for e in evidence])
-            has_target_signal = any(t in merged for t in targets if t != "일반")
-            answerable = len(evidence) >= 3 and has_target_signal
-            return answerable, "heuristic"
+    @staticmethod
+    def _heuristic_answerable(targets: list[str], evidence: list[dict[str, Any]]) -> tuple[bool, str]:
+        # fallback heuristic: 근거가 3개 이상이고 target 키워드가 본문에 있으면 우선 ref 없이 진행
+        # 조문 앞부분(280자)만 보던 기존 판단 범위를 그대로 유지한다
+        merged = " ".join([e["excerpt"][:280] for e in evidence])
+        has_target_signal = any(t in merged for t in targets if t != "일반")
+        answerable = len(evidence) >= 3 and has_target_signal
+        return answerable, "heuristic"
 
-        prompt = (
+    def _answerable_prompt(self, query: str, targets: list[str], contexts: list[dict[str, Any]]) -> str:
+        packed = self._pack("precheck", self._context_evidence(contexts), self.precheck_token_budget)
+        return (
             "너는 법률 QA의 ref 필요성 판단기다.\n"
             "중요: ref 내용을 미리 보지 말고, 현재 컨텍스트만으로 답변 가능한지 판단한다.\n"
             "기준:\n"
@@ -183,25 +353,27 @@ class ZeroHopLawAgent:
             "출력은 JSON만:\n"
             '{"answerable": true/false, "reason": "..."}\n\n'
             f"query: {query}\n"
-            f"targets: {targets}\n"
-            f"current_contexts: {evidence}\n"
+            f"targets: {', '.join(targets)}\n"
+            f"current_contexts:\n{packed.text}\n"
         )
-        raw = self.llm.invoke(prompt)
-        text = getattr(raw, "content", str(raw)).strip()
-        obj: dict[str, Any] = {}
-        try:
-            obj = json.loads(text)
-        except Exception:
-            m = re.search(r"\{[\s\S]*\}", text)
-            if m:
-                try:
-                    obj = json.loads(m.group(0))
-                except Exception:
-                    obj = {}
+
+    def _parse_answerable(self, text: str) -> tuple[bool, str]:
+        obj = self._parse_json_object(text)
         answerable = bool(obj.get("answerable", False))
         reason = str(obj.get("reason", "")).strip() or text[:200]
         return answerable, reason
 
+    def _is_answerable_without_refs(
+        self,
+        query: str,
+        targets: list[str],
+        contexts: list[dict[str, Any]],
+    ) -> tuple[bool, str]:
+        if self.llm is None:
+            return self._heuristic_answerable(targets, self._answerable_evidence(contexts))
+        raw = self._invoke_llm("precheck", self._answerable_prompt(query, targets, contexts))
+        return self._parse_answerable(self._llm_text(raw))
+
     @staticmethod
     def _parse_ref_article(article: str) -> str:
         a = str(article or "").strip()
@@ -250,7 +422,7 @@ class ZeroHopLawAgent:
                         "article": article,
                         "source": "internal",
                         "source_key": source_key,
-                        "source_text": self._normalize_text(c.get("content", ""))[:900],
+                        "source_text": self._normalize_text(c.get("content", "")),
                         "raw": str(r.get("raw", "") or ""),
                         "law_name": str(meta.get("law_name", "") or ""),
                     }
@@ -273,7 +445,7 @@ class ZeroHopLawAgent:
                         "article": article,
                         "source": "external",
                         "source_key": source_key,
-                        "source_text": self._normalize_text(c.get("content", ""))[:900],
+                        "source_text": self._normalize_text(c.get("content", "")),
                         "raw": str(r.get("raw", "") or ""),
                         "law_name": str(r.get("law_name", "") or ""),
                     }
@@ -283,50 +455,195 @@ class ZeroHopLawAgent:
         out.sort(key=lambda x: (0 if x.get("article") else 1, x.get("source") != "internal"))
         return out
 
-    def _should_follow_candidate_without_ref_content(
-        self,
-        query: str,
-        targets: list[str],
-        candidate: dict[str, Any],
-    ) -> tuple[bool, int, str]:
-        source = str(candidate.get("source_text", "") or "")
+    def _heuristic_follow(self, targets: list[str], candidate: dict[str, Any]) -> tuple[bool, int, str]:
+        # fallback: chunk 내 명시 참조가 있고 현재 chunk에 target 키워드가 있으면 follow
+        # source_text는 LLM prompt packing용 전문이므로, 규칙 판단은 기존처럼 앞 900자만 본다
+        source = str(candidate.get("source_text", "") or "")[:900]
         raw_ref = str(candidate.get("raw", "") or "")
-        ref_key = f"{candidate.get('law_id', '')}:{candidate.get('article', '') or '__law__'}"
+        has_target = any(t in source for t in targets if t != "일반")
+        follow = bool(raw_ref) and has_target
+        return follow, (2 if follow else 0), "heuristic_without_ref_content"
 
-        if self.llm is None:
-            # fallback: chunk 내 명시 참조가 있고 현재 chunk에 target 키워드가 있으면 follow
-            has_target = any(t in source for t in targets if t != "일반")
-            follow = bool(raw_ref) and has_target
-            return follow, (2 if follow else 0), "heuristic_without_ref_content"
+    def _candidate_source(self, candidate: dict[str, Any]) -> EvidenceItem:
+        return EvidenceItem(
+            key=str(candidate.get("source_key", "")),
+            header=str(candidate.get("source_key", "")),
+            text=str(candidate.get("source_text", "") or ""),
+            focus=str(candidate.get("raw", "") or ""),
+        )
 
-        prompt = (
+    def _follow_prompt(self, query: str, targets: list[str], candidate: dict[str, Any]) -> str:
+        raw_ref = str(candidate.get("raw", "") or "")
+        ref_key = self._ref_key(candidate)
+        # 참조 문구(raw_ref) 주변이 남도록 현재 chunk를 budget에 맞춰 자른다
+        packed = self._pack("follow_check", [self._candidate_source(candidate)], self.follow_token_budget, max_items=1)
+        return (
             "너는 법률 참조 추적 판단기다.\n"
             "중요: ref 조문 본문은 아직 읽지 않는다. 현재 chunk 맥락만으로 판단한다.\n"
             "출력은 JSON만:\n"
             '{"follow": true/false, "priority": 0|1|2, "reason": "..."}\n\n'
             f"query: {query}\n"
-            f"targets: {targets}\n"
-            f"current_chunk_preview: {source}\n"
+            f"targets: {', '.join(targets)}\n"
+            f"current_chunk_preview:\n{packed.text}\n"
             f"raw_ref: {raw_ref}\n"
             f"ref_key: {ref_key}\n"
         )
-        raw = self.llm.invoke(prompt)
-        text = getattr(raw, "content", str(raw)).strip()
-        obj: dict[str, Any] = {}
+
+    def _parse_follow(self, text: str) -> tuple[bool, int, str]:
+        obj = self._parse_json_object(text)
+        follow = bool(obj.get("follow", obj.get("expand", False)))
+        pri = obj.get("priority", 0)
+        priority = int(pri) if str(pri).isdigit() else 0
+        reason = str(obj.get("reason", "")).strip() or text[:160]
+        return follow, max(0, min(priority, 2)), f"precheck_without_ref_content: {reason}"
+
+    def _should_follow_candidate_without_ref_content(
+        self,
+        query: str,
+        targets: list[str],
+        candidate: dict[str, Any],
+    ) -> tuple[bool, int, str]:
+        if self.llm is None:
+            return self._heuristic_follow(targets, candidate)
+        raw = self._invoke_llm("follow_check", self._follow_prompt(query, targets, candidate))
+        return self._parse_follow(self._llm_text(raw))
+
+    @staticmethod
+    def _ref_key(candidate: dict[str, Any]) -> str:
+        return f"{candidate.get('law_id', '')}:{candidate.get('article', '') or '__law__'}"
+
+    @staticmethod
+    def _parse_decision_records(text: str) -> list[dict[str, Any]]:
+        obj: Any = None
         try:
             obj = json.loads(text)
         except Exception:
-            m = re.search(r"\{[\s\S]*\}", text)
+            m = re.search(r"\[[\s\S]*\]", text)
             if m:
                 try:
                     obj = json.loads(m.group(0))
                 except Exception:
-                    obj = {}
-        follow = bool(obj.get("follow", obj.get("expand", False)))
-        pri = obj.get("priority", 0)
-        priority = int(pri) if str(pri).isdigit() else 0
-        reason = str(obj.get("reason", "")).strip() or text[:160]
-        return follow, max(0, min(priority, 2)), f"precheck_without_ref_content: {reason}"
+                    obj = None
+        if isinstance(obj, dict):
+            obj = obj.get("decisions", obj.get("results"))
+        if not isinstance(obj, list):
+            return []
+        return [r for r in obj if isinstance(r, dict)]
+
+    def _batch_follow_prompt(self, query: str, targets: list[str], candidates: list[dict[str, Any]]) -> str:
+        # 같은 chunk에서 나온 후보가 많으므로 chunk 본문은 한 번만 싣고 후보는 context 번호로 가리킨다
+        sources: dict[str, EvidenceItem] = {}
+        for i, cand in enumerate(candidates):
+            key = str(cand.get("source_key", ""))
+            if key not in sources:
+                source = self._candidate_source(cand)
+                source.score = -i
+                sources[key] = source
+        packed = self._pack("follow_batch", list(sources.values()), self.batch_follow_token_budget)
+        block_of = {key: n for n, key in enumerate(packed.included, start=1)}
+
+        lines = []
+        for i, cand in enumerate(candidates):
+            lines.append(
+                json.dumps(
+                    {
+                        "id": i,
+                        "ref_key": self._ref_key(cand),
+                        "raw_ref": str(cand.get("raw", "") or ""),
+                        "context": block_of.get(str(cand.get("source_key", ""))),
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return (
+            "너는 법률 참조 추적 판단기다.\n"
+            "중요: ref 조문 본문은 아직 읽지 않는다. 각 후보의 현재 chunk 맥락(contexts의 [번호])만으로 판단한다.\n"
+            "후보마다 하나씩, 출력은 JSON 배열만:\n"
+            '[{"id": 0, "ref_key": "...", "follow": true/false, "priority": 0|1|2, "reason": "..."}]\n\n'
+            f"query: {query}\n"
+            f"targets: {', '.join(targets)}\n"
+            f"contexts:\n{packed.text}\n"
+            "candidates:\n" + "\n".join(lines) + "\n"
+        )
+
+    def _parse_batch_decisions(
+        self,
+        text: str,
+        candidates: list[dict[str, Any]],
+    ) -> list[tuple[bool, int, str] | None]:
+        # 응답에서 빠지거나 형식이 틀린 후보는 None
+        decisions: list[tuple[bool, int, str] | None] = [None] * len(candidates)
+        by_key: dict[str, list[int]] = {}
+        for i, cand in enumerate(candidates):
+            by_key.setdefault(self._ref_key(cand), []).append(i)
+
+        for rec in self._parse_decision_records(text):
+            if "follow" not in rec and "expand" not in rec:
+                continue
+            idx = rec.get("id")
+            if not (isinstance(idx, int) and 0 <= idx < len(candidates) and decisions[idx] is None):
+                idx = next((i for i in by_key.get(str(rec.get("ref_key", "")), []) if decisions[i] is None), None)
+            if idx is None:
+                continue
+            pri = rec.get("priority", 0)
+            priority = int(pri) if str(pri).isdigit() else 0
+            reason = str(rec.get("reason", "")).strip()
+            decisions[idx] = (
+                bool(rec.get("follow", rec.get("expand", False))),
+                max(0, min(priority, 2)),
+                f"batch_precheck_without_ref_content: {reason}",
+            )
+        return decisions
+
+    def _batch_follow_decisions(
+        self,
+        query: str,
+        targets: list[str],
+        candidates: list[dict[str, Any]],
+    ) -> list[tuple[bool, int, str] | None]:
+        # 모든 후보를 한 프롬프트로 판단
+        raw = self._invoke_llm("follow_batch", self._batch_follow_prompt(query, targets, candidates))
+        return self._parse_batch_decisions(self._llm_text(raw), candidates)
+
+    def _uses_batch_follow(self, candidates: list[dict[str, Any]]) -> bool:
+        return self.llm is not None and self.ref_check_mode == "batch" and len(candidates) > 1
+
+    def _follow_decisions(
+        self,
+        query: str,
+        targets: list[str],
+        candidates: list[dict[str, Any]],
+    ) -> list[tuple[bool, int, str] | None]:
+        decisions: list[tuple[bool, int, str] | None] = [None] * len(candidates)
+        # batch 판단과 후보별 보완 판단이 ref_check_timeout 하나를 나눠 쓴다
+        deadline = None if self.ref_check_timeout is None else time.monotonic() + self.ref_check_timeout
+        if self._uses_batch_follow(candidates):
+            (batch,) = self._map_concurrently(
+                lambda _: self._batch_follow_decisions(query, targets, candidates),
+                [None],
+                timeout=self.ref_check_timeout,
+            )
+            if batch is None:
+                return decisions
+            decisions = batch
+
+        # batch 응답에 없던 후보만 후보별 판단(동시 실행, 남은 제한 시간)으로 보완
+        missing = [i for i, d in enumerate(decisions) if d is None]
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return decisions
+        fallback = self._map_concurrently(
+            lambda i: self._should_follow_candidate_without_ref_content(
+                query=query,
+                targets=targets,
+                candidate=candidates[i],
+            ),
+            missing,
+            timeout=remaining,
+        )
+        for i, decision in zip(missing, fallback):
+            decisions[i] = decision
+        return decisions
 
     def _retrieve_related_chunks_in_law(
         self,
@@ -335,31 +652,33 @@ class ZeroHopLawAgent:
         law_id: str,
         k: int = 2,
     ) -> list[dict[str, Any]]:
-        qs = [query] + targets + [f"{query} {' '.join(targets)}"]
+        # law_id 조건을 벡터 검색 필터로 넘겨 한 번의 조회로 해당 법 내부 chunk만 받는다
+        q = f"{query} {' '.join(t for t in targets if t != '일반')}".strip()
         dedup: dict[str, dict[str, Any]] = {}
-        for q in qs:
-            for d in self.retriever.similarity_search(q, k=max(6, k * 3)):
-                meta = d.get("metadata", {}) or {}
-                if str(meta.get("law_id", "")).zfill(6) != str(law_id).zfill(6):
-                    continue
-                key = self._chunk_key(meta)
-                if key not in dedup:
-                    dedup[key] = d
-                if len(dedup) >= k:
-                    break
-            if len(dedup) >= k:
-                break
+        for d in self.retriever.similarity_search(q, k=k, law_id=law_id):
+            key = self._chunk_key(d.get("metadata", {}) or {})
+            if key not in dedup:
+                dedup[key] = d
         return list(dedup.values())[:k]
 
-    def _expand_refs_if_needed(
-        self,
-        query: str,
-        targets: list[str],
-        contexts: list[dict[str, Any]],
-        max_ref_expand: int = 4,
-    ) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
-        answerable, reason = self._is_answerable_without_refs(query, targets, contexts)
-        trace: dict[str, Any] = {
+    def _map_concurrently(self, fn, items: list[Any], timeout: float | None = None) -> list[Any]:
+        # 입력 순서대로 결과를 돌려주며, timeout 안에 끝나지 않은 항목은 None
+        if not items:
+            return []
+        if timeout is None and (len(items) == 1 or self.ref_check_concurrency == 1):
+            return [fn(item) for item in items]
+        pool = ThreadPoolExecutor(max_workers=min(self.ref_check_concurrency, len(items)))
+        try:
+            # 요청별 timing 수집기(contextvar)가 작업 스레드에서도 보이도록 context를 복사해 실행
+            futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+            done, _ = wait(futures, timeout=timeout)
+            return [f.result() if f in done else None for f in futures]
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _new_expand_trace(answerable: bool, reason: str) -> dict[str, Any]:
+        return {
             "precheck_answerable": bool(answerable),
             "precheck_reason": reason,
             "candidates_total": 0,
@@ -367,27 +686,23 @@ class ZeroHopLawAgent:
             "expanded_ref_count": 0,
             "follow_checks": [],
         }
-        if answerable:
-            return contexts, f"skip_ref: {reason}", trace
-
-        candidates = self._extract_ref_candidates(contexts)
-        trace["candidates_total"] = len(candidates)
-        if not candidates:
-            return contexts, "no_ref_candidates", trace
-
-        merged: dict[str, dict[str, Any]] = {}
-        for c in contexts:
-            merged[self._chunk_key(c.get("metadata", {}) or {})] = c
 
+    def _collect_followed(
+        self,
+        candidates: list[dict[str, Any]],
+        decisions: list[tuple[bool, int, str] | None],
+        trace: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        # 제한 시간 안에 판단이 끝나지 않은 후보(None)는 follow하지 않는다
         followed: list[dict[str, Any]] = []
-        for cand in candidates:
-            follow, priority, why = self._should_follow_candidate_without_ref_content(
-                query=query,
-                targets=targets,
-                candidate=cand,
-            )
+        timed_out = 0
+        for cand, decision in zip(candidates, decisions):
+            if decision is None:
+                timed_out += 1
+                decision = (False, 0, "precheck_timeout")
+            follow, priority, why = decision
             row = {
-                "ref_key": f"{cand.get('law_id', '')}:{cand.get('article', '') or '__law__'}",
+                "ref_key": self._ref_key(cand),
                 "follow": follow,
                 "priority": priority,
                 "reason": why,
@@ -398,66 +713,108 @@ class ZeroHopLawAgent:
                 cand2["priority"] = priority
                 followed.append(cand2)
 
+        trace["follow_checks_timed_out"] = timed_out
+        trace["ref_check_mode"] = self.ref_check_mode
         trace["candidates_followed"] = len(followed)
-        if not followed:
-            return contexts, "no_followed_ref_candidates", trace
-
         followed.sort(key=lambda x: int(x.get("priority", 0)), reverse=True)
+        return followed
+
+    @staticmethod
+    def _ref_target(cand: dict[str, Any]) -> tuple[str, str]:
+        return str(cand.get("law_id", "")).zfill(6), str(cand.get("article", "")).strip()
+
+    def _merge_fetched(
+        self,
+        merged: dict[str, dict[str, Any]],
+        followed: list[dict[str, Any]],
+        fetched: list[list[dict[str, Any]]],
+        max_ref_expand: int,
+        emit: EventCallback,
+    ) -> int:
+        # 조회는 한꺼번에 하되 병합은 우선순위 순서대로 해서 max_ref_expand 적용 결과를 유지
         used = 0
-        for cand in followed:
+        for cand, docs in zip(followed, fetched):
             if used >= max_ref_expand:
                 break
-            law_id = str(cand.get("law_id", "")).zfill(6)
-            article = str(cand.get("article", "")).strip()
-
-            docs: list[dict[str, Any]] = []
-            if article:
-                docs = self.retriever.get_by_exact(law_id=law_id, article_num=article)
-            else:
-                # 법 전체 ref이면 해당 법 내부에서 query+target 기반으로만 부분 검색
-                docs = self._retrieve_related_chunks_in_law(query=query, targets=targets, law_id=law_id, k=2)
-
             if not docs:
                 continue
 
+            added = 0
             for d in docs:
                 key = self._chunk_key(d.get("metadata", {}) or {})
                 if key not in merged:
-                    merged[key] = d
+                    merged[key] = {**d, "ref_priority": int(cand.get("priority", 0))}
+                    added += 1
             used += 1
+            emit("ref_expanded", {"ref_key": self._ref_key(cand), "priority": cand.get("priority", 0), "added": added})
+        return used
 
-        trace["expanded_ref_count"] = used
-        return list(merged.values()), f"expanded_ref_count={used}", trace
+    def _expand_refs_if_needed(
+        self,
+        query: str,
+        targets: list[str],
+        contexts: list[dict[str, Any]],
+        max_ref_expand: int = 4,
+        emit: EventCallback = _noop_emit,
+    ) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
+        with stage("precheck"):
+            answerable, reason = self._is_answerable_without_refs(query, targets, contexts)
+        emit("precheck", {"answerable": bool(answerable), "reason": reason})
+        trace = self._new_expand_trace(answerable, reason)
+        if answerable:
+            return contexts, f"skip_ref: {reason}", trace
 
-    def _build_answer(self, query: str, targets: list[str], refs: list[dict[str, Any]]) -> str:
-        evidence = []
-        for r in refs[:5]:
-            evidence.append(
-                {
-                    "law": r.get("law_name"),
-                    "section": r.get("section"),
-                    "excerpt": self._normalize_text(r.get("full_text", ""))[:420],
-                }
-            )
+        candidates = self._extract_ref_candidates(contexts)
+        trace["candidates_total"] = len(candidates)
+        if not candidates:
+            return contexts, "no_ref_candidates", trace
 
-        appendix_terms = self.appendix.lookup(" ".join(targets), top_k=3)
-        appendix_short = [
-            {
-                "category": t.get("category"),
-                "subcategory": t.get("subcategory"),
-                "description": str(t.get("description", ""))[:120],
-            }
-            for t in appendix_terms
-        ]
+        merged: dict[str, dict[str, Any]] = {}
+        for c in contexts:
+            merged[self._chunk_key(c.get("metadata", {}) or {})] = c
 
+        with stage("follow_checks"):
+            decisions = self._follow_decisions(query, targets, candidates)
+        followed = self._collect_followed(candidates, decisions, trace)
+        if not followed:
+            return contexts, "no_followed_ref_candidates", trace
+
+        # 조항 지정 ref는 get_many_exact 한 번으로, 법 전체 ref는 법 내부 검색을 병렬로
+        targets_by_cand = [self._ref_target(c) for c in followed]
+        with stage("ref_fetch"):
+            exact = self.retriever.get_many_exact([t for t in targets_by_cand if t[1]])
+            law_wide = list(dict.fromkeys(law_id for law_id, article in targets_by_cand if not article))
+            related = dict(
+                zip(
+                    law_wide,
+                    self._map_concurrently(
+                        lambda law_id: self._retrieve_related_chunks_in_law(query=query, targets=targets, law_id=law_id, k=2),
+                        law_wide,
+                    ),
+                )
+            )
+        fetched = [exact[t] if t[1] else related[t[0]] for t in targets_by_cand]
+        used = self._merge_fetched(merged, followed, fetched, max_ref_expand, emit)
+        trace["expanded_ref_count"] = used
+        return list(merged.values()), f"expanded_ref_count={used}", trace
+
+    def _answer_prompt(self, query: str, targets: list[str], refs: list[dict[str, Any]]) -> tuple[str, bool]:
+        # (prompt, is_llm_prompt); LLM이 없으면 규칙 기반 답변 본문을 그대로 돌려준다
         if self.llm is None:
-            grounds = "\n".join([f"- {e['law']} {e['section']}" for e in evidence])
+            grounds = "\n".join([f"- {r.get('law_name')} {r.get('section')}" for r in refs[:5]])
             return (
                 f"질문: {query}\n"
                 f"추출 타깃: {', '.join(targets)}\n"
                 f"0-hop 근거 조항:\n{grounds}\n"
                 "답변: 상기 조항을 기준으로 검토가 필요합니다."
-            )
+            ), False
+
+        appendix_terms = self.appendix.lookup(" ".join(targets), top_k=3)
+        appendix_lines = "\n".join(
+            f"- {t.get('category')}/{t.get('subcategory')}: {str(t.get('description', ''))[:120]}" for t in appendix_terms
+        )
+        # 검색 순위와 ref priority 순으로 budget을 채우고, 중복 조문은 한 번만 싣는다
+        packed = self._pack("answer", self._reference_evidence(refs), self.answer_token_budget)
 
         prompt = (
             "너는 건축법률 QA 시스템의 0-hop 답변 생성기다.\n"
@@ -466,40 +823,205 @@ class ZeroHopLawAgent:
             "출력 형식:\n"
             "1) 질문 요약\n2) 적용 근거\n3) 판단\n4) 추가 필요조건\n\n"
             f"query: {query}\n"
-            f"targets: {targets}\n"
-            f"appendix_terms: {appendix_short}\n"
-            f"evidence: {evidence}\n"
+            f"targets: {', '.join(targets)}\n"
+            f"appendix_terms:\n{appendix_lines}\n"
+            f"evidence:\n{packed.text}\n"
         )
-        response = self.llm.invoke(prompt)
+        return prompt, True
+
+    def _build_answer(self, query: str, targets: list[str], refs: list[dict[str, Any]]) -> str:
+        prompt, use_llm = self._answer_prompt(query, targets, refs)
+        if not use_llm:
+            return prompt
+        response = self._invoke_llm("answer", prompt)
         return getattr(response, "content", str(response))
 
-    def ask(self, query: str, k: int = 5) -> ZeroHopResult:
-        steps = [
-            "질문을 분류하고 있습니다...",
-            "0-hop 관련 문서를 찾고 있습니다...",
-            "현재 근거만으로 답변 가능한지 판단하고 있습니다...",
-            "필요한 경우에만 참조 법령/조항을 확장하고 있습니다...",
-            "관련 법/조항을 정리하고 있습니다...",
-            "최종 답변을 생성하고 있습니다...",
-        ]
-        targets = self.extract_targets(query)
-        base_contexts = self.retrieve_zero_hop(query=query, targets=targets, k=k)
-        contexts, expand_reason, trace = self._expand_refs_if_needed(
-            query=query,
-            targets=targets,
-            contexts=base_contexts,
-        )
-        refs = self._build_references(contexts)
-        answer = self._build_answer(query=query, targets=targets, refs=refs)
+    def _stream_answer(self, query: str, targets: list[str], refs: list[dict[str, Any]]) -> Iterator[str]:
+        prompt, use_llm = self._answer_prompt(query, targets, refs)
+        if not use_llm:
+            yield prompt
+            return
+        if not hasattr(self.llm, "stream"):
+            response = self._invoke_llm("answer", prompt)
+            yield getattr(response, "content", str(response))
+            return
+        parts: list[str] = []
+        with timed_call("llm", "answer_stream"):
+            for chunk in self.llm.stream(prompt):
+                text = getattr(chunk, "content", chunk)
+                if text:
+                    parts.append(str(text))
+                    yield str(text)
+        record_llm_sizes("answer_stream", prompt, "".join(parts))
+
+    def warm_up(self, query: str = "건축선") -> dict[str, float]:
+        """Embed one query and run one Qdrant search so the first request does not pay for cold connections."""
+        steps: dict[str, float] = {}
+        for name, fn in (
+            ("embedding", lambda: self.retriever.embed_query(query)),
+            ("qdrant", lambda: self.retriever.similarity_search_many([query], k=1)),
+            ("appendix", lambda: self.appendix.lookup(query, top_k=1)),
+        ):
+            start = time.perf_counter()
+            fn()
+            steps[name] = round((time.perf_counter() - start) * 1000, 3)
+        return steps
+
+    def ask(self, query: str, k: int = 5, emit: EventCallback | None = None) -> ZeroHopResult:
+        # 단계/외부 호출별 시간·횟수·크기를 trace["timings"]에 담고 /metrics 히스토그램에도 누적
+        with collect_timings() as timings:
+            result = self._ask_cached(query, k, emit=emit)
+        return replace(result, trace={**result.trace, "timings": timings.as_dict()})
+
+    def _ask_cached(self, query: str, k: int = 5, emit: EventCallback | None = None) -> ZeroHopResult:
+        if self.answer_cache is None:
+            return self._ask_uncached(query, k, emit=emit)
+
+        # 적재 시 기록된 index version이 바뀌면 캐시가 통째로 비워진다
+        version = self.index_version.current()
+        with stage("answer_cache"):
+            cached, status = self.answer_cache.get(query, k, self.answer_model, version, embed=self.retriever.embed_query)
+        record_cache("answer", status)
+        if cached is not None:
+            if emit is not None:
+                emit("targets", {"targets": cached.targets, "answer_cache": status})
+                emit("references", {"references": cached.references})
+                emit("token", {"text": cached.answer})
+            return replace(cached, trace={**cached.trace, "answer_cache": status})
+
+        result = self._ask_uncached(query, k, emit=emit)
+        result.trace["answer_cache"] = "miss"
+        if not result.degraded:
+            self.answer_cache.put(query, k, self.answer_model, version, result, embed=self.retriever.embed_query)
+        return result
+
+    def ask_stream(
+        self,
+        query: str,
+        k: int = 5,
+        stop: threading.Event | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        # 파이프라인은 별도 스레드에서 돌리고, 단계 이벤트와 답변 token을 발생 즉시 (event, data)로 내보낸다
+        # stop이 set되거나 generator가 닫히면 스레드는 다음 이벤트/token 시점에 중단된다
+        events: queue.Queue = queue.Queue()
+        stop = stop or threading.Event()
+        self.start_stream(query, events.put, k=k, stop=stop)
+        try:
+            while True:
+                item = events.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    def start_stream(
+        self,
+        query: str,
+        sink: Callable[[tuple[str, dict[str, Any]] | None], None],
+        k: int = 5,
+        stop: threading.Event | None = None,
+    ) -> threading.Event:
+        """Run ask in a worker thread, passing each (event, data) to sink and None when finished.
+
+        Returns the stop event; setting it cancels the pipeline at its next event or token.
+        """
+        stop = stop or threading.Event()
+
+        def _emit(event: str, data: dict[str, Any]) -> None:
+            if stop.is_set():
+                raise StreamCancelled()
+            sink((event, data))
+
+        def _run() -> None:
+            try:
+                result = self.ask(query, k=k, emit=_emit)
+                sink(
+                    (
+                        "done",
+                        {
+                            "answer": result.answer,
+                            "targets": result.targets,
+                            "steps": result.steps,
+                            "references": result.references,
+                            "contexts_count": result.contexts_count,
+                            "trace": result.trace,
+                        },
+                    )
+                )
+            except StreamCancelled:
+                pass
+            except Exception as exc:
+                sink(("error", {"detail": f"ask failed: {exc}"}))
+            finally:
+                sink(None)
+
+        threading.Thread(target=_run, daemon=True).start()
+        return stop
+
+    def ask_many(
+        self,
+        queries: list[str],
+        k: int = 5,
+        max_concurrency: int = 8,
+    ) -> Iterator[tuple[int, ZeroHopResult | None, str | None]]:
+        """Answer many questions sharing retrieval work; yields (index, result, error) in completion order."""
+        # 배치 경로(질의 변형/조문 조회 묶음, LLM 동시 실행 제한)는 비동기 agent가 담당
+        from architecture_agent.service.zero_hop_async import AsyncZeroHopLawAgent
+
+        return AsyncZeroHopLawAgent.from_agent(self).ask_many(queries, k=k, max_concurrency=max_concurrency)
+
+    def _make_result(
+        self,
+        targets: list[str],
+        base_contexts: list[dict[str, Any]],
+        contexts: list[dict[str, Any]],
+        expand_reason: str,
+        trace: dict[str, Any],
+        refs: list[dict[str, Any]],
+        answer: str,
+    ) -> ZeroHopResult:
         trace["expand_reason"] = expand_reason
         trace["base_contexts_count"] = len(base_contexts)
         trace["final_contexts_count"] = len(contexts)
+        trace["query_embedding_cache"] = self.retriever.embedding_cache_stats()
+        degraded = self.llm is None or trace.get("follow_checks_timed_out", 0) > 0
+        trace["degraded"] = degraded
 
         return ZeroHopResult(
             answer=answer,
             targets=targets,
-            steps=steps,
+            steps=list(ASK_STEPS),
             references=refs,
             contexts_count=len(contexts),
             trace=trace,
+            degraded=degraded,
+        )
+
+    def _ask_uncached(self, query: str, k: int = 5, emit: EventCallback | None = None) -> ZeroHopResult:
+        emit = emit or _noop_emit
+        with stage("targets"):
+            targets = self.extract_targets(query)
+        emit("targets", {"targets": targets})
+        with stage("retrieve"):
+            base_contexts = self.retrieve_zero_hop(query=query, targets=targets, k=k)
+        emit("contexts", {"count": len(base_contexts)})
+        contexts, expand_reason, trace = self._expand_refs_if_needed(
+            query=query,
+            targets=targets,
+            contexts=base_contexts,
+            emit=emit,
         )
+        with stage("references"):
+            refs = self._build_references(contexts)
+        emit("references", {"references": refs})
+        with stage("answer"):
+            if emit is _noop_emit:
+                answer = self._build_answer(query=query, targets=targets, refs=refs)
+            else:
+                parts = []
+                for token in self._stream_answer(query=query, targets=targets, refs=refs):
+                    parts.append(token)
+                    emit("token", {"text": token})
+                answer = "".join(parts)
+        return self._make_result(targets, base_contexts, contexts, expand_reason, trace, refs, answer)
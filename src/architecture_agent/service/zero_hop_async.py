@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import aclosing
+from dataclasses import replace
+from typing import Any, AsyncIterator, Iterator
+
+from architecture_agent.metrics import CALL_ERRORS, collect_timings, record_cache, record_llm_sizes, stage, timed_call
+from architecture_agent.service.answer_cache import normalize_query
+from architecture_agent.service.zero_hop import ZeroHopLawAgent, ZeroHopResult
+
+logger = logging.getLogger(__name__)
+
+BatchItem = tuple[int, ZeroHopResult | None, str | None]
+
+_SYNC_LOOP_LOCK = threading.Lock()
+
+
+class _LoopThread:
+    # 동기 호출용 event loop 하나를 agent 수명 동안 유지 (async Qdrant/LLM client는 처음 쓴 loop에 묶인다)
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="zero-hop-sync-loop", daemon=True).start()
+
+    def start(self, coro) -> asyncio.Task:
+        started: Future = Future()
+
+        def _create() -> None:
+            try:
+                started.set_result(self.loop.create_task(coro))
+            except BaseException as exc:
+                started.set_exception(exc)
+
+        self.loop.call_soon_threadsafe(_create)
+        return started.result()
+
+    def cancel(self, task: asyncio.Task) -> None:
+        self.loop.call_soon_threadsafe(task.cancel)
+
+
+def _fail_pending(futures: dict, keys: list, exc: BaseException) -> None:
+    # 아직 결과가 없는 future를 빼고 실패시킨다; 이미 기다리는 쪽은 같은 예외를 받고 다음 조회는 새로 시작한다
+    for key in keys:
+        future = futures.get(key)
+        if future is None or future.done():
+            continue
+        del futures[key]
+        if isinstance(exc, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(exc)
+            # 기다리는 쪽이 없어도 "exception was never retrieved" 경고를 남기지 않도록 회수 표시
+            future.exception()
+
+
+class _BatchRetriever:
+    # 배치 한 번 동안만 쓰는 retriever 래퍼: 질의 검색은 미리 묶어서 가져오고, 같은 조회는 한 번만 수행
+    def __init__(self, retriever, search_batch_size: int = 64, exact_batch_window: float = 0.005):
+        self._retriever = retriever
+        self.search_batch_size = max(1, search_batch_size)
+        self.exact_batch_window = exact_batch_window
+        self._searches: dict[tuple, asyncio.Future] = {}
+        self._exact: dict[tuple[str, str], asyncio.Future] = {}
+        self._exact_queue: list[tuple[str, str]] = []
+        self._exact_flush: asyncio.Task | None = None
+        self.search_calls = 0
+        self.exact_calls = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self._retriever, name)
+
+    @staticmethod
+    def _search_key(query: str, k: int, filters: dict[str, Any]) -> tuple:
+        return (query, k, tuple(sorted((f, v) for f, v in filters.items() if v)))
+
+    async def prefetch(self, queries: list[str], k: int, **filters: Any) -> None:
+        loop = asyncio.get_running_loop()
+        pending: list[str] = []
+        for q in dict.fromkeys(queries):
+            key = self._search_key(q, k, filters)
+            if key not in self._searches:
+                self._searches[key] = loop.create_future()
+                pending.append(q)
+        try:
+            for start in range(0, len(pending), self.search_batch_size):
+                chunk = pending[start : start + self.search_batch_size]
+                self.search_calls += 1
+                hit_lists = await self._retriever.asimilarity_search_many(chunk, k=k, **filters)
+                for q, hits in zip(chunk, hit_lists):
+                    self._searches[self._search_key(q, k, filters)].set_result(hits)
+        except BaseException as exc:
+            # 실패한 chunk뿐 아니라 아직 조회하지 않은 뒤쪽 chunk의 future도 모두 정리해야
+            # 질문별 재조회가 끝나지 않는 future를 기다리지 않는다
+            _fail_pending(self._searches, [self._search_key(q, k, filters) for q in pending], exc)
+            raise
+
+    async def asimilarity_search_many(self, queries: list[str], k: int = 6, **filters: Any) -> list[list[dict]]:
+        await self.prefetch(queries, k, **filters)
+        futures = [self._searches[self._search_key(q, k, filters)] for q in queries]
+        return [await future for future in futures]
+
+    async def asimilarity_search(self, query: str, k: int = 6, **filters: Any) -> list[dict]:
+        return (await self.asimilarity_search_many([query], k=k, **filters))[0]
+
+    async def aget_many_exact(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        loop = asyncio.get_running_loop()
+        keys = list(dict.fromkeys((str(law_id), str(article_num)) for law_id, article_num in keys))
+        for key in keys:
+            if key not in self._exact:
+                self._exact[key] = loop.create_future()
+                self._exact_queue.append(key)
+        if self._exact_queue and self._exact_flush is None:
+            self._exact_flush = asyncio.ensure_future(self._flush_exact())
+        futures = {key: self._exact[key] for key in keys}
+        return {key: await future for key, future in futures.items()}
+
+    async def _flush_exact(self) -> None:
+        # 잠시 기다려 비슷한 시점에 ref_fetch에 들어온 다른 질문의 조문 키까지 모아 한 번에 조회
+        await asyncio.sleep(self.exact_batch_window)
+        pending, self._exact_queue, self._exact_flush = self._exact_queue, [], None
+        self.exact_calls += 1
+        try:
+            found = await self._retriever.aget_many_exact(pending)
+        except BaseException as exc:
+            _fail_pending(self._exact, pending, exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for key in pending:
+            self._exact[key].set_result(found.get(key, []))
+
+    async def aget_by_exact(self, law_id: str, article_num: str) -> list[dict]:
+        return (await self.aget_many_exact([(law_id, article_num)]))[(str(law_id), str(article_num))]
+
+
+class AsyncZeroHopLawAgent(ZeroHopLawAgent):
+    # ZeroHopLawAgent와 같은 판단/프롬프트를 쓰되 Qdrant·임베딩·LLM I/O를 await로 처리
+    @classmethod
+    def from_agent(cls, agent: ZeroHopLawAgent) -> AsyncZeroHopLawAgent:
+        # 이미 만든 동기 agent의 retriever/LLM/캐시를 그대로 공유하는 비동기 view
+        if isinstance(agent, cls):
+            return agent
+        view = cls.__new__(cls)
+        # 같은 __dict__를 써서 원본 agent 설정 변경과 동기 호출용 loop를 함께 공유
+        view.__dict__ = agent.__dict__
+        return view
+
+    def _sync_loop(self) -> _LoopThread:
+        with _SYNC_LOOP_LOCK:
+            runner = self.__dict__.get("_sync_loop_thread")
+            if runner is None:
+                runner = self._sync_loop_thread = _LoopThread()
+        return runner
+
+    async def _allm_text(self, prompt: str, op: str) -> str:
+        with timed_call("llm", op):
+            if hasattr(self.llm, "ainvoke"):
+                raw = await self.llm.ainvoke(prompt)
+            else:
+                raw = await asyncio.to_thread(self.llm.invoke, prompt)
+        text = self._llm_text(raw)
+        record_llm_sizes(op, prompt, text)
+        return text
+
+    async def aretrieve_zero_hop(self, query: str, targets: list[str], k: int) -> list[dict[str, Any]]:
+        per_query_k = max(k, 4)
+        hit_lists = await self.retriever.asimilarity_search_many(self._zero_hop_queries(query, targets), k=per_query_k)
+        dedup = self._dedup_hits(hit_lists)
+
+        out = list(dedup.values())
+        if len(out) < k:
+            backfill = await self.retriever.asimilarity_search_many(self._backfill_queries(query), k=max(k * 2, 8))
+            self._apply_backfill(out, dedup, backfill, k)
+
+        return out[:k]
+
+    async def _ais_answerable_without_refs(
+        self,
+        query: str,
+        targets: list[str],
+        contexts: list[dict[str, Any]],
+    ) -> tuple[bool, str]:
+        if self.llm is None:
+            return self._heuristic_answerable(targets, self._answerable_evidence(contexts))
+        return self._parse_answerable(await self._allm_text(self._answerable_prompt(query, targets, contexts), "precheck"))
+
+    async def _ashould_follow(
+        self,
+        query: str,
+        targets: list[str],
+        candidate: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[bool, int, str]:
+        if self.llm is None:
+            return self._heuristic_follow(targets, candidate)
+        async with semaphore:
+            text = await self._allm_text(self._follow_prompt(query, targets, candidate), "follow_check")
+        return self._parse_follow(text)
+
+    async def _afollow_decisions(
+        self,
+        query: str,
+        targets: list[str],
+        candidates: list[dict[str, Any]],
+    ) -> list[tuple[bool, int, str] | None]:
+        decisions: list[tuple[bool, int, str] | None] = [None] * len(candidates)
+        loop = asyncio.get_running_loop()
+        # batch 판단과 후보별 보완 판단이 ref_check_timeout 하나를 나눠 쓴다
+        deadline = None if self.ref_check_timeout is None else loop.time() + self.ref_check_timeout
+        if self._uses_batch_follow(candidates):
+            prompt = self._batch_follow_prompt(query, targets, candidates)
+            try:
+                text = await asyncio.wait_for(self._allm_text(prompt, "follow_batch"), timeout=self.ref_check_timeout)
+            except asyncio.TimeoutError:
+                return decisions
+            decisions = self._parse_batch_decisions(text, candidates)
+
+        missing = [i for i, d in enumerate(decisions) if d is None]
+        remaining = None if deadline is None else deadline - loop.time()
+        if not missing or (remaining is not None and remaining <= 0):
+            return decisions
+        semaphore = asyncio.Semaphore(self.ref_check_concurrency)
+        tasks = [asyncio.ensure_future(self._ashould_follow(query, targets, candidates[i], semaphore)) for i in missing]
+        done, pending = await asyncio.wait(tasks, timeout=remaining)
+        for task in pending:
+            task.cancel()
+        for i, task in zip(missing, tasks):
+            # 제한 시간 안에 끝나지 않은 후보는 None으로 남겨 follow하지 않는다
+            decisions[i] = task.result() if task in done else None
+        return decisions
+
+    async def _aretrieve_related_chunks_in_law(
+        self,
+        query: str,
+        targets: list[str],
+        law_id: str,
+        k: int = 2,
+    ) -> list[dict[str, Any]]:
+        q = f"{query} {' '.join(t for t in targets if t != '일반')}".strip()
+        dedup = self._dedup_hits([await self.retriever.asimilarity_search(q, k=k, law_id=law_id)])
+        return list(dedup.values())[:k]
+
+    async def _aexpand_refs_if_needed(
+        self,
+        query: str,
+        targets: list[str],
+        contexts: list[dict[str, Any]],
+        max_ref_expand: int = 4,
+    ) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
+        with stage("precheck"):
+            answerable, reason = await self._ais_answerable_without_refs(query, targets, contexts)
+        trace = self._new_expand_trace(answerable, reason)
+        if answerable:
+            return contexts, f"skip_ref: {reason}", trace
+
+        candidates = self._extract_ref_candidates(contexts)
+        trace["candidates_total"] = len(candidates)
+        if not candidates:
+            return contexts, "no_ref_candidates", trace
+
+        merged: dict[str, dict[str, Any]] = {}
+        for c in contexts:
+            merged[self._chunk_key(c.get("metadata", {}) or {})] = c
+
+        with stage("follow_checks"):
+            decisions = await self._afollow_decisions(query, targets, candidates)
+        followed = self._collect_followed(candidates, decisions, trace)
+        if not followed:
+            return contexts, "no_followed_ref_candidates", trace
+
+        targets_by_cand = [self._ref_target(c) for c in followed]
+        law_wide = list(dict.fromkeys(law_id for law_id, article in targets_by_cand if not article))
+        with stage("ref_fetch"):
+            exact, related_lists = await asyncio.gather(
+                self.retriever.aget_many_exact([t for t in targets_by_cand if t[1]]),
+                asyncio.gather(
+                    *(
+                        self._aretrieve_related_chunks_in_law(query=query, targets=targets, law_id=law_id, k=2)
+                        for law_id in law_wide
+                    )
+                ),
+            )
+        related = dict(zip(law_wide, related_lists))
+        fetched = [exact[t] if t[1] else related[t[0]] for t in targets_by_cand]
+        used = self._merge_fetched(merged, followed, fetched, max_ref_expand, lambda *_: None)
+        trace["expanded_ref_count"] = used
+        return list(merged.values()), f"expanded_ref_count={used}", trace
+
+    async def _abuild_answer(self, query: str, targets: list[str], refs: list[dict[str, Any]]) -> str:
+        prompt, use_llm = self._answer_prompt(query, targets, refs)
+        if not use_llm:
+            return prompt
+        return await self._allm_text(prompt, "answer")
+
+    async def _aask_uncached(self, query: str, k: int = 5) -> ZeroHopResult:
+        with stage("targets"):
+            targets = self.extract_targets(query)
+        with stage("retrieve"):
+            base_contexts = await self.aretrieve_zero_hop(query=query, targets=targets, k=k)
+        contexts, expand_reason, trace = await self._aexpand_refs_if_needed(
+            query=query,
+            targets=targets,
+            contexts=base_contexts,
+        )
+        with stage("references"):
+            refs = self._build_references(contexts)
+        with stage("answer"):
+            answer = await self._abuild_answer(query=query, targets=targets, refs=refs)
+        return self._make_result(targets, base_contexts, contexts, expand_reason, trace, refs, answer)
+
+    async def aask(self, query: str, k: int = 5) -> ZeroHopResult:
+        with collect_timings() as timings:
+            result = await self._aask_cached(query, k)
+        return replace(result, trace={**result.trace, "timings": timings.as_dict()})
+
+    async def _aask_cached(self, query: str, k: int = 5) -> ZeroHopResult:
+        if self.answer_cache is None:
+            return await self._aask_uncached(query, k)
+
+        version = self.index_version.current()
+        with stage("answer_cache"):
+            embed = None
+            if self.answer_cache.similarity_threshold is not None:
+                vector = await self.retriever.aembed_query(normalize_query(query))
+                embed = lambda _text: vector  # noqa: E731
+            cached, status = self.answer_cache.get(query, k, self.answer_model, version, embed=embed)
+        record_cache("answer", status)
+        if cached is not None:
+            return replace(cached, trace={**cached.trace, "answer_cache": status})
+
+        result = await self._aask_uncached(query, k)
+        result.trace["answer_cache"] = "miss"
+        if not result.degraded:
+            self.answer_cache.put(query, k, self.answer_model, version, result, embed=embed)
+        return result
+
+    async def _aprefetch_batch(self, batch: _BatchRetriever, queries: list[str], k: int) -> None:
+        # 1) 전체 질문의 질의 변형을 중복 제거해 한꺼번에 임베딩/검색
+        per_query_k = max(k, 4)
+        variants = {q: self._zero_hop_queries(q, self.extract_targets(q)) for q in queries}
+        await batch.prefetch([v for vs in variants.values() for v in vs], per_query_k)
+
+        # 2) 결과가 k개 미만인 질문의 backfill 질의도 모아서 한 번에
+        backfills: list[str] = []
+        for q, vs in variants.items():
+            hit_lists = await batch.asimilarity_search_many(vs, k=per_query_k)
+            if len(self._dedup_hits(hit_lists)) < k:
+                backfills.extend(self._backfill_queries(q))
+        await batch.prefetch(backfills, max(k * 2, 8))
+
+    async def aask_many(
+        self,
+        queries: list[str],
+        k: int = 5,
+        max_concurrency: int = 8,
+    ) -> AsyncIterator[BatchItem]:
+        """Answer many questions, yielding (index, result, error) in completion order."""
+        batch = _BatchRetriever(self.retriever)
+        worker = copy.copy(self)
+        worker.retriever = batch
+
+        normalized = [normalize_query(q) for q in queries]
+        unique = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        try:
+            await self._aprefetch_batch(batch, unique, k)
+        except Exception:
+            # 미리 가져오기에 실패해도 질문별 경로에서 다시 조회하고 오류는 항목별로 보고한다
+            CALL_ERRORS.inc("batch", "prefetch")
+            logger.warning("batch prefetch failed; falling back to per-question retrieval", exc_info=True)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        shared: dict[str, asyncio.Task] = {}
+
+        async def _answer(query: str) -> ZeroHopResult:
+            async with semaphore:
+                return await worker.aask(query, k=k)
+
+        async def _run(index: int) -> BatchItem:
+            query = queries[index].strip()
+            if not query:
+                return index, None, "empty query"
+            # 같은 질문은 한 번만 계산해 결과를 공유
+            task = shared.get(normalized[index])
+            if task is None:
+                task = asyncio.ensure_future(_answer(query))
+                shared[normalized[index]] = task
+            try:
+                return index, await asyncio.shield(task), None
+            except Exception as exc:
+                return index, None, f"ask failed: {exc}"
+
+        runs = [asyncio.ensure_future(_run(i)) for i in range(len(queries))]
+        try:
+            for next_done in asyncio.as_completed(runs):
+                yield await next_done
+        finally:
+            # 소비자가 떠나면(aclose/취소) 남은 질문의 LLM·검색을 멈추고 끝날 때까지 기다린 뒤 반환해
+            # 호출자가 admission 자리를 돌려줄 때 실제로 돌고 있는 작업이 없게 한다
+            outstanding = [t for t in (*runs, *shared.values(), batch._exact_flush) if t is not None and not t.done()]
+            for task in outstanding:
+                task.cancel()
+            if outstanding:
+                await asyncio.gather(*outstanding, return_exceptions=True)
+
+    def ask_many(self, queries: list[str], k: int = 5, max_concurrency: int = 8) -> Iterator[BatchItem]:
+        # 동기 호출용: agent 전용 event loop에서 aask_many를 돌리며 완료 순서대로 내보낸다
+        runner = self._sync_loop()
+        items: queue.Queue = queue.Queue()
+
+        async def _drain() -> None:
+            async with aclosing(self.aask_many(queries, k=k, max_concurrency=max_concurrency)) as results:
+                async for item in results:
+                    items.put(item)
+
+        task = runner.start(_drain())
+        task.add_done_callback(lambda _task: items.put(None))
+        finished = False
+        try:
+            while True:
+                item = items.get()
+                if item is None:
+                    finished = True
+                    break
+                yield item
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        finally:
+            if not finished:
+                # 호출자가 중간에 멈추면 남은 질문을 취소하고 aask_many 정리가 끝날 때까지 기다린다
+                runner.cancel(task)
+                while items.get() is not None:
+                    pass
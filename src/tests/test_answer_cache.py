@@ -0,0 +1,67 @@
+import os
+
+from architecture_agent.ingestion.index_version import IndexVersionWatcher, read_index_version, write_index_version
+from architecture_agent.service.answer_cache import AnswerCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_answer_cache_keys_on_normalized_query_k_model_and_version():
+    cache = AnswerCache(max_entries=2, ttl_seconds=None)
+    cache.put("건폐율  기준", 5, "HCX-005", "v1", "answer-1")
+
+    assert cache.get(" 건폐율 기준", 5, "HCX-005", "v1") == ("answer-1", "hit")
+    assert cache.get("건폐율 기준", 3, "HCX-005", "v1") == (None, "miss")
+    assert cache.get("건폐율 기준", 5, "HCX-007", "v1") == (None, "miss")
+
+    # 재적재로 version이 바뀌면 이전 항목은 모두 무효화
+    assert cache.get("건폐율 기준", 5, "HCX-005", "v2") == (None, "miss")
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_answer_cache_ttl_and_size_eviction():
+    clock = FakeClock()
+    cache = AnswerCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", 5, "m", "v", 1)
+    cache.put("b", 5, "m", "v", 2)
+    cache.get("a", 5, "m", "v")
+    cache.put("c", 5, "m", "v", 3)  # 가장 오래 안 쓴 b 제거
+    assert cache.get("b", 5, "m", "v")[0] is None
+    assert cache.get("a", 5, "m", "v")[0] == 1
+
+    clock.now = 11
+    assert cache.get("a", 5, "m", "v") == (None, "miss")
+
+
+def test_answer_cache_near_duplicate_hit_by_embedding_similarity():
+    vectors = {"주차대수 산정": [1.0, 0.0], "주차대수 산정 방법": [0.99, 0.05], "용적률": [0.0, 1.0]}
+    cache = AnswerCache(ttl_seconds=None, similarity_threshold=0.95)
+    cache.put("주차대수 산정", 5, "m", "v", "parking", embed=vectors.__getitem__)
+
+    assert cache.get("주차대수 산정 방법", 5, "m", "v", embed=vectors.__getitem__) == ("parking", "near_hit")
+    assert cache.get("용적률", 5, "m", "v", embed=vectors.__getitem__) == (None, "miss")
+    assert cache.stats()["near_hits"] == 1
+
+
+def test_index_version_only_changes_when_index_changes(tmp_path):
+    path = str(tmp_path / "index_version.json")
+    watcher = IndexVersionWatcher(path)
+    assert watcher.current() == ""
+
+    v1 = write_index_version("building_law", index_diff=None, output_path=path)
+    assert watcher.current() == v1 == read_index_version(path)
+
+    unchanged = {"created": 0, "updated": 0, "unchanged": 10, "deleted": 0}
+    assert write_index_version("building_law", index_diff=unchanged, output_path=path) == v1
+
+    v2 = write_index_version("building_law", index_diff={**unchanged, "updated": 1}, output_path=path)
+    assert v2 != v1
+    os.utime(path, ns=(1, 1))
+    assert watcher.current() == v2
@@ -0,0 +1,94 @@
+import pytest
+
+from architecture_agent.api.responses import parse_fields, select_fields
+from architecture_agent.service.zero_hop import ZeroHopResult
+
+
+def test_parse_and_select_nested_fields():
+    spec = parse_fields("answer, references.section,references.law_name,trace,trace.timings")
+    assert spec == {"answer": None, "references": {"section": None, "law_name": None}, "trace": None}
+
+    payload = {
+        "answer": "a",
+        "targets": ["건축선"],
+        "references": [
+            {"section": "제46조", "law_name": "건축법", "full_text": "긴 본문"},
+            {"section": "제31조", "law_name": "건축법 시행령", "full_text": "긴 본문"},
+        ],
+        "trace": {"follow_checks": []},
+    }
+    assert select_fields(payload, spec) == {
+        "answer": "a",
+        "references": [
+            {"section": "제46조", "law_name": "건축법"},
+            {"section": "제31조", "law_name": "건축법 시행령"},
+        ],
+        "trace": {"follow_checks": []},
+    }
+    assert select_fields(payload, parse_fields("")) is payload
+
+
+class FakeAsyncAgent:
+    async def aask(self, query: str, k: int = 5) -> ZeroHopResult:
+        refs = [
+            {"section": f"제{i}조", "law_name": "건축법", "full_text": "건축선 기준 본문 " * 100, "content_preview": "건축선"}
+            for i in range(5)
+        ]
+        return ZeroHopResult(
+            answer="답변",
+            targets=["건축선"],
+            steps=["s"],
+            references=refs,
+            contexts_count=5,
+            trace={"follow_checks": [{"ref_key": "001823:46"}]},
+        )
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from architecture_agent.api import server
+
+    monkeypatch.setattr(server, "get_agent", lambda: FakeAsyncAgent())
+    with TestClient(server.app) as c:
+        yield c
+
+
+def test_ask_returns_selected_fields_without_trace(client):
+    resp = client.post(
+        "/api/v1/chat/ask?fields=answer,references.section&trace=false",
+        json={"query": "건축선", "k": 3},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"answer": "답변", "references": [{"section": f"제{i}조"} for i in range(5)]}
+
+    resp = client.post("/api/v1/chat/ask", json={"query": "건축선", "include_trace": False})
+    assert "trace" not in resp.json()
+    assert len(resp.json()["references"][0]["full_text"]) > 100
+
+
+def test_ask_compresses_large_payloads_and_rejects_unknown_fields(client):
+    resp = client.post("/api/v1/chat/ask", json={"query": "건축선"}, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert int(resp.headers["content-length"]) < len(resp.content) / 4
+    assert resp.json()["trace"]["follow_checks"][0]["ref_key"] == "001823:46"
+
+    small = client.post(
+        "/api/v1/chat/ask",
+        json={"query": "건축선", "fields": "answer"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"answer": "답변"}
+
+    bad = client.post("/api/v1/chat/ask", json={"query": "건축선", "fields": "answer,secret"})
+    assert bad.status_code == 422
+
+
+def test_ask_documents_full_response_schema(client):
+    # 응답은 fields에 맞춰 직접 직렬화하므로 response_model 검증 없이 문서에만 schema를 싣는다
+    spec = client.get("/openapi.json").json()
+    ok = spec["paths"]["/api/v1/chat/ask"]["post"]["responses"]["200"]
+    assert ok["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/AskResponse"}
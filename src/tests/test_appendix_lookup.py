@@ -29,3 +29,86 @@ def test_appendix_lookup_finds_culture_term(tmp_path):
     result = idx.lookup("문화 및 집회시설")
     assert result
     assert result[0]["category"] == "문화 및 집회시설"
+
+
+def _legacy_lookup(terms, query, top_k=5):
+    # 역색인 도입 전 선형 스캔 구현 (순위 동일성 검증용)
+    tokenize = Appendix1Index._tokenize
+    q_lower = query.strip().lower()
+    q_tokens = tokenize(query)
+    exact, alias, fuzzy = [], [], []
+    for term in terms:
+        category, subcategory = str(term.get("category", "")), str(term.get("subcategory", ""))
+        aliases = [str(a) for a in term.get("aliases", [])]
+        if q_lower in category.lower() or q_lower in subcategory.lower():
+            exact.append(term)
+            continue
+        if any(q_lower in a.lower() or a.lower() in q_lower for a in aliases):
+            alias.append(term)
+            continue
+        doc_tokens = tokenize(" ".join([category, subcategory, " ".join(aliases), str(term.get("description", ""))]))
+        if doc_tokens and q_tokens:
+            score = len(q_tokens & doc_tokens) / len(q_tokens | doc_tokens)
+            if score > 0:
+                fuzzy.append((score, term))
+    fuzzy.sort(key=lambda x: x[0], reverse=True)
+    out, seen = [], set()
+    for t in exact + alias + [t for _, t in fuzzy]:
+        key = (t.get("category"), t.get("subcategory"))
+        if key not in seen:
+            seen.add(key)
+            out.append(t)
+    return out[:top_k]
+
+
+def test_indexed_lookup_matches_linear_scan_ranking(tmp_path):
+    terms = [
+        {"category": "단독주택", "subcategory": "다가구주택", "aliases": ["다가구"], "description": "주택 용도"},
+        {"category": "공동주택", "subcategory": "아파트", "aliases": ["APT", "아파트"], "description": "주택 5개층 이상"},
+        {"category": "공동주택", "subcategory": "연립주택", "aliases": ["연립"], "description": "주택 4개층 이하"},
+        {"category": "문화 및 집회시설", "subcategory": "공연장", "aliases": ["문화시설"], "description": "공연 목적 시설"},
+        {"category": "문화 및 집회시설", "subcategory": "전시장", "aliases": ["박물관"], "description": "전시 시설"},
+        {"category": "판매시설", "subcategory": "도매시장", "aliases": ["시장"], "description": "도매 판매 시설"},
+        {"category": "근린생활시설", "subcategory": "", "aliases": ["근생", "소매점"], "description": "주택가 생활 편의 시설"},
+        {"category": "운동시설", "subcategory": "체육관", "aliases": ["관"], "description": "운동 시설"},
+    ]
+    path = tmp_path / "appendix1_terms.json"
+    path.write_text(json.dumps({"terms": terms}, ensure_ascii=False), encoding="utf-8")
+    idx = Appendix1Index(str(path))
+
+    queries = ["주택", "아파트", "apt", "문화 및 집회시설 공연", "시설", "근생 용도", "도매", "관", "체육관 운동", "없는말", "택"]
+    for q in queries:
+        for top_k in (1, 3, 10):
+            assert idx.lookup(q, top_k=top_k) == _legacy_lookup(terms, q, top_k=top_k), (q, top_k)
+
+
+def test_lookup_results_are_cached_with_bounded_size(tmp_path):
+    path = tmp_path / "appendix1_terms.json"
+    path.write_text(
+        json.dumps({"terms": [{"category": "공동주택", "subcategory": "아파트", "aliases": [], "description": ""}]}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    idx = Appendix1Index(str(path), cache_size=2)
+    first = idx.lookup("아파트")
+    first.clear()
+    assert idx.lookup("아파트")[0]["subcategory"] == "아파트"
+
+    idx.lookup("공동")
+    idx.lookup("주택")
+    assert list(idx._cache) == [("공동", 5), ("주택", 5)]
+
+
+def test_lookup_cache_is_safe_under_concurrent_queries(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    terms = [{"category": f"시설{i}", "subcategory": f"세부{i}", "aliases": [], "description": "공통 시설"} for i in range(20)]
+    path = tmp_path / "appendix1_terms.json"
+    path.write_text(json.dumps({"terms": terms}, ensure_ascii=False), encoding="utf-8")
+    idx = Appendix1Index(str(path), cache_size=4)
+
+    queries = [f"시설{i % 12}" for i in range(600)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda q: idx.lookup(q, top_k=1), queries))
+
+    assert [r[0]["category"] for r in results] == queries
+    assert len(idx._cache) <= 4
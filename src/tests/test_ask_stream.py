@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+
+import pytest
+
+from architecture_agent.service.zero_hop import ZeroHopLawAgent
+
+
+class StreamingLLM:
+    def invoke(self, prompt: str):
+        if "ref 필요성" in prompt:
+            return json.dumps({"answerable": True, "reason": "충분"})
+        return "건폐율은 60% 이하입니다."
+
+    def stream(self, prompt: str):
+        for token in ["건폐율은 ", "60% ", "이하입니다."]:
+            yield type("Chunk", (), {"content": token})()
+
+
+class FakeRetriever:
+    def embed_query(self, query):
+        return [0.0]
+
+    def similarity_search_many(self, queries, k=6, **_kwargs):
+        doc = {"content": "건폐율 기준", "metadata": {"law_name": "건축법", "law_id": "1823", "article_num": "55"}}
+        return [[doc] for _ in queries]
+
+    def embedding_cache_stats(self):
+        return {}
+
+
+class FakeAppendix:
+    def lookup(self, term_or_query, top_k=5):
+        return []
+
+
+def _agent() -> ZeroHopLawAgent:
+    agent = ZeroHopLawAgent.__new__(ZeroHopLawAgent)
+    agent.llm = StreamingLLM()
+    agent.retriever = FakeRetriever()
+    agent.appendix = FakeAppendix()
+    agent.answer_cache = None
+    agent.answer_token_budget = 1200
+    agent.precheck_token_budget = 600
+    agent.follow_token_budget = 200
+    agent.batch_follow_token_budget = 800
+    return agent
+
+
+def test_ask_stream_emits_stages_then_tokens_then_done():
+    events = list(_agent().ask_stream("건폐율 기준", k=3))
+    names = [e for e, _ in events]
+
+    assert names[:4] == ["targets", "contexts", "precheck", "references"]
+    assert names[4:7] == ["token", "token", "token"]
+    assert names[-1] == "done"
+    assert events[0][1] == {"targets": ["건폐율"]}
+    assert events[-1][1]["answer"] == "".join(d["text"] for e, d in events if e == "token")
+
+
+def test_ask_stream_reports_errors_as_event():
+    agent = _agent()
+    agent.retriever = None
+    events = list(agent.ask_stream("건폐율", k=3))
+    assert events[-1][0] == "error"
+
+
+class EndlessLLM(StreamingLLM):
+    def __init__(self):
+        self.yielded = 0
+        self.finished = threading.Event()
+
+    def stream(self, prompt: str):
+        try:
+            for _ in range(1000):
+                self.yielded += 1
+                time.sleep(0.001)
+                yield type("Chunk", (), {"content": "가"})()
+        finally:
+            self.finished.set()
+
+
+def test_ask_stream_stops_worker_when_consumer_leaves():
+    agent = _agent()
+    agent.llm = EndlessLLM()
+    events = agent.ask_stream("건폐율 기준", k=3)
+    for event, _ in events:
+        if event == "token":
+            break
+    events.close()
+
+    assert agent.llm.finished.wait(5)
+    assert agent.llm.yielded < 1000
+
+
+def test_stream_endpoint_sends_sse_frames(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from architecture_agent.api import server
+
+    from architecture_agent.service.admission import AdmissionLimiter
+
+    limiter = AdmissionLimiter(max_in_flight=1, max_waiting=0)
+    in_flight: list[int] = []
+    agent = _agent()
+    original = agent.start_stream
+
+    def _start_stream(query, sink, k=5, stop=None):
+        in_flight.append(limiter.stats()["in_flight"])
+        return original(query, sink, k=k, stop=stop)
+
+    agent.start_stream = _start_stream
+    monkeypatch.setattr(server, "admission", limiter)
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+    with TestClient(server.app) as client:
+        resp = client.post("/api/v1/chat/ask/stream", json={"query": "건폐율 기준", "k": 3})
+
+    # 스트림 동안 admission 자리를 잡고, 끝나면 돌려준다
+    assert in_flight == [1]
+    assert limiter.stats()["in_flight"] == 0
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in resp.text.split("\n\n") if f]
+    assert frames[0].startswith("event: targets\ndata: ")
+    assert frames[-1].startswith("event: done\n")
+    assert json.loads(frames[-1].split("data: ", 1)[1])["answer"] == "건폐율은 60% 이하입니다."
+
+
+
+class BlockedLLM(StreamingLLM):
+    # 첫 token 전에 release될 때까지 멈춰 있는 느린 LLM
+    def __init__(self):
+        self.release = threading.Event()
+
+    def stream(self, prompt: str):
+        self.release.wait(5)
+        yield type("Chunk", (), {"content": "가"})()
+
+
+def test_open_sse_streams_do_not_hold_default_executor_threads():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from architecture_agent.api.server import _sse_events
+    from architecture_agent.service.admission import AdmissionLimiter
+
+    agent = _agent()
+    agent.llm = BlockedLLM()
+    limiter = AdmissionLimiter(max_in_flight=4, max_waiting=0)
+
+    async def _consume(stream):
+        async for _frame in stream:
+            pass
+
+    async def scenario():
+        # 기본 executor가 1스레드뿐이어도 다음 이벤트를 기다리는 스트림들이 to_thread 작업을 막지 않아야 한다
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        streams = [_sse_events(agent, "건폐율 기준", 3, await limiter.acquire()) for _ in range(3)]
+        consumers = [asyncio.ensure_future(_consume(stream)) for stream in streams]
+        await asyncio.sleep(0.1)
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(lambda: "ok"), timeout=1)
+        finally:
+            agent.llm.release.set()
+            await asyncio.gather(*consumers)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert limiter.stats()["in_flight"] == 0
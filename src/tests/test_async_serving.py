@@ -0,0 +1,449 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from architecture_agent.metrics import CALL_ERRORS
+from architecture_agent.service.admission import AdmissionLimiter, AdmissionRejected
+from architecture_agent.service.zero_hop import ZeroHopLawAgent
+from architecture_agent.service.zero_hop_async import AsyncZeroHopLawAgent, _BatchRetriever
+
+
+def test_admission_limiter_queues_then_rejects():
+    async def scenario():
+        limiter = AdmissionLimiter(max_in_flight=1, max_waiting=1, wait_timeout=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as busy:
+            async with limiter.slot():
+                pass
+        assert busy.value.status_code == 429
+
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await waiter
+        assert timed_out.value.status_code == 503
+
+        release.set()
+        await holder
+        async with limiter.slot():
+            assert limiter.stats()["in_flight"] == 1
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["rejected_busy"] == 1
+    assert stats["rejected_timeout"] == 1
+    assert stats["in_flight"] == 0
+
+
+class AsyncJudgeLLM:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    def _answer(self, prompt: str) -> str:
+        if "ref 필요성" in prompt:
+            return json.dumps({"answerable": False, "reason": "참조 필요"})
+        if "ref_key: " in prompt:
+            return json.dumps({"follow": True, "priority": 1, "reason": "ok"})
+        return "답변"
+
+    def invoke(self, prompt: str) -> str:
+        return self._answer(prompt)
+
+    async def ainvoke(self, prompt: str) -> str:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        return self._answer(prompt)
+
+
+class DualRetriever:
+    doc = {
+        "content": "법 제46조에 따른 건축선",
+        "metadata": {
+            "law_name": "건축법 시행령",
+            "law_id": "2118",
+            "article_num": "31",
+            "external_refs": [],
+            "internal_refs": [{"article": str(n), "raw": f"제{n}조"} for n in range(40, 46)],
+        },
+    }
+
+    def embed_query(self, query):
+        return [0.0]
+
+    def similarity_search_many(self, queries, k=6, **_kwargs):
+        return [[self.doc] for _ in queries]
+
+    async def asimilarity_search_many(self, queries, k=6, **_kwargs):
+        return self.similarity_search_many(queries, k)
+
+    def get_by_exact(self, law_id, article_num):
+        return [{"content": f"제{article_num}조", "metadata": {"law_id": law_id, "article_num": article_num}}]
+
+    async def aget_by_exact(self, law_id, article_num):
+        return self.get_by_exact(law_id, article_num)
+
+    def get_many_exact(self, keys):
+        return {(law_id, article_num): self.get_by_exact(law_id, article_num) for law_id, article_num in keys}
+
+    async def aget_many_exact(self, keys):
+        return self.get_many_exact(keys)
+
+    def embedding_cache_stats(self):
+        return {}
+
+
+class FakeAppendix:
+    def lookup(self, term_or_query, top_k=5):
+        return []
+
+
+def _agent() -> AsyncZeroHopLawAgent:
+    agent = AsyncZeroHopLawAgent.__new__(AsyncZeroHopLawAgent)
+    agent.llm = AsyncJudgeLLM()
+    agent.retriever = DualRetriever()
+    agent.appendix = FakeAppendix()
+    agent.answer_cache = None
+    agent.ref_check_mode = "per_candidate"
+    agent.ref_check_concurrency = 3
+    agent.ref_check_timeout = 5.0
+    agent.answer_token_budget = 1200
+    agent.precheck_token_budget = 600
+    agent.follow_token_budget = 200
+    agent.batch_follow_token_budget = 800
+    return agent
+
+
+def test_async_agent_matches_sync_result_with_bounded_llm_concurrency():
+    agent = _agent()
+    sync_result = agent.ask("건축선 기준", k=3)
+    async_result = asyncio.run(agent.aask("건축선 기준", k=3))
+
+    sync_timings = sync_result.trace.pop("timings")
+    async_timings = async_result.trace.pop("timings")
+    assert async_result == sync_result
+    assert set(async_timings["stages"]) == set(sync_timings["stages"])
+    assert async_timings["calls"]["llm.follow_check"]["count"] == sync_timings["calls"]["llm.follow_check"]["count"] == 6
+    assert async_result.trace["candidates_followed"] == 6
+    assert async_result.trace["expanded_ref_count"] == 4
+    assert agent.llm.max_active == 3
+
+
+class SlowFollowLLM(AsyncJudgeLLM):
+    async def ainvoke(self, prompt: str) -> str:
+        if "ref_key: " in prompt:
+            await asyncio.sleep(1.0)
+        return await super().ainvoke(prompt)
+
+
+class FixedVersion:
+    def current(self) -> str:
+        return "v1"
+
+
+def test_degraded_results_are_not_stored_in_answer_cache():
+    from architecture_agent.service.answer_cache import AnswerCache
+
+    agent = _agent()
+    agent.index_version = FixedVersion()
+    agent.answer_cache = AnswerCache(ttl_seconds=None)
+    agent.answer_model = "HCX-005"
+
+    first = asyncio.run(agent.aask("건축선 기준", k=3))
+    assert first.degraded is False
+    assert asyncio.run(agent.aask("건축선 기준", k=3)).trace["answer_cache"] == "hit"
+
+    # 후보 판단이 제한 시간을 넘기면 그 결과는 캐시하지 않는다
+    agent.llm = SlowFollowLLM()
+    agent.ref_check_timeout = 0.05
+    timed_out = asyncio.run(agent.aask("건폐율 기준", k=3))
+    assert timed_out.degraded is True and timed_out.trace["follow_checks_timed_out"] == 6
+    assert asyncio.run(agent.aask("건폐율 기준", k=3)).trace["answer_cache"] == "miss"
+
+    # LLM 없이 규칙 기반으로 만든 답도 캐시하지 않는다
+    agent.llm = None
+    assert agent.ask("용적률 기준", k=3).degraded is True
+    assert agent.ask("용적률 기준", k=3).trace["answer_cache"] == "miss"
+    assert agent.answer_cache.stats()["entries"] == 1
+
+
+class CountingRetriever(DualRetriever):
+    def __init__(self):
+        self.search_batches: list[list[str]] = []
+        self.exact_calls: list[tuple[str, str]] = []
+        self.exact_batches = 0
+
+    async def asimilarity_search_many(self, queries, k=6, **_kwargs):
+        self.search_batches.append(list(queries))
+        return [[self.doc] for _ in queries]
+
+    async def aget_many_exact(self, keys):
+        self.exact_batches += 1
+        self.exact_calls.extend(keys)
+        return self.get_many_exact(keys)
+
+
+def test_aask_many_shares_retrieval_and_reports_per_item_errors():
+    agent = _agent()
+    agent.retriever = CountingRetriever()
+    original = agent._abuild_answer
+
+    async def flaky_answer(query, targets, refs):
+        if "실패" in query:
+            raise RuntimeError("llm down")
+        return await original(query, targets, refs)
+
+    agent._abuild_answer = flaky_answer
+    queries = ["건축선 기준", "건폐율 기준", "건축선 기준", "실패 질문"]
+
+    async def collect():
+        return [item async for item in agent.aask_many(queries, k=3, max_concurrency=2)]
+
+    items = asyncio.run(collect())
+
+    assert sorted(i for i, _, _ in items) == [0, 1, 2, 3]
+    by_index = {i: (result, error) for i, result, error in items}
+    assert by_index[0][0] is by_index[2][0]
+    assert by_index[3] == (None, "ask failed: llm down")
+    assert by_index[1][1] is None
+
+    retriever = agent.retriever
+    # 질의 변형 1회 + backfill 1회로 묶여서 조회되고, 같은 조문은 한 번만 가져온다
+    assert len(retriever.search_batches) == 2
+    assert len(retriever.search_batches[0]) == len(set(retriever.search_batches[0]))
+    assert len(retriever.exact_calls) == len(set(retriever.exact_calls)) == 6
+
+
+def test_batch_retriever_coalesces_exact_fetches_across_questions():
+    retriever = CountingRetriever()
+    batch = _BatchRetriever(retriever)
+
+    async def scenario():
+        return await asyncio.gather(
+            batch.aget_many_exact([("1823", "2"), ("1823", "46")]),
+            batch.aget_many_exact([("1823", "46"), ("2118", "31")]),
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert retriever.exact_batches == batch.exact_calls == 1
+    assert sorted(retriever.exact_calls) == [("1823", "2"), ("1823", "46"), ("2118", "31")]
+    assert first[("1823", "46")] == second[("1823", "46")]
+
+
+def test_failed_prefetch_chunk_does_not_strand_later_chunks():
+    class FirstChunkFails(CountingRetriever):
+        async def asimilarity_search_many(self, queries, k=6, **_kwargs):
+            if not self.search_batches:
+                self.search_batches.append(list(queries))
+                raise RuntimeError("qdrant down")
+            return await super().asimilarity_search_many(queries, k=k)
+
+    retriever = FirstChunkFails()
+    batch = _BatchRetriever(retriever, search_batch_size=1)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await batch.prefetch(["a", "b"], k=3)
+        # 뒤쪽 chunk("b")의 future가 남아 있으면 여기서 끝나지 않는다
+        return await asyncio.wait_for(batch.asimilarity_search_many(["a", "b"], k=3), timeout=1.0)
+
+    hits = asyncio.run(scenario())
+
+    assert hits == [[DualRetriever.doc], [DualRetriever.doc]]
+    assert retriever.search_batches == [["a"], ["a"], ["b"]]
+
+
+def test_aask_many_counts_prefetch_failure_and_still_answers():
+    class FlakySearchRetriever(CountingRetriever):
+        async def asimilarity_search_many(self, queries, k=6, **_kwargs):
+            if not self.search_batches:
+                self.search_batches.append([])
+                raise RuntimeError("qdrant down")
+            return await super().asimilarity_search_many(queries, k=k)
+
+    agent = _agent()
+    agent.retriever = FlakySearchRetriever()
+    before = CALL_ERRORS.value("batch", "prefetch")
+
+    async def collect():
+        return [item async for item in agent.aask_many(["건축선 기준", "주차 기준"], k=3)]
+
+    items = asyncio.run(collect())
+
+    assert CALL_ERRORS.value("batch", "prefetch") == before + 1
+    assert sorted(i for i, _, _ in items) == [0, 1]
+    assert all(result is not None and error is None for _, result, error in items)
+
+
+def test_sync_agent_exposes_ask_many():
+    sync_agent = ZeroHopLawAgent.__new__(ZeroHopLawAgent)
+    sync_agent.__dict__.update(_agent().__dict__)
+
+    items = list(sync_agent.ask_many(["건축선 기준", "주차 기준"], k=3))
+
+    assert sorted(i for i, _, _ in items) == [0, 1]
+    assert all(error is None for _, _, error in items)
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from architecture_agent.api import server
+
+    agent = _agent()
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+    with TestClient(server.app) as client:
+        resp = client.post("/api/v1/chat/ask/batch", json={"queries": ["건축선 기준", "주차 기준"], "k": 3})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["index"] for r in rows) == [0, 1]
+    assert all(r["result"]["answer"] == "답변" for r in rows)
+
+
+async def _post_and_drop(app, path: str, body: dict, fail_after: int) -> None:
+    # send가 fail_after번째 메시지에서 끊기는 클라이언트 (0이면 응답 시작 전에 끊김)
+    messages = [{"type": "http.request", "body": json.dumps(body).encode("utf-8"), "more_body": False}]
+    sent = 0
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal sent
+        if sent >= fail_after:
+            raise OSError("client went away")
+        sent += 1
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        pass
+
+
+def test_batch_endpoint_releases_admission_slot_when_client_drops(monkeypatch):
+    from architecture_agent.api import server
+
+    limiter = AdmissionLimiter(max_in_flight=1, max_waiting=0)
+    agent = _agent()
+    monkeypatch.setattr(server, "admission", limiter)
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+    body = {"queries": ["건축선 기준", "주차 기준"], "k": 3}
+
+    async def scenario():
+        for fail_after in (0, 1, 2):
+            await _post_and_drop(server.app, "/api/v1/chat/ask/batch", body, fail_after)
+            assert limiter.stats()["in_flight"] == 0
+        # 자리가 남아 있어 다음 요청은 429 없이 처리된다
+        async with limiter.slot():
+            pass
+
+    asyncio.run(scenario())
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["rejected_busy"] == 0
+
+
+def test_aask_many_cancels_remaining_questions_when_consumer_closes():
+    agent = _agent()
+    queries = [f"건축선 기준 {i}" for i in range(12)]
+
+    async def scenario():
+        items = agent.aask_many(queries, k=3, max_concurrency=2)
+        await items.__anext__()
+        await items.aclose()
+        # 닫힌 뒤에는 진행 중인 LLM 호출이 없고 새 호출도 시작되지 않는다
+        assert agent.llm.active == 0
+        calls = agent.llm.calls
+        await asyncio.sleep(0.1)
+        return calls
+
+    calls = asyncio.run(scenario())
+    assert agent.llm.calls == calls
+    assert calls < 12 * 8
+
+
+def test_batch_endpoint_stops_questions_when_client_drops(monkeypatch):
+    from architecture_agent.api import server
+
+    agent = _agent()
+    monkeypatch.setattr(server, "admission", AdmissionLimiter(max_in_flight=1, max_waiting=0))
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+    body = {"queries": [f"건축선 기준 {i}" for i in range(12)], "k": 3, "max_concurrency": 2}
+
+    async def scenario():
+        await _post_and_drop(server.app, "/api/v1/chat/ask/batch", body, fail_after=2)
+        assert agent.llm.active == 0
+        calls = agent.llm.calls
+        await asyncio.sleep(0.1)
+        assert agent.llm.calls == calls
+
+    asyncio.run(scenario())
+
+
+def test_ask_many_sync_wrapper_yields_all_items():
+    items = list(_agent().ask_many(["건축선 기준", "", "주차 기준"], k=3))
+    assert sorted(i for i, _, _ in items) == [0, 1, 2]
+    assert [e for i, _, e in items if i == 1] == ["empty query"]
+
+
+def test_ask_many_sync_wrapper_reuses_one_loop_and_stops_early():
+    class LoopBoundRetriever(DualRetriever):
+        # AsyncQdrantClient처럼 처음 쓴 event loop에만 묶이는 client 흉내
+        loop = None
+
+        async def asimilarity_search_many(self, queries, k=6, **_kwargs):
+            loop = asyncio.get_running_loop()
+            if self.loop is None:
+                self.loop = loop
+            assert loop is self.loop, "client used from a different event loop"
+            return self.similarity_search_many(queries, k)
+
+    agent = _agent()
+    agent.retriever = LoopBoundRetriever()
+
+    assert len(list(agent.ask_many(["건축선 기준"], k=3))) == 1
+    assert all(error is None for _, _, error in agent.ask_many(["주차 기준", "건폐율 기준"], k=3))
+
+    items = agent.ask_many([f"건축선 기준 {i}" for i in range(12)], k=3, max_concurrency=2)
+    next(items)
+    items.close()
+    # 닫힌 뒤에는 loop에서 돌던 남은 질문도 멈춘다
+    assert agent.llm.active == 0
+    calls = agent.llm.calls
+    time.sleep(0.1)
+    assert agent.llm.calls == calls
@@ -0,0 +1,75 @@
+from architecture_agent.ingestion.change_detect import (
+    compute_content_hash,
+    compute_source_hash,
+    diff_chunks,
+    point_id_for_key,
+)
+from architecture_agent.ingestion.resolve_abbr import chunk_key
+from architecture_agent.schemas import ArticleChunk
+
+
+def _chunk(law_id: str, article_num: str, content: str) -> ArticleChunk:
+    return ArticleChunk(
+        law_name="건축법" if law_id == "1823" else "건축법 시행령",
+        law_id=law_id,
+        law_type="법률" if law_id == "1823" else "시행령",
+        article_num=article_num,
+        article_title="테스트",
+        content=content,
+    )
+
+
+def _state(chunk: ArticleChunk) -> dict:
+    return {
+        "point_id": point_id_for_key(chunk_key(chunk)),
+        "source_hash": compute_source_hash(chunk),
+        "content_hash": compute_content_hash(chunk),
+        "law_id": chunk.law_id,
+    }
+
+
+def test_diff_chunks_upserts_only_new_or_changed_and_deletes_removed():
+    same = _chunk("1823", "1", "목적 조문")
+    changed_old = _chunk("1823", "2", "정의 조문")
+    removed = _chunk("1823", "3", "삭제될 조문")
+    other_law = _chunk("2118", "1", "시행령 조문")
+
+    indexed = {
+        "1823:1": _state(same),
+        "1823:2": _state(changed_old),
+        "1823:3": _state(removed),
+        "2118:1": _state(other_law),
+    }
+
+    changed_new = _chunk("1823", "2", "정의 조문 (개정)")
+    created = _chunk("1823", "4", "신설 조문")
+    diff = diff_chunks([same, changed_new, created], indexed)
+
+    assert [f"{c.law_id}:{c.article_num}" for c in diff.to_upsert] == ["1823:2", "1823:4"]
+    assert diff.summary() == {"created": 1, "updated": 1, "unchanged": 1, "deleted": 1}
+    # 이번 실행에 포함되지 않은 법령(2118)은 삭제 대상이 아니다
+    assert diff.to_delete == [point_id_for_key("1823:3")]
+
+
+def test_content_hash_tracks_resolved_text_but_source_hash_does_not():
+    chunk = _chunk("1823", "4", '건축위원회(이하 "위원회"라 한다)')
+    source_before = compute_source_hash(chunk)
+    content_before = compute_content_hash(chunk)
+
+    chunk.content_resolved = "건축법 제4조에 따른 건축위원회"
+
+    assert compute_source_hash(chunk) == source_before
+    assert compute_content_hash(chunk) != content_before
+
+
+def test_branch_article_gets_its_own_key_and_point_id():
+    base = _chunk("1823", "4", "건축위원회")
+    branch = _chunk("1823", "4", "건축위원회의 운영")
+    branch.article_sub = "2"
+
+    assert chunk_key(base) == "1823:4" and chunk_key(branch) == "1823:4의2"
+    assert point_id_for_key(chunk_key(base)) != point_id_for_key(chunk_key(branch))
+
+    indexed = {chunk_key(base): _state(base), chunk_key(branch): _state(branch)}
+    diff = diff_chunks([base, branch], indexed)
+    assert diff.summary() == {"created": 0, "updated": 0, "unchanged": 2, "deleted": 0}
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+from architecture_agent.ingestion.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(len(text)), 0.5, -1.0]
+
+
+def test_cached_embeddings_batches_misses_and_persists_float32(tmp_path):
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(
+        inner,
+        store=EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3"),
+        batch_size=2,
+        max_parallel_batches=2,
+    )
+
+    texts = ["가", "가나", "가나다", "가", "가나다라마"]
+    vectors = cached.embed_documents(texts)
+
+    assert vectors[0] == [1.0, 0.5, -1.0]
+    assert vectors[4] == [5.0, 0.5, -1.0]
+    assert sorted(len(b) for b in inner.batches) == [2, 2]
+    assert cached.stats() == {"hits": 1, "misses": 4, "entries": 4}
+    assert (tmp_path / "bge-m3.f32").stat().st_size == 4 * 3 * 4
+
+    # 새 프로세스(새 컬렉션 재색인)에서도 API 호출 없이 재사용
+    reopened = CachedEmbeddings(inner, store=EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3"))
+    assert reopened.embed_documents(texts) == vectors
+    assert len(inner.batches) == 2
+
+
+def test_embedding_store_ignores_truncated_tail(tmp_path):
+    store = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3")
+    store.put_many([("a", [1.0, 2.0]), ("b", [3.0, 4.0])])
+    with (tmp_path / "bge-m3.keys").open("a", encoding="utf-8") as f:
+        f.write("c\n")
+
+    reopened = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3")
+    assert len(reopened) == 2
+    assert reopened.get("b") == [3.0, 4.0]
+    assert reopened.get("c") is None
+
+
+def test_query_embeddings_use_lru_then_store_and_report_hit_rate(tmp_path):
+    inner = CountingEmbeddings()
+    store = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3")
+    cached = CachedEmbeddings(inner, store=store, query_cache_size=2, query_store=store)
+
+    assert cached.embed_queries(["건축선", " 건축선 ", "건폐율"]) == [[3.0, 0.5, -1.0]] * 2 + [[3.0, 0.5, -1.0]]
+    assert inner.batches == [["건축선", "건폐율"]]
+    assert cached.embed_query("건축선") == [3.0, 0.5, -1.0]
+    cached.embed_query("용적률")  # LRU 용량 2 -> 건폐율 밀려남
+    cached.embed_query("건폐율")
+    assert len(inner.batches) == 2
+
+    stats = cached.query_stats()
+    assert (stats["memory_hits"], stats["store_hits"], stats["misses"]) == (1, 1, 3)
+    assert stats["hit_rate"] == 0.4
+
+    store = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3")
+    reopened = CachedEmbeddings(inner, store=store, query_store=store)
+    reopened.embed_query("용적률  ")
+    assert len(inner.batches) == 2
+    assert reopened.query_stats()["store_hits"] == 1
+
+
+def test_query_vectors_stay_out_of_document_store_and_query_store_is_bounded(tmp_path):
+    inner = CountingEmbeddings()
+    docs = EmbeddingStore(cache_dir=str(tmp_path / "docs"), model="bge-m3")
+    queries = EmbeddingStore(cache_dir=str(tmp_path / "queries"), model="bge-m3", max_entries=4)
+    cached = CachedEmbeddings(inner, store=docs, query_cache_size=0, query_store=queries)
+
+    for i in range(12):
+        cached.embed_query("질의" * (i + 1))
+    assert len(docs) == 0
+    assert len(queries) <= 5
+
+    reopened = EmbeddingStore(cache_dir=str(tmp_path / "queries"), model="bge-m3", max_entries=4)
+    assert len(reopened) == len(queries)
+    # 가장 최근 질의는 남고 오래된 질의는 정리된다
+    latest = cached.embed_queries(["질의" * 12])
+    assert latest == [[24.0, 0.5, -1.0]] and cached.query_stats()["store_hits"] == 1
+
+    # 질의 store가 없으면 메모리 LRU만 쓰고 파일에는 남기지 않는다
+    memory_only = CachedEmbeddings(inner, store=docs)
+    memory_only.embed_query("건축선")
+    assert len(docs) == 0
+
+
+def test_compaction_keeps_recently_used_rows(tmp_path):
+    store = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3", max_entries=4)
+    store.put_many([(k, [float(i), 0.0]) for i, k in enumerate("abcd")])
+    assert store.get("a") == [0.0, 0.0]
+    store.put_many([("e", [4.0, 0.0])])
+    store.put_many([("f", [5.0, 0.0])])
+
+    # 먼저 넣었어도 최근에 조회한 a는 남고, 안 쓰인 b, c가 정리된다
+    reopened = EmbeddingStore(cache_dir=str(tmp_path), model="bge-m3", max_entries=4)
+    for found in (store, reopened):
+        assert len(found) == 4
+        assert found.get("b") is None and found.get("c") is None
+        assert [found.get(k) for k in "adef"] == [[0.0, 0.0], [3.0, 0.0], [4.0, 0.0], [5.0, 0.0]]
+
+
+class ThreadRecordingStore(EmbeddingStore):
+    def put_many(self, items):
+        self.writer_thread = threading.get_ident()
+        super().put_many(items)
+
+
+def test_async_query_store_write_runs_off_the_event_loop(tmp_path):
+    store = ThreadRecordingStore(cache_dir=str(tmp_path), model="bge-m3")
+    cached = CachedEmbeddings(CountingEmbeddings(), store=store, query_store=store)
+
+    async def scenario():
+        vector = await cached.aembed_query("건축선")
+        return vector, threading.get_ident()
+
+    vector, loop_thread = asyncio.run(scenario())
+    assert vector == [3.0, 0.5, -1.0]
+    assert store.writer_thread != loop_thread
@@ -0,0 +1,113 @@
+from architecture_agent.service.evidence_packer import EvidenceItem, estimate_tokens, pack_evidence
+from architecture_agent.service.zero_hop import ZeroHopLawAgent
+
+
+def _item(key: str, score: float, text: str = "건축선 " * 40, focus: str = "") -> EvidenceItem:
+    return EvidenceItem(key=key, header=f"건축법 제{key}조", text=text, score=score, focus=focus)
+
+
+def test_pack_fills_budget_by_score_and_skips_duplicates():
+    items = [
+        _item("1", 0.2, text="용적률 " * 40),
+        _item("2", 0.9),
+        _item("2", 0.8),
+        _item("3", 0.5, text="건축선 " * 40),
+        _item("4", 0.4, text="짧은 본문"),
+    ]
+    packed = pack_evidence(items, budget_tokens=200)
+
+    assert packed.included[0] == "2"
+    assert packed.tokens <= 200
+    assert packed.text.startswith("[1] 건축법 제2조\n건축선")
+    # 같은 key, 같은 본문은 한 번만
+    assert packed.duplicates == 2
+    assert "3" not in packed.included
+    assert packed.included == ["2", "4", "1"]
+    assert packed.truncated == ["1"]
+    assert packed.usage()["items"] == len(packed.included)
+
+
+def test_truncated_item_keeps_focus_phrase():
+    text = "가" * 400 + " 법 제46조제1항에 따른 건축선 " + "나" * 400
+    packed = pack_evidence([_item("46", 1.0, text=text, focus="법 제46조제1항")], budget_tokens=60)
+
+    assert packed.truncated == ["46"]
+    assert "법 제46조제1항" in packed.text
+    assert packed.tokens <= 60
+    assert estimate_tokens(packed.text) == packed.tokens
+
+
+class _Appendix:
+    def lookup(self, term_or_query, top_k=5):
+        return []
+
+
+def _answer_agent(budget: int) -> ZeroHopLawAgent:
+    agent = ZeroHopLawAgent.__new__(ZeroHopLawAgent)
+    agent.llm = object()
+    agent.appendix = _Appendix()
+    agent.answer_token_budget = budget
+    return agent
+
+
+def _refs(k: int) -> list[dict]:
+    refs = [
+        {"chunk_key": f"1823:{i}", "law_name": "건축법", "section": f"제{i}조", "full_text": f"본문 {i} " * 200, "ref_priority": None}
+        for i in range(k)
+    ]
+    refs.append({"chunk_key": "2118:31", "law_name": "건축법 시행령", "section": "제31조", "full_text": "시행령 본문 " * 50, "ref_priority": 2})
+    return refs
+
+
+def test_max_item_tokens_leaves_room_for_lower_ranked_items():
+    items = [_item(str(i), 1.0 / (1 + i), text=f"본문{i} " * 300) for i in range(4)]
+    packed = pack_evidence(items, budget_tokens=400, max_item_tokens=100)
+
+    assert packed.included == ["0", "1", "2", "3"]
+    assert packed.tokens <= 400
+
+
+def test_answer_prompt_size_tracks_budget_not_k():
+    agent = _answer_agent(budget=400)
+    small, _ = agent._answer_prompt("건축선", ["건축선"], _refs(3))
+    large, _ = agent._answer_prompt("건축선", ["건축선"], _refs(15))
+
+    assert abs(estimate_tokens(large) - estimate_tokens(small)) < 40
+    # 우선순위 2 ref는 검색 2순위와 같은 점수라 budget 안에 들어간다
+    assert "건축법 시행령 제31조" in large
+    assert "{'" not in large
+
+
+def test_follow_prompt_keeps_reference_phrase_beyond_first_900_chars():
+    agent = _answer_agent(budget=400)
+    agent.follow_token_budget = 200
+    content = "가" * 1500 + " 제46조제1항에 따른 건축선 " + "나" * 300
+    context = {
+        "content": content,
+        "metadata": {"law_id": "1823", "article_num": "47", "internal_refs": [{"article": "46", "raw": "제46조제1항"}]},
+    }
+    candidate = agent._extract_ref_candidates([context])[0]
+
+    assert len(candidate["source_text"]) > 900
+    prompt = agent._follow_prompt("건축선", ["건축선"], candidate)
+    assert "제46조제1항에 따른 건축선" in prompt
+
+
+def test_heuristic_fallbacks_keep_original_windows():
+    agent = _answer_agent(budget=400)
+    agent.llm = None
+    # target 키워드가 앞 280자/900자 밖에만 있으면 규칙 기반 판단에서는 보이지 않는다
+    late = {"content": "가" * 1000 + " 건축선", "metadata": {"law_id": "1823", "article_num": "47"}}
+    early = {"content": "건축선 " + "가" * 1000, "metadata": {"law_id": "1823", "article_num": "47"}}
+
+    assert agent._heuristic_answerable(["건축선"], agent._answerable_evidence([late] * 3)) == (False, "heuristic")
+    assert agent._heuristic_answerable(["건축선"], agent._answerable_evidence([early] * 3)) == (True, "heuristic")
+    assert agent._heuristic_follow(["건축선"], {"source_text": late["content"], "raw": "제46조"})[0] is False
+    assert agent._heuristic_follow(["건축선"], {"source_text": early["content"], "raw": "제46조"})[0] is True
+
+
+def test_precheck_evidence_header_names_branch_article():
+    agent = _answer_agent(budget=400)
+    meta = {"law_name": "건축법", "law_id": "1823", "article_num": "4", "article_sub": "2", "article_title": "위원회의 운영"}
+    (item,) = agent._context_evidence([{"content": "본문", "metadata": meta}])
+    assert item.header == "건축법 제4조의2 위원회의 운영"
@@ -48,3 +48,100 @@ def test_extract_abbreviations_by_chunk_llm_and_aggregate():
     by_law = aggregate_chunk_abbr_maps_by_law(chunks, chunk_maps)
     assert by_law["건축법"]["위원회"].startswith("건축법 제4조")
     assert by_law["건축법 시행령"]["위원회"].startswith("건축법 시행령 제5조")
+
+
+class SlowFlakyLLM:
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+
+    async def ainvoke(self, prompt: str):
+        import asyncio
+
+        article = prompt.split("조문: 제", 1)[1].split("조", 1)[0]
+        self.calls[article] = self.calls.get(article, 0) + 1
+        if article == "2" and self.calls[article] == 1:
+            raise RuntimeError("429 rate exceeded")
+        # 앞 조문일수록 늦게 끝나도록 해 완료 순서와 결과 순서를 다르게 만든다
+        await asyncio.sleep(0.01 * (5 - int(article)))
+        return DummyResp(f'{{"약칭{article}": "제{article}조에 따른 명칭"}}')
+
+
+def test_extract_abbreviations_by_chunk_llm_concurrent_keeps_order_and_retries():
+    chunks = [
+        ArticleChunk(
+            law_name="건축법",
+            law_id="1823",
+            law_type="법률",
+            article_num=str(i),
+            article_title="테스트",
+            content=f"제{i}조 본문",
+        )
+        for i in range(1, 5)
+    ]
+    llm = SlowFlakyLLM()
+
+    chunk_maps = extract_abbreviations_by_chunk_llm(
+        chunks,
+        llm=llm,
+        max_concurrency=3,
+        timeout=5.0,
+        max_retries=1,
+        backoff_base=0.0,
+    )
+
+    assert list(chunk_maps) == ["1823:1", "1823:2", "1823:3", "1823:4"]
+    assert chunk_maps["1823:2"] == {"약칭2": "건축법 제2조에 따른 명칭"}
+    assert llm.calls["2"] == 2
+
+
+class PartlyBrokenLLM:
+    def __init__(self, hang: bool = False):
+        self.hang = hang
+
+    def invoke(self, prompt: str):
+        import time
+
+        article = prompt.split("조문: 제", 1)[1].split("조", 1)[0]
+        if article == "2":
+            if self.hang:
+                time.sleep(0.5)
+            else:
+                raise RuntimeError("500 internal error")
+        return DummyResp(f'{{"약칭{article}": "제{article}조에 따른 명칭"}}')
+
+
+def _numbered_chunks(n: int) -> list[ArticleChunk]:
+    return [
+        ArticleChunk(
+            law_name="건축법",
+            law_id="1823",
+            law_type="법률",
+            article_num=str(i),
+            article_title="테스트",
+            content=f"제{i}조 본문",
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def test_extract_abbreviations_by_chunk_llm_keeps_partial_results_on_failure():
+    for max_concurrency in (1, 3):
+        chunk_maps = extract_abbreviations_by_chunk_llm(
+            _numbered_chunks(3),
+            llm=PartlyBrokenLLM(),
+            max_concurrency=max_concurrency,
+            max_retries=1,
+            backoff_base=0.0,
+        )
+        assert list(chunk_maps) == ["1823:1", "1823:3"]
+
+
+def test_extract_abbreviations_by_chunk_llm_sequential_path_applies_timeout():
+    chunk_maps = extract_abbreviations_by_chunk_llm(
+        _numbered_chunks(3),
+        llm=PartlyBrokenLLM(hang=True),
+        max_concurrency=1,
+        timeout=0.05,
+        max_retries=0,
+    )
+    assert list(chunk_maps) == ["1823:1", "1823:3"]
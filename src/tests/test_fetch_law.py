@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from architecture_agent.ingestion.fetch_law import fetch_and_save_laws  # noqa: E402
+
+LAWS = {
+    "1823": {"법령명_한글": "건축법", "시행일자": "20250101", "공포번호": "20000"},
+    "2118": {"법령명_한글": "건축법 시행령", "시행일자": "20250201", "공포번호": "35000"},
+    "9999": {"법령명_한글": "주차장법", "시행일자": "20240601", "공포번호": "19000"},
+}
+
+
+def _start_stub_server():
+    state = {"requests": [], "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            law_id = parse_qs(urlparse(self.path).query)["ID"][0]
+            with lock:
+                state["requests"].append(law_id)
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.05)
+            body = json.dumps(
+                {"법령": {"기본정보": {"법령ID": law_id, **LAWS[law_id]}, "조문": {}}},
+                ensure_ascii=False,
+            ).encode("utf-8")
+            with lock:
+                state["in_flight"] -= 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def test_fetch_and_save_laws_concurrent_and_conditional(tmp_path):
+    server, state = _start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/DRF/lawService.do"
+    try:
+        files = fetch_and_save_laws(
+            law_ids=("1823", "2118", "9999"),
+            output_dir=str(tmp_path),
+            oc="test",
+            max_workers=2,
+            base_url=base_url,
+        )
+        assert [f.name for f in files] == ["1823_건축법.json", "2118_건축법 시행령.json", "9999_주차장법.json"]
+        assert sorted(state["requests"]) == ["1823", "2118", "9999"]
+        assert state["max_in_flight"] <= 2
+
+        law_meta = {
+            "1823": {"시행일자": "2025.01.01", "공포번호": "20000"},
+            "2118": {"시행일자": "20250301", "공포번호": "35100"},
+        }
+        fetch_and_save_laws(
+            law_ids=("1823", "2118", "9999"),
+            output_dir=str(tmp_path),
+            oc="test",
+            law_meta=law_meta,
+            base_url=base_url,
+        )
+        # 1823은 저장본이 최신이므로 건너뛰고, 개정된 2118과 메타 없는 9999만 다시 받는다
+        assert sorted(state["requests"][3:]) == ["2118", "9999"]
+    finally:
+        server.shutdown()
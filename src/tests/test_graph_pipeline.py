@@ -8,6 +8,7 @@ from architecture_agent.agent.graph import (
     law_retriever,
     reference_tracker,
 )
+from architecture_agent.schemas import Reference
 
 
 class DummyTool:
@@ -90,3 +91,29 @@ def test_graph_nodes_for_architecture_line_flow():
     assert len(state["all_context"]) >= 2
     assert state["appendix_context"]
     assert "산식" in state["final_answer"]
+
+
+def test_batched_reference_tracker_respects_hop_budget():
+    fetched: list[list[str]] = []
+
+    def get_articles(payload):
+        fetched.append(payload["keys"])
+        return {key: [{"content": key, "metadata": {}}] for key in payload["keys"]}
+
+    tools = {
+        "get_articles": DummyTool(get_articles),
+        "find_children_by_parent_ref": DummyTool(lambda payload: []),
+    }
+    refs = [Reference(ref_type="internal", law_name="건축법", article=str(n)) for n in range(1, 6)]
+    state = {"pending_refs": refs, "max_hops": 3, "hop_count": 1}
+
+    state = reference_tracker(state, tools)
+
+    # hop 예산이 2 남았으므로 참조 2건만 조회하고 나머지는 대기열에 남긴다
+    assert fetched == [["1823:1", "1823:2"]]
+    assert state["hop_count"] == 3
+    assert [r.article for r in state["pending_refs"]] == ["3", "4", "5"]
+    assert len(state["all_context"]) == 2
+
+    assert reference_tracker(state, tools) is state
+    assert len(fetched) == 1
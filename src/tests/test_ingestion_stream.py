@@ -0,0 +1,101 @@
+import json
+
+from architecture_agent.ingestion.change_detect import compute_source_hash
+from architecture_agent.ingestion.stream import (
+    LawAbbreviationStage,
+    LlmChunkAbbreviationStage,
+    batched,
+    iter_parsed_chunks,
+    iter_raw_payloads,
+    iter_with_references,
+)
+
+
+class DummyResp:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class DummyLLM:
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    def invoke(self, prompt: str):
+        self.prompts.append(prompt)
+        return DummyResp('{"위원회": "건축위원회"}')
+
+
+def _raw_law(law_id: str, law_name: str, n_articles: int) -> dict:
+    return {
+        "법령": {
+            "기본정보": {"법령명_한글": law_name, "법령ID": law_id},
+            "조문": {
+                "조문단위": [
+                    {
+                        "조문여부": "조문",
+                        "조문번호": str(i),
+                        "조문제목": "테스트",
+                        "조문내용": f'제{i}조 건축위원회(이하 "위원회"라 한다). 위원회는 법 제46조에 따른다.',
+                    }
+                    for i in range(1, n_articles + 1)
+                ]
+            },
+        }
+    }
+
+
+def _write_raw_files(tmp_path) -> list:
+    files = []
+    for law_id, name, n in [("1823", "건축법", 3), ("2118", "건축법 시행령", 2)]:
+        path = tmp_path / f"{law_id}_{name}.json"
+        path.write_text(json.dumps(_raw_law(law_id, name, n), ensure_ascii=False), encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def test_batched_splits_lazily():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_llm_chunk_stage_streams_windows_and_reuses_unchanged(tmp_path):
+    files = _write_raw_files(tmp_path)
+    first_pass = list(iter_with_references(iter_parsed_chunks(iter_raw_payloads(files))))
+    changed_key = "1823:2"
+    indexed_state = {
+        f"{c.law_id}:{c.article_num}": {"source_hash": compute_source_hash(c)}
+        for c in first_pass
+        if f"{c.law_id}:{c.article_num}" != changed_key
+    }
+    previous = {key: {"위원회": "건축법 제4조에 따른 건축위원회"} for key in indexed_state}
+
+    llm = DummyLLM()
+    stage = LlmChunkAbbreviationStage(
+        llm,
+        window_size=2,
+        max_concurrency=1,
+        indexed_state=indexed_state,
+        previous_chunk_maps=previous,
+    )
+    stream = stage(iter_with_references(iter_parsed_chunks(iter_raw_payloads(files))))
+
+    first = next(stream)
+    assert stage.processed == 1
+    assert "건축법 제4조에 따른 건축위원회" in first.content_resolved
+
+    rest = list(stream)
+    assert stage.processed == 5
+    assert stage.reused == 4
+    assert len(llm.prompts) == 1
+    assert "조문: 제2조" in llm.prompts[0]
+    assert [c.parent_law_refs[0].article for c in rest if c.law_id == "2118"] == ["46", "46"]
+    assert set(stage.chunk_maps) == {"1823:1", "1823:2", "1823:3", "2118:1", "2118:2"}
+
+
+def test_law_abbreviation_stage_resolves_per_law(tmp_path):
+    files = _write_raw_files(tmp_path)
+    stage = LawAbbreviationStage()
+    chunks = list(stage(iter_parsed_chunks(iter_raw_payloads(files))))
+
+    assert stage.processed == 5
+    assert set(stage.law_maps) == {"건축법", "건축법 시행령"}
+    assert all("건축위원회는" in c.content_resolved for c in chunks)
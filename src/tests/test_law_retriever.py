@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+pytest.importorskip("langchain_qdrant")
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+from qdrant_client import QdrantClient  # noqa: E402
+
+from architecture_agent.agent.tools import LawRetriever  # noqa: E402
+from architecture_agent.ingestion.extract_refs import extract_references  # noqa: E402
+from architecture_agent.ingestion.index_qdrant import index_chunks_to_qdrant  # noqa: E402
+from architecture_agent.schemas import ArticleChunk  # noqa: E402
+
+
+class HashEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def _vec(self, text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in (digest * 32)[:1024]]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        return self._vec(text)
+
+
+def _corpus() -> list[ArticleChunk]:
+    chunks = [
+        ArticleChunk(
+            law_name="건축법",
+            law_id="1823",
+            law_type="법률",
+            article_num=str(i),
+            article_title=f"조문 {i}",
+            content=f"건축법 제{i}조 본문 건폐율 용적률",
+        )
+        for i in range(40, 48)
+    ]
+    chunks += [
+        ArticleChunk(
+            law_name="건축법 시행령",
+            law_id="2118",
+            law_type="시행령",
+            article_num=str(i),
+            article_title=f"시행령 조문 {i}",
+            content=f"법 제46조제1항에 따른 건축선 시행령 제{i}조",
+        )
+        for i in range(31, 34)
+    ]
+    extract_references(chunks)
+    return chunks
+
+
+@pytest.fixture()
+def retriever(tmp_path):
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    index_chunks_to_qdrant(
+        _corpus(),
+        client=client,
+        embeddings=embeddings,
+        embedding_cache_dir=str(tmp_path / "emb"),
+    )
+    return LawRetriever(client=client, embeddings=embeddings)
+
+
+def test_similarity_search_applies_law_filters_in_qdrant(retriever):
+    items = retriever.similarity_search("건축선", k=5, law_id="002118")
+    assert len(items) == 3
+    assert {i["metadata"]["law_id"] for i in items} == {"2118"}
+
+    items = retriever.similarity_search("건축선", k=20, law_type="법률")
+    assert len(items) == 8
+    assert {i["metadata"]["law_type"] for i in items} == {"법률"}
+
+
+def test_get_by_exact_and_children_use_metadata_payload(retriever):
+    docs = retriever.get_by_exact(law_id="001823", article_num="46")
+    assert len(docs) == 1
+    assert docs[0]["metadata"]["article_title"] == "조문 46"
+    assert docs[0]["content"].startswith("건축법 제46조")
+
+    children = retriever.find_children_by_parent_ref(law_name="건축법", article_num="46")
+    assert sorted(c["metadata"]["article_num"] for c in children) == ["31", "32", "33"]
+    assert retriever.find_children_by_parent_ref(law_name="건축법", article_num="47") == []
+
+
+def test_children_lookup_uses_reverse_ref_index_without_scroll(tmp_path):
+    from architecture_agent.ingestion.reverse_refs import build_reverse_ref_index, save_reverse_ref_index
+
+    chunks = _corpus()
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    index_chunks_to_qdrant(chunks, client=client, embeddings=embeddings, embedding_cache_dir=str(tmp_path / "emb"))
+    index_path = save_reverse_ref_index(build_reverse_ref_index(chunks), output_path=str(tmp_path / "refs.json"))
+    scroll = client.scroll
+
+    from architecture_agent.ingestion.index_version import write_index_version
+
+    version_path = str(tmp_path / "index_version.json")
+    write_index_version("building_law", output_path=version_path)
+    retriever = LawRetriever(
+        client=client,
+        embeddings=embeddings,
+        reverse_ref_index_path=str(index_path),
+        index_version_path=version_path,
+    )
+
+    def _no_io(*_args, **_kwargs):
+        raise AssertionError("children should be resolved from the reverse index and the local article store")
+
+    retriever.client.scroll = retriever.client.retrieve = _no_io
+    children = retriever.find_children_by_parent_ref(law_name="건축법", article_num="46")
+    assert sorted(c["metadata"]["article_num"] for c in children) == ["31", "32", "33"]
+    assert retriever.find_children_by_parent_ref(law_name="건축법", article_num="47") == []
+
+    # 재적재로 index_version이 바뀌면 역참조 인덱스를 다시 읽는다
+    save_reverse_ref_index(build_reverse_ref_index(chunks[-1:]), output_path=str(index_path))
+    assert len(retriever.find_children_by_parent_ref(law_name="건축법", article_num="46")) == 3
+    retriever.client.scroll = scroll
+    write_index_version("building_law", output_path=version_path)
+    children = retriever.find_children_by_parent_ref(law_name="건축법", article_num="46")
+    assert [c["metadata"]["article_num"] for c in children] == ["33"]
+
+
+def test_similarity_search_many_matches_single_queries_in_one_embedding_call(retriever):
+    queries = ["건축선", "건폐율 용적률", "시행령 제32조"]
+    expected = [retriever.similarity_search(q, k=4, law_id="2118") for q in queries]
+
+    embeddings = retriever.vector_store.embeddings
+    embeddings.calls = 0
+    batched = retriever.similarity_search_many(queries, k=4, law_id="2118")
+    assert embeddings.calls == 1
+    assert batched == expected
+    assert retriever.similarity_search_many([]) == []
+
+
+def test_async_search_and_exact_fetch_match_sync(retriever):
+    import asyncio
+
+    queries = ["건축선", "건폐율 용적률"]
+
+    async def run():
+        hits = await retriever.asimilarity_search_many(queries, k=3, law_type="법률")
+        exact = await retriever.aget_by_exact(law_id="1823", article_num="46")
+        return hits, exact
+
+    hits, exact = asyncio.run(run())
+    assert hits == retriever.similarity_search_many(queries, k=3, law_type="법률")
+    assert exact == retriever.get_by_exact(law_id="1823", article_num="46")
+
+
+def test_get_many_exact_fetches_all_keys_in_one_retrieve(retriever):
+    calls = {"retrieve": 0, "scroll": 0}
+    retrieve, scroll = retriever.client.retrieve, retriever.client.scroll
+
+    def _retrieve(*args, **kwargs):
+        calls["retrieve"] += 1
+        return retrieve(*args, **kwargs)
+
+    def _scroll(*args, **kwargs):
+        calls["scroll"] += 1
+        return scroll(*args, **kwargs)
+
+    retriever.client.retrieve, retriever.client.scroll = _retrieve, _scroll
+    keys = [("001823", "46"), ("2118", "32"), ("1823", "99")]
+    found = retriever.get_many_exact(keys)
+
+    assert calls["retrieve"] == 1
+    assert list(found) == keys
+    assert found[("001823", "46")] == retriever.get_by_exact(law_id="1823", article_num="46")
+    assert found[("2118", "32")][0]["metadata"]["article_title"] == "시행령 조문 32"
+    # point id로 못 찾은 키만 필터 scroll 한 번으로 다시 확인한다
+    assert found[("1823", "99")] == []
+    assert calls["scroll"] == 2
+
+
+def test_get_many_exact_falls_back_to_filter_for_random_point_ids(tmp_path):
+    from langchain_qdrant import QdrantVectorStore
+    from qdrant_client.models import Distance, VectorParams
+
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    client.create_collection("building_law", vectors_config=VectorParams(size=1024, distance=Distance.COSINE))
+    store = QdrantVectorStore(client=client, collection_name="building_law", embedding=embeddings)
+    store.add_texts(
+        ["건축법 제46조 본문", "시행령 제31조 본문"],
+        metadatas=[
+            {"law_id": "1823", "article_num": "46", "content_original": "건축법 제46조 본문"},
+            {"law_id": "2118", "article_num": "31", "content_original": "시행령 제31조 본문"},
+        ],
+    )
+    retriever = LawRetriever(client=client, embeddings=embeddings)
+
+    found = retriever.get_many_exact([("1823", "46"), ("002118", "31")])
+    assert [d["content"] for d in found[("1823", "46")]] == ["건축법 제46조 본문"]
+    assert [d["content"] for d in found[("002118", "31")]] == ["시행령 제31조 본문"]
+
+
+def test_article_store_serves_lookups_from_memory_and_reloads_on_version_change(tmp_path):
+    from architecture_agent.ingestion.index_version import write_index_version
+
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    index_chunks_to_qdrant(_corpus(), client=client, embeddings=embeddings, embedding_cache_dir=str(tmp_path / "emb"))
+    version_path = str(tmp_path / "index_version.json")
+    write_index_version("building_law", output_path=version_path)
+
+    remote = LawRetriever(client=client, embeddings=embeddings)
+    expected_exact = remote.get_by_exact(law_id="1823", article_num="46")
+    expected_many = remote.get_many_exact([("001823", "46"), ("2118", "32"), ("1823", "99")])
+    expected_children = remote.find_children_by_parent_ref(law_name="건축법", article_num="46")
+
+    retriever = LawRetriever(client=client, embeddings=embeddings, article_store=True, index_version_path=version_path)
+    assert retriever.article_store.size == 11
+
+    def _no_io(*_args, **_kwargs):
+        raise AssertionError("article lookups should be served from the in-memory store")
+
+    scroll = client.scroll
+    client.scroll, client.retrieve = _no_io, _no_io
+    assert retriever.get_by_exact(law_id="001823", article_num="46") == expected_exact
+    assert retriever.get_many_exact([("001823", "46"), ("2118", "32"), ("1823", "99")]) == expected_many
+    assert sorted(c["metadata"]["article_num"] for c in retriever.find_children_by_parent_ref("건축법", "46")) == sorted(
+        c["metadata"]["article_num"] for c in expected_children
+    )
+    assert len(retriever.law_articles("002118")) == 3
+    # 결과를 고쳐도 저장소 원본은 바뀌지 않는다
+    retriever.get_by_exact(law_id="1823", article_num="46")[0]["content"] = "changed"
+    assert retriever.get_by_exact(law_id="1823", article_num="46") == expected_exact
+
+    client.scroll = scroll
+    points, _ = scroll("building_law", limit=100)
+    client.delete("building_law", points_selector=[p.id for p in points if p.payload["metadata"]["article_num"] == "46"])
+    assert retriever.get_by_exact(law_id="1823", article_num="46") == expected_exact
+    write_index_version("building_law", output_path=version_path)
+    assert retriever.get_by_exact(law_id="1823", article_num="46") == []
+    assert retriever.article_store.size == 10
+
+
+def _snapshot_search(path: str, vector: list[float]) -> list[str]:
+    from architecture_agent.ingestion.serving_snapshot import open_serving_snapshot
+
+    return [h["metadata"]["_id"] for h in open_serving_snapshot(path).search_many([vector], k=3)[0]]
+
+
+def test_serving_snapshot_matches_qdrant_and_is_shared_across_processes(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from architecture_agent.ingestion.serving_snapshot import export_serving_snapshot
+
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    index_chunks_to_qdrant(_corpus(), client=client, embeddings=embeddings, embedding_cache_dir=str(tmp_path / "emb"))
+    remote = LawRetriever(client=client, embeddings=embeddings)
+    snapshot_dir = str(tmp_path / "snapshot")
+    manifest = export_serving_snapshot(client, output_dir=snapshot_dir, index_version_path=str(tmp_path / "none.json"))
+    assert manifest["count"] == 11 and manifest["distance"] == "Cosine"
+
+    retriever = LawRetriever(embeddings=embeddings, snapshot_path=snapshot_dir)
+    assert retriever.client is None and retriever.vector_store is None
+
+    queries = ["건축선", "건폐율 용적률"]
+    expected = remote.similarity_search_many(queries, k=4)
+    got = retriever.similarity_search_many(queries, k=4)
+    assert [[h["metadata"]["_id"] for h in hits] for hits in got] == [[h["metadata"]["_id"] for h in hits] for hits in expected]
+    assert got[0][0] == expected[0][0]
+    filtered = retriever.similarity_search("건축선", k=20, law_id="002118")
+    assert {h["metadata"]["law_id"] for h in filtered} == {"2118"} and len(filtered) == 3
+    assert len(retriever.similarity_search("건축선", k=20, law_type="법률")) == 8
+    assert asyncio.run(retriever.asimilarity_search("건축선", k=4)) == retriever.similarity_search("건축선", k=4)
+
+    assert retriever.get_by_exact("001823", "46") == remote.get_by_exact("1823", "46")
+    assert retriever.get_many_exact([("1823", "46"), ("2118", "99")]) == remote.get_many_exact([("1823", "46"), ("2118", "99")])
+    assert sorted(c["metadata"]["article_num"] for c in retriever.find_children_by_parent_ref("건축법", "46")) == sorted(
+        c["metadata"]["article_num"] for c in remote.find_children_by_parent_ref("건축법", "46")
+    )
+
+    # 여러 worker 프로세스가 lock 없이 같은 snapshot을 동시에 연다
+    vector = embeddings.embed_query("건축선")
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork")) as pool:
+        results = list(pool.map(_snapshot_search, [snapshot_dir] * 4, [vector] * 4))
+    assert results == [[h["metadata"]["_id"] for h in got[0][:3]]] * 4
+
+    # 다시 export하면 열려 있는 retriever는 다음 조회에서 새 snapshot으로 바뀐다
+    points, _ = client.scroll("building_law", limit=100)
+    client.delete("building_law", points_selector=[p.id for p in points if p.payload["metadata"]["article_num"] == "46"])
+    export_serving_snapshot(client, output_dir=snapshot_dir, index_version_path=str(tmp_path / "none.json"))
+    assert retriever.get_by_exact("1823", "46") == []
+    assert retriever.article_store.size == 10
+
+
+def test_branch_article_is_indexed_and_fetched_separately(tmp_path):
+    from architecture_agent.ingestion.index_version import write_index_version
+    from architecture_agent.ingestion.serving_snapshot import export_serving_snapshot
+
+    base = ArticleChunk(
+        law_name="건축법", law_id="1823", law_type="법률", article_num="4", article_title="건축위원회", content="제4조 본문"
+    )
+    branch = ArticleChunk(
+        law_name="건축법",
+        law_id="1823",
+        law_type="법률",
+        article_num="4",
+        article_sub="2",
+        article_title="건축위원회의 운영",
+        content="제4조의2 본문",
+    )
+    client = QdrantClient(location=":memory:")
+    embeddings = HashEmbeddings()
+    index_chunks_to_qdrant([base, branch], client=client, embeddings=embeddings, embedding_cache_dir=str(tmp_path / "emb"))
+    # 제4조의2가 제4조 point를 덮어쓰지 않는다
+    assert client.count("building_law").count == 2
+
+    version_path = str(tmp_path / "index_version.json")
+    write_index_version("building_law", output_path=version_path)
+    snapshot_dir = str(tmp_path / "snapshot")
+    export_serving_snapshot(client, output_dir=snapshot_dir, index_version_path=str(tmp_path / "none.json"))
+
+    remote = LawRetriever(client=client, embeddings=embeddings)
+    stored = LawRetriever(client=client, embeddings=embeddings, article_store=True, index_version_path=version_path)
+    snapshot = LawRetriever(embeddings=embeddings, snapshot_path=snapshot_dir)
+    for retriever in (remote, stored, snapshot):
+        assert [d["content"] for d in retriever.get_by_exact(law_id="1823", article_num="4")] == ["제4조 본문"]
+        assert [d["content"] for d in retriever.get_by_exact(law_id="1823", article_num="4의2")] == ["제4조의2 본문"]
+        found = retriever.get_many_exact([("1823", "4"), ("1823", "4의2")])
+        assert [d["content"] for d in found[("1823", "4의2")]] == ["제4조의2 본문"]
+        assert [d["content"] for d in found[("1823", "4")]] == ["제4조 본문"]
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+from architecture_agent.ingestion.extract_abbr_chunk_llm import extract_abbreviations_by_chunk_llm
+from architecture_agent.ingestion.llm_cache import CachedLLM
+from architecture_agent.ingestion.stream import LawAbbreviationStage
+from architecture_agent.schemas import ArticleChunk
+
+
+class DummyResp:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt: str):
+        self.calls += 1
+        return DummyResp('{"위원회": "건축법 제4조에 따른 건축위원회"}')
+
+
+def _chunks() -> list[ArticleChunk]:
+    return [
+        ArticleChunk(
+            law_name="건축법",
+            law_id="1823",
+            law_type="법률",
+            article_num=str(i),
+            article_title="테스트",
+            content=f'제{i}조 건축위원회(이하 "위원회"라 한다)',
+        )
+        for i in range(1, 4)
+    ]
+
+
+def test_cached_llm_skips_calls_for_unchanged_prompts_across_runs(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    inner = CountingLLM()
+
+    first = CachedLLM(inner, model_name="HCX-005", cache_path=path)
+    maps_first = extract_abbreviations_by_chunk_llm(_chunks(), llm=first)
+    first.close()
+    assert inner.calls == 3
+
+    second = CachedLLM(inner, model_name="HCX-005", cache_path=path)
+    maps_second = extract_abbreviations_by_chunk_llm(_chunks(), llm=second, max_concurrency=2)
+    assert inner.calls == 3
+    assert maps_second == maps_first
+    assert second.stats()["saved_calls"] == 3
+    assert second.stats()["misses"] == 0
+
+    other_model = CachedLLM(inner, model_name="HCX-DASH-002", cache_path=path)
+    other_model.invoke("same prompt")
+    assert inner.calls == 4
+
+
+def test_cached_llm_evicts_least_recently_used(tmp_path):
+    inner = CountingLLM()
+    cache = CachedLLM(inner, model_name="m", cache_path=str(tmp_path / "c.sqlite"), max_entries=2)
+
+    cache.invoke("a")
+    cache.invoke("b")
+    cache.invoke("a")
+    cache.invoke("c")
+    assert cache.stats()["entries"] == 2
+
+    calls = inner.calls
+    cache.invoke("a")
+    assert inner.calls == calls
+    cache.invoke("b")
+    assert inner.calls == calls + 1
+
+
+class ThreadRecordingCache(CachedLLM):
+    def _get(self, key):
+        self.threads.append(threading.get_ident())
+        return super()._get(key)
+
+    def _put(self, key, response):
+        self.threads.append(threading.get_ident())
+        super()._put(key, response)
+
+
+def test_async_cache_io_runs_off_the_event_loop(tmp_path):
+    inner = CountingLLM()
+    cache = ThreadRecordingCache(inner, model_name="m", cache_path=str(tmp_path / "c.sqlite"))
+    cache.threads = []
+
+    async def scenario():
+        first = await cache.ainvoke("a")
+        second = await cache.ainvoke("a")
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(scenario())
+    assert first.content == second.content and inner.calls == 1
+    # miss 조회 + 기록 + hit 조회가 모두 event loop 스레드 밖에서 실행된다
+    assert len(cache.threads) == 3 and loop_thread not in cache.threads
+
+
+def test_law_llm_stage_reuses_cached_responses(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    inner = CountingLLM()
+
+    for _ in range(2):
+        cached = CachedLLM(inner, model_name="HCX-005", cache_path=path)
+        stage = LawAbbreviationStage(llm=cached)
+        chunks = list(stage(_chunks()))
+        stats = cached.stats()
+        cached.close()
+
+    # 법령 단위 LLM 추출도 같은 캐시를 거쳐 두 번째 실행은 LLM을 호출하지 않는다
+    assert inner.calls == 1
+    assert stats["saved_calls"] == 1
+    assert stage.law_maps["건축법"]["위원회"].startswith("건축법 제4조")
+    assert chunks[0].abbreviations == stage.law_maps["건축법"]
@@ -0,0 +1,76 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from architecture_agent.metrics import (
+    MetricsRegistry,
+    collect_timings,
+    record_cache,
+    record_llm_sizes,
+    stage,
+    timed_call,
+)
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo.", ("op",))
+    hist.observe(0.004, "scroll")
+    hist.observe(0.2, "scroll")
+    hist.observe(100.0, "scroll")
+    registry.counter("demo_total", "Demo.", ("cache", "result")).inc("answer", "hit", amount=2)
+
+    text = registry.render()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{op="scroll",le="0.005"} 1' in text
+    assert 'demo_seconds_bucket{op="scroll",le="0.25"} 2' in text
+    assert 'demo_seconds_bucket{op="scroll",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{op="scroll"} 3' in text
+    assert 'demo_total{cache="answer",result="hit"} 2' in text
+
+
+def test_request_timings_collect_stages_calls_and_thread_pool_work():
+    def _work(_):
+        with timed_call("qdrant", "retrieve"):
+            return None
+
+    with collect_timings() as timings:
+        with stage("ref_fetch"):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, _work, i) for i in range(3)]
+                [f.result() for f in futures]
+        with timed_call("llm", "answer"):
+            record_llm_sizes("answer", "prompt", "done")
+        record_cache("answer", "miss")
+        with pytest.raises(RuntimeError):
+            with timed_call("llm", "precheck"):
+                raise RuntimeError("down")
+
+    out = timings.as_dict()
+    assert set(out["stages"]) == {"ref_fetch"}
+    assert out["calls"]["qdrant.retrieve"]["count"] == 3
+    assert out["calls"]["llm.answer"]["prompt_chars"] == 6
+    assert out["calls"]["llm.answer"]["completion_chars"] == 4
+    assert out["calls"]["llm.answer"]["prompt_tokens_est"] == 2
+    assert out["calls"]["llm.answer"]["completion_tokens_est"] == 1
+    assert out["calls"]["llm.precheck"]["errors"] == 1
+    assert out["cache"] == {"answer.miss": 1}
+
+
+def test_metrics_endpoint_exports_ask_histograms(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from architecture_agent.api import server
+
+    with collect_timings():
+        with stage("retrieve"):
+            pass
+
+    client = TestClient(server.app)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'law_agent_stage_seconds_count{stage="retrieve"}' in response.text
+    assert 'law_agent_admission{stat="in_flight"} 0' in response.text
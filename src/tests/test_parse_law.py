@@ -33,3 +33,30 @@ def test_parse_law_handles_dict_and_list_mixed_structure():
     assert chunk.paragraphs[0]["num"] == "1"
     assert chunk.paragraphs[0]["subs"][0]["num"] == "1"
     assert chunk.paragraphs[0]["subs"][0]["items"][0]["num"] == "가"
+
+
+def test_parse_law_keeps_article_branch_number():
+    sample = {
+        "법령": {
+            "기본정보": {"법령명_한글": "건축법", "법령ID": "1823"},
+            "조문": {
+                "조문단위": [
+                    {"조문여부": "조문", "조문번호": "4", "조문제목": "위원회", "조문내용": "제4조(위원회)"},
+                    {
+                        "조문여부": "조문",
+                        "조문번호": "4",
+                        "조문가지번호": "2",
+                        "조문제목": "위원회의 운영",
+                        "조문내용": "제4조의2(위원회의 운영)",
+                    },
+                    # 가지번호 필드가 없으면 조문 머리말에서 읽는다
+                    {"조문여부": "조문", "조문번호": "4", "조문제목": "권한", "조문내용": "제4조의3(권한)"},
+                ]
+            },
+        }
+    }
+
+    chunks = parse_law_data(sample)
+    assert [(c.article_num, c.article_sub) for c in chunks] == [("4", ""), ("4", "2"), ("4", "3")]
+    assert "article_sub" not in chunks[0].to_payload()
+    assert chunks[1].to_payload()["article_sub"] == "2"
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from architecture_agent.service.zero_hop import ZeroHopResult
+
+SRC = Path(__file__).resolve().parents[1]
+
+
+def test_server_import_does_not_load_langchain_or_qdrant():
+    code = (
+        "import sys, architecture_agent.api.server\n"
+        "heavy = [m for m in sys.modules if m.split('.')[0] in "
+        "('langchain_core', 'langchain_qdrant', 'langchain_naver', 'qdrant_client')]\n"
+        "print(','.join(sorted(heavy)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == ""
+
+
+class WarmAgent:
+    def __init__(self, release: threading.Event, fail: bool = False):
+        self.release = release
+        self.fail = fail
+        self.warmed = 0
+
+    def warm_up(self) -> dict[str, float]:
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("qdrant down")
+        self.warmed += 1
+        return {"embedding": 1.0, "qdrant": 2.0}
+
+    async def aask(self, query: str, k: int = 5) -> ZeroHopResult:
+        return ZeroHopResult(answer="답변", targets=[], steps=[], references=[], contexts_count=0, trace={})
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    pytest.importorskip("httpx")
+    from architecture_agent.api import server
+
+    monkeypatch.setattr(server, "readiness", server.Readiness())
+    return server
+
+
+def test_ready_is_503_until_warm_up_finishes(server, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    release = threading.Event()
+    agent = WarmAgent(release)
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+
+    with TestClient(server.app) as client:
+        assert client.get("/health").status_code == 200
+        pending = client.get("/ready")
+        assert pending.status_code == 503
+        assert pending.json()["status"] == "warming_up"
+
+        release.set()
+        # warm-up 중에 들어온 요청도 warm-up 완료 후 처리된다
+        assert client.post("/api/v1/chat/ask", json={"query": "건축선"}).json()["answer"] == "답변"
+        ready = client.get("/ready")
+        assert ready.status_code == 200
+        assert ready.json()["warm_up_ms"] == {"embedding": 1.0, "qdrant": 2.0}
+        assert agent.warmed == 1
+
+
+def test_ready_reports_failed_warm_up(server, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    release = threading.Event()
+    release.set()
+    monkeypatch.setattr(server, "get_agent", lambda: WarmAgent(release, fail=True))
+
+    with TestClient(server.app) as client:
+        client.portal.call(_wait, server.readiness.task)
+        resp = client.get("/ready")
+        assert resp.status_code == 503
+        assert resp.json() == {"status": "failed", "error": "RuntimeError: qdrant down"}
+
+
+async def _wait(task) -> None:
+    await asyncio.wait({task})
+
+
+def test_warm_up_disabled_is_ready_immediately(server, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setenv("WARMUP_ON_STARTUP", "false")
+    with TestClient(server.app) as client:
+        assert client.get("/ready").json() == {"status": "ready"}
+
+
+def test_lazy_agent_build_failure_is_503_without_rebuilding(server, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    calls: list[int] = []
+
+    def _broken_agent():
+        calls.append(1)
+        raise RuntimeError("qdrant lock held")
+
+    monkeypatch.setenv("WARMUP_ON_STARTUP", "false")
+    monkeypatch.setattr(server, "get_agent", _broken_agent)
+    with TestClient(server.app) as client:
+        first = client.post("/api/v1/chat/ask", json={"query": "건축선"})
+        second = client.post("/api/v1/chat/ask/batch", json={"queries": ["건축선"]})
+        assert first.status_code == second.status_code == 503
+        assert "qdrant lock held" in first.json()["detail"]
+        assert calls == [1]
+        assert client.get("/ready").json() == {"status": "failed", "error": "RuntimeError: qdrant lock held"}
+        assert server.admission.stats()["in_flight"] == 0
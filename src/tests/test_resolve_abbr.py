@@ -1,4 +1,5 @@
 from architecture_agent.ingestion.resolve_abbr import (
+    apply_abbreviation_map,
     extract_abbreviations_by_law,
     merge_abbreviation_maps,
     resolve_abbreviations,
@@ -59,3 +60,23 @@ def test_merge_abbreviation_prefers_higher_quality_expansion():
     new = {"위원회": "건축법 제4조에 따른 건축위원회"}
     merged = merge_abbreviation_maps(base, new)
     assert merged["위원회"] == "건축법 제4조에 따른 건축위원회"
+
+
+def test_apply_abbreviation_map_single_pass_longest_match():
+    abbr_map = {
+        "위원회": "건축위원회",
+        "위원": "위원회 위원",
+        "법": "건축법",
+        "건축물등": "건축물과 공작물",
+    }
+
+    text = "위원회는 위원을 두고, 법 제4조 및 헌법과 건축물등을 본다. 위원장"
+    resolved = apply_abbreviation_map(text, abbr_map)
+
+    # 긴 키 우선, 확장된 텍스트("위원회 위원") 안은 다시 치환하지 않음
+    assert resolved.startswith("건축위원회는 위원회 위원을 두고")
+    assert "건축법 제4조" in resolved
+    # 2자 이하 키는 경계 규칙 유지: '헌법'의 '법', '위원장'의 '위원'은 치환하지 않음
+    assert "헌법과" in resolved
+    assert resolved.endswith("위원장")
+    assert "건축물과 공작물을" in resolved
@@ -0,0 +1,56 @@
+from architecture_agent.ingestion.extract_refs import extract_references
+from architecture_agent.ingestion.reverse_refs import (
+    build_reverse_ref_index,
+    load_reverse_ref_index,
+    merge_reverse_ref_index,
+    parent_ref_key,
+    save_reverse_ref_index,
+)
+from architecture_agent.ingestion.stream import ReverseRefStage
+from architecture_agent.schemas import ArticleChunk
+
+
+def _decree_chunk(article_num: str, content: str) -> ArticleChunk:
+    return ArticleChunk(
+        law_name="건축법 시행령",
+        law_id="2118",
+        law_type="시행령",
+        article_num=article_num,
+        article_title=f"시행령 조문 {article_num}",
+        content=content,
+    )
+
+
+def test_build_reverse_ref_index_maps_parent_article_to_child_keys():
+    chunks = [
+        _decree_chunk("31", "법 제46조제1항에 따른 건축선"),
+        _decree_chunk("32", "법 제46조 및 법 제47조에 따라"),
+        _decree_chunk("33", "부칙"),
+    ]
+    extract_references(chunks)
+
+    index = build_reverse_ref_index(chunks)
+    assert index[parent_ref_key("건축법", "46")] == ["2118:31", "2118:32"]
+    assert index[parent_ref_key("건축법", "47")] == ["2118:32"]
+
+
+def test_reverse_ref_stage_collects_index_while_streaming():
+    chunks = [_decree_chunk("31", "법 제46조에 따른 건축선")]
+    extract_references(chunks)
+
+    stage = ReverseRefStage()
+    assert list(stage(iter(chunks))) == chunks
+    assert stage.index == {parent_ref_key("건축법", "46"): ["2118:31"]}
+    assert stage.law_ids == {"2118"}
+
+
+def test_merge_replaces_only_reingested_laws(tmp_path):
+    previous = {"건축법:46": ["2118:31", "9999:1"], "건축법:11": ["2118:5"]}
+    current = {"건축법:46": ["2118:32"]}
+
+    merged = merge_reverse_ref_index(previous, current, law_ids={"2118"})
+    assert merged == {"건축법:46": ["9999:1", "2118:32"]}
+
+    path = save_reverse_ref_index(merged, output_path=str(tmp_path / "refs.json"))
+    assert load_reverse_ref_index(str(path)) == merged
+    assert load_reverse_ref_index(str(tmp_path / "missing.json")) == {}
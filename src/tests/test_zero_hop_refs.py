@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+import time
+
+from architecture_agent.service.zero_hop import ZeroHopLawAgent
+
+
+class SlowJudgeLLM:
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str):
+        ref_key = prompt.rsplit("ref_key: ", 1)[1].strip()
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delays.get(ref_key, 0.05))
+        with self._lock:
+            self.active -= 1
+        return json.dumps({"follow": True, "priority": 1, "reason": ref_key})
+
+
+class FakeRetriever:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+        self.batches = 0
+
+    def get_by_exact(self, law_id: str, article_num: str) -> list[dict]:
+        self.calls.append((law_id, article_num))
+        return [{"content": f"제{article_num}조", "metadata": {"law_id": law_id, "article_num": article_num}}]
+
+    def get_many_exact(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], list[dict]]:
+        self.batches += 1
+        return {(law_id, article_num): self.get_by_exact(law_id, article_num) for law_id, article_num in keys}
+
+
+def _agent(llm, concurrency: int, timeout: float | None, mode: str = "per_candidate") -> ZeroHopLawAgent:
+    agent = ZeroHopLawAgent.__new__(ZeroHopLawAgent)
+    agent.llm = llm
+    agent.ref_check_mode = mode
+    agent.retriever = FakeRetriever()
+    agent.ref_check_concurrency = concurrency
+    agent.ref_check_timeout = timeout
+    agent._is_answerable_without_refs = lambda *_args: (False, "needs refs")
+    agent._extract_ref_candidates = lambda _contexts: [
+        {"law_id": "001823", "article": str(n), "source_text": "건축선", "raw": f"법 제{n}조"} for n in range(40, 46)
+    ]
+    agent.answer_token_budget = 1200
+    agent.precheck_token_budget = 600
+    agent.follow_token_budget = 200
+    agent.batch_follow_token_budget = 800
+    return agent
+
+
+def test_follow_checks_run_concurrently_and_keep_candidate_order():
+    llm = SlowJudgeLLM(delays={"001823:40": 0.2})
+    agent = _agent(llm, concurrency=3, timeout=None)
+
+    start = time.perf_counter()
+    contexts, reason, trace = agent._expand_refs_if_needed("건축선", ["건축선"], [], max_ref_expand=4)
+    elapsed = time.perf_counter() - start
+
+    assert llm.max_active == 3
+    assert elapsed < 0.2 + 5 * 0.05
+    assert [row["ref_key"] for row in trace["follow_checks"]] == [f"001823:{n}" for n in range(40, 46)]
+    assert reason == "expanded_ref_count=4"
+    assert [c["metadata"]["article_num"] for c in contexts] == ["40", "41", "42", "43"]
+    assert len(agent.retriever.calls) == 6
+    assert agent.retriever.batches == 1
+
+
+def test_follow_checks_past_timeout_are_not_followed():
+    llm = SlowJudgeLLM(delays={"001823:41": 1.0})
+    agent = _agent(llm, concurrency=6, timeout=0.3)
+
+    _, _, trace = agent._expand_refs_if_needed("건축선", ["건축선"], [], max_ref_expand=10)
+
+    slow = trace["follow_checks"][1]
+    assert slow == {"ref_key": "001823:41", "follow": False, "priority": 0, "reason": "precheck_timeout"}
+    assert trace["follow_checks_timed_out"] == 1
+    assert trace["candidates_followed"] == 5
+
+
+class BatchJudgeLLM:
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts: list[str] = []
+
+    def invoke(self, prompt: str):
+        self.prompts.append(prompt)
+        if "JSON 배열" in prompt:
+            return self.response
+        ref_key = prompt.rsplit("ref_key: ", 1)[1].strip()
+        return json.dumps({"follow": False, "priority": 0, "reason": f"single {ref_key}"})
+
+
+def test_batch_mode_judges_all_candidates_in_one_call():
+    records = [{"id": i, "ref_key": f"001823:{40 + i}", "follow": i < 2, "priority": 2 - i % 3, "reason": "ok"} for i in range(6)]
+    llm = BatchJudgeLLM("```json\n" + json.dumps(records) + "\n```")
+    agent = _agent(llm, concurrency=4, timeout=None, mode="batch")
+
+    contexts, _, trace = agent._expand_refs_if_needed("건축선", ["건축선"], [])
+
+    assert len(llm.prompts) == 1
+    assert [row["follow"] for row in trace["follow_checks"]] == [True, True, False, False, False, False]
+    assert trace["follow_checks"][0]["priority"] == 2
+    assert [c["metadata"]["article_num"] for c in contexts] == ["40", "41"]
+
+
+def test_batch_mode_falls_back_per_candidate_for_missing_records():
+    # id 없이 ref_key로만 매칭되는 레코드 1개 + 형식 오류 레코드 -> 나머지 5개는 후보별 판단
+    llm = BatchJudgeLLM('결과: [{"ref_key": "001823:43", "follow": true, "priority": 1}, {"id": 0}]')
+    agent = _agent(llm, concurrency=2, timeout=None, mode="batch")
+
+    _, _, trace = agent._expand_refs_if_needed("건축선", ["건축선"], [])
+
+    assert len(llm.prompts) == 1 + 5
+    checks = trace["follow_checks"]
+    assert checks[3]["follow"] is True and checks[3]["reason"].startswith("batch_precheck")
+    assert [c["reason"].startswith("precheck_without_ref_content") for c in checks] == [True, True, True, False, True, True]
+
+
+class SlowBatchJudgeLLM(BatchJudgeLLM):
+    def invoke(self, prompt: str):
+        time.sleep(0.3 if "JSON 배열" in prompt else 1.0)
+        return super().invoke(prompt)
+
+    async def ainvoke(self, prompt: str):
+        await asyncio.sleep(0.3 if "JSON 배열" in prompt else 1.0)
+        return super().invoke(prompt)
+
+
+def test_batch_and_fallback_share_one_timeout():
+    from architecture_agent.service.zero_hop_async import AsyncZeroHopLawAgent
+
+    llm = SlowBatchJudgeLLM('[{"ref_key": "001823:43", "follow": true, "priority": 1}]')
+    agent = _agent(llm, concurrency=6, timeout=0.45, mode="batch")
+
+    start = time.perf_counter()
+    _, _, trace = agent._expand_refs_if_needed("건축선", ["건축선"], [])
+    elapsed = time.perf_counter() - start
+
+    # 보완 판단은 batch가 쓰고 남은 시간만 기다린다 (0.3 + 0.45가 아니라 0.45 안팎)
+    assert elapsed < 0.65
+    assert trace["follow_checks_timed_out"] == 5
+    assert trace["follow_checks"][3]["follow"] is True
+
+    async_agent = AsyncZeroHopLawAgent.__new__(AsyncZeroHopLawAgent)
+    async_agent.__dict__.update(agent.__dict__)
+    start = time.perf_counter()
+    decisions = asyncio.run(async_agent._afollow_decisions("건축선", ["건축선"], async_agent._extract_ref_candidates([])))
+    assert time.perf_counter() - start < 0.65
+    assert [d is None for d in decisions] == [True, True, True, False, True, True]